@@ -2,8 +2,47 @@
 # in the beginning, at the agent's conception
 
 from autogen_ext.tools.mcp import McpWorkbench
-from typing import List, Mapping, Any
+from typing import Dict, List, Mapping, Any
 from autogen_core.tools import ToolSchema, ToolResult
+import weakref
+from opentelemetry.trace import SpanKind
+from util.tracing import get_tracer, with_trace_argument
+
+# Tool schemas fetched once per MCP session and shared by every FilteredWorkbench
+# wrapping that session. Keyed weakly so entries disappear with the session.
+_session_tools: "weakref.WeakKeyDictionary[McpWorkbench, List[ToolSchema]]" = weakref.WeakKeyDictionary()
+
+
+async def get_session_tools(workbench: McpWorkbench) -> List[ToolSchema]:
+    """Returns the full tool list of an MCP session, fetching it from the server only once."""
+    tools = _session_tools.get(workbench)
+    if tools is None:
+        tools = list(await workbench.list_tools())
+        _session_tools[workbench] = tools
+    return tools
+
+
+def refresh_session_tools(workbench: McpWorkbench, tools: List[ToolSchema]) -> bool:
+    """
+    Stores a freshly fetched tool list for a session. If it differs from the cached
+    one (the server changed its tools), the cache is replaced and every wrapper
+    re-filters on its next list_tools call. Returns True if the cache was invalidated.
+    """
+    cached = _session_tools.get(workbench)
+    tools = list(tools)
+    if cached == tools:
+        return False
+    _session_tools[workbench] = tools
+    return cached is not None
+
+
+def invalidate_session_tools(workbench: McpWorkbench | None = None) -> None:
+    """Drops the cached tool list for one session, or for all sessions if none is given."""
+    if workbench is None:
+        _session_tools.clear()
+    else:
+        _session_tools.pop(workbench, None)
+
 
 class FilteredWorkbench(McpWorkbench):
     """
@@ -14,12 +53,46 @@ class FilteredWorkbench(McpWorkbench):
     def __init__(self, underlying_workbench: McpWorkbench, allowed_tool_names: List[str]):
         self._underlying = underlying_workbench
         self._allowed_names = set(allowed_tool_names)
+        # Filtered view of the session tool list, recomputed only when that list is replaced
+        self._filtered_tools: List[ToolSchema] = []
+        self._filtered_from: List[ToolSchema] | None = None
+        self._tool_descriptions: Dict[str, str] = {}
+        # Only initializes attributes; the MCP session itself is owned by the underlying workbench
         super().__init__(server_params=self._underlying.server_params)
 
+    # The underlying (pooled) workbench owns the MCP session, so the wrapper never
+    # opens or closes a session of its own.
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def reset(self) -> None:
+        pass
+
     async def list_tools(self) -> List[ToolSchema]:
-        """Returns only the tools that are in the allowed list."""
-        all_tools = await self._underlying.list_tools()
-        return [tool for tool in all_tools if tool["name"] in self._allowed_names and tool["description"]]
+        """Returns only the tools that are in the allowed list (served from memory)."""
+        all_tools = await get_session_tools(self._underlying)
+        if all_tools is not self._filtered_from:
+            self._filtered_tools = [tool for tool in all_tools if tool["name"] in self._allowed_names and tool["description"]]
+            self._tool_descriptions = {tool["name"]: tool.get("description", "") or "" for tool in self._filtered_tools}
+            self._filtered_from = all_tools
+        return list(self._filtered_tools)
+
+    async def get_tool_descriptions(self) -> Dict[str, str]:
+        """Returns a mapping of allowed tool name -> description."""
+        await self.list_tools()
+        return self._tool_descriptions
+
+    async def get_tool_schemas(self) -> Dict[str, ToolSchema]:
+        """Returns a mapping of allowed tool name -> full tool schema (including parameters)."""
+        tools = await self.list_tools()
+        return {tool["name"]: tool for tool in tools}
+
+    def invalidate_tools(self) -> None:
+        """Forces the tool list of the underlying session to be fetched again."""
+        invalidate_session_tools(self._underlying)
 
     async def call_tool(self, name: str, arguments: Mapping[str, Any] | None = None, **kwargs) -> ToolResult:
         """
@@ -32,7 +105,16 @@ class FilteredWorkbench(McpWorkbench):
         args_to_send = arguments or {}
 
         print(args_to_send)
-        return await self._underlying.call_tool(name, args_to_send, **kwargs)
+        with get_tracer().start_as_current_span(
+            f"mcp.call_tool {name}",
+            kind=SpanKind.CLIENT,
+            attributes={"tool.name": name},
+        ) as span:
+            # Per-call headers can't be set on a pooled SSE session, so the trace context
+            # travels in a reserved argument that the ragmcp server strips before the tool runs
+            result = await self._underlying.call_tool(name, with_trace_argument(args_to_send), **kwargs)
+            span.set_attribute("tool.is_error", bool(result.is_error))
+            return result
 
     def _to_config(self) -> Mapping[str, Any]:
         raise NotImplementedError("FilteredWorkbench is not designed to be serializable.")
@@ -10,21 +10,29 @@ from autogen_core.models import (
     CreateResult,
 )
 
-import yaml
 import json
+import logging
 import re
-import openai
-from util.config_utils import _get_key
-from util.api_clients import get_openai_client
+from util.api_clients import get_shared_openai_client
+from util.prompt_registry import get_prompt_registry
+from util.tracing import get_tracer
+from argument_repair import (
+    REPAIR_STATS,
+    _json_structures_equal,
+    _parse_json_maybe,
+    repair_arguments_locally,
+)
 import os
 
 local_path = os.path.dirname(os.path.abspath(__file__))
+logger = logging.getLogger(__name__)
 
 class PlannerAgent(AssistantAgent):
     """
     An AssistantAgent that intercepts ANY tool-call request with empty arguments,
     infers the correct arguments using an LLM prompt (gpt-4o) defined in
-    `config/prompt.yaml` under the key `arguments_prompt`, and proceeds with the
+    `config/prompt.yaml` under the key `arguments_prompt` (served by the shared
+    prompt registry), and proceeds with the
     original tool call using the inferred JSON arguments.
     """
 
@@ -50,18 +58,6 @@ class PlannerAgent(AssistantAgent):
         message_id,
         format_string=None,
     ):
-        # Load prompts; prefer config/prompts.yaml if present; fallback to config/prompt.yaml
-        prompt_config = {}
-        try:
-            with open((f"{local_path}/config/prompts.yaml"), 'r') as file:
-                prompt_config = yaml.safe_load(file) or {}
-        except FileNotFoundError:
-            try:
-                with open((f"{local_path}/config/prompt.yaml"), 'r') as file:
-                    prompt_config = yaml.safe_load(file) or {}
-            except FileNotFoundError:
-                prompt_config = {}
-
         # Proceed only if there are tool calls; handle both wrappers and raw FunctionCall objects
         has_tool_calls = isinstance(model_result.content, list) and any(
             isinstance(evt, ToolCallRequestEvent) or isinstance(evt, FunctionCall)
@@ -106,94 +102,25 @@ class PlannerAgent(AssistantAgent):
 
         last_message_text = await _get_last_other_message_text()
 
-        # Prepare OpenAI client
-        oai_key = _get_key("OPENAI_API_KEY")
-        openai.api_key = oai_key
-
-        # Helper to extract JSON from a string robustly
-        def _parse_json_maybe(s: str) -> dict:
-            """
-            Attempts to parse a string as JSON. If that fails, tries to extract the first outermost JSON object from the string.
-            Returns a dict if possible, else {}.
-            """
-            if isinstance(s, dict):
-                return s
-            if not isinstance(s, str):
-                return {}
-            try:
-                obj = json.loads(s)
-                if isinstance(obj, dict):
-                    return obj
-            except Exception:
-                pass
-            # Find all OUTERMOST {...} blocks in the string
-            stack = []
-            blocks = []
-            start = None
-            for i, c in enumerate(s):
-                if c == '{':
-                    if not stack:
-                        start = i
-                    stack.append('{')
-                elif c == '}':
-                    if stack:
-                        stack.pop()
-                        if not stack and start is not None:
-                            blocks.append(s[start:i+1])
-                            start = None
-            # Try to parse each outermost block, return the first valid dict
-            for block in blocks:
-                # Replace single quotes with double quotes for JSON compatibility
-                block_fixed = block.replace("'", '"')
-                try:
-                    obj = json.loads(block_fixed)
-                    if isinstance(obj, dict):
-                        return obj
-                except Exception:
-                    continue
-            return {}
-
-        def _json_structures_equal(a, b):
-            """
-            Recursively compare the structure of two JSON objects (dicts/lists).
-            Structure is equal iff:
-              - Both are dicts with the same keys, and all values have equal structure
-              - Both are lists of the same length, and all elements have equal structure
-              - Both are not dict/list (i.e., primitives), then structure is equal
-
-            This function expects both arguments to be Python objects (not strings).
-            If you have a string, use _parse_json_maybe(string) to convert it first.
-            """
-            if isinstance(a, dict) and isinstance(b, dict):
-                if set(a.keys()) != set(b.keys()):
-                    return False
-                for k in a:
-                    if not _json_structures_equal(a[k], b[k]):
-                        return False
-                return True
-            elif isinstance(a, list) and isinstance(b, list):
-                if len(a) != len(b):
-                    return False
-                for i in range(len(a)):
-                    if not _json_structures_equal(a[i], b[i]):
-                        return False
-                return True
-            else:
-                # For primitives, structure is considered equal
-                return True
-
+        # Shared async OpenAI client (created once per process)
+        oai_client = get_shared_openai_client()
 
-        # Build prompt template
+        # Build prompt template (parsed once and cached by the prompt registry)
         template = (
-            (prompt_config.get("arguments_prompt", {}) or {}).get("description")
+            get_prompt_registry().get_prompt("arguments_prompt")
             or "Given the last message: \n\n{last_message}\n\n"
                "Infer the JSON arguments for the tool `{tool_name}`. Return ONLY the JSON object with the arguments."
         )
 
-        # Build a lookup of tool descriptions from the workbench (if provided)
+        # Build a lookup of tool descriptions and schemas from the workbench (if provided)
         tool_descriptions: dict[str, str] = {}
+        tool_schemas: dict[str, dict] = {}
         try:
-            if workbench is not None and hasattr(workbench[0], "list_tools"):
+            if workbench is not None and hasattr(workbench[0], "get_tool_descriptions"):
+                # FilteredWorkbench serves these from its in-memory tool schema cache
+                tool_descriptions = await workbench[0].get_tool_descriptions()
+                tool_schemas = await workbench[0].get_tool_schemas()
+            elif workbench is not None and hasattr(workbench[0], "list_tools"):
                 tools = await workbench[0].list_tools()  # type: ignore[reportUnknownArgumentType]
                 for t in tools:
                     # Support both dict-like and attribute-like access
@@ -201,12 +128,14 @@ class PlannerAgent(AssistantAgent):
                     desc = t.get("description", "") if isinstance(t, dict) else getattr(t, "description", "")
                     if name:
                         tool_descriptions[name] = desc or ""
+                        if isinstance(t, dict):
+                            tool_schemas[name] = t
         except Exception as e:
             print(f"Error listing tools: {e}")
             # If listing tools fails, proceed without descriptions
             pass
 
-        # Mutate every tool call arguments using LLM inference (regardless of being empty or not)
+        # Validate every tool call's arguments locally; only ask the LLM when that fails
         if isinstance(model_result.content, list):
             for evt in model_result.content:
                 # 1) Wrapped batch of calls
@@ -220,6 +149,18 @@ class PlannerAgent(AssistantAgent):
 
                 for call in calls_iter:
                     description = tool_descriptions.get(call.name, "")
+                    tool_schema = tool_schemas.get(call.name)
+
+                    with get_tracer().start_as_current_span(
+                        "planner.argument_repair",
+                        attributes={"repair.method": "local", "tool.name": call.name},
+                    ) as span:
+                        repaired_args = repair_arguments_locally(call.arguments, tool_schema, description)
+                        span.set_attribute("repair.valid", repaired_args is not None)
+                    if repaired_args is not None:
+                        call.arguments = json.dumps(repaired_args)
+                        continue
+
                     # Normalize sent arguments to a JSON string for the prompt
                     if isinstance(call.arguments, str) and call.arguments.strip() != "":
                         sent_arguments = call.arguments
@@ -230,7 +171,13 @@ class PlannerAgent(AssistantAgent):
 
                     description_args = _parse_json_maybe(description)
                     sent_arguments = _parse_json_maybe(sent_arguments)
-                    if sent_arguments == {} or not _json_structures_equal(sent_arguments, description_args):
+                    if sent_arguments != {} and _json_structures_equal(sent_arguments, description_args):
+                        continue
+                    REPAIR_STATS['llm_repairs'] += 1
+                    with get_tracer().start_as_current_span(
+                        "planner.argument_repair",
+                        attributes={"repair.method": "llm", "tool.name": call.name},
+                    ) as span:
                         correct_args = False
                         count = 0
                         while not correct_args and count < 3:
@@ -242,7 +189,8 @@ class PlannerAgent(AssistantAgent):
                                 description=description,
                                 sent_arguments=sent_arguments,
                             )
-                            response = openai.chat.completions.create(
+                            REPAIR_STATS['llm_requests'] += 1
+                            response = await oai_client.chat.completions.create(
                                 model="gpt-4o",
                                 messages=[
                                     {"role": "system", "content": "You extract STRICT JSON arguments for tools."},
@@ -253,15 +201,20 @@ class PlannerAgent(AssistantAgent):
                             )
                             content = response.choices[0].message.content
                             args_obj = _parse_json_maybe(content or "")
-                            
+
                             print("FACTUALLY CALLED WITH ARGS: ", args_obj)
-                            # Use inferred JSON if valid; otherwise keep original arguments
+                            # Run the LLM output through the same validator so its shape is normalized too
                             if isinstance(args_obj, dict) and len(args_obj) > 0:
-                                call.arguments = json.dumps(args_obj)
+                                validated = repair_arguments_locally(args_obj, tool_schema, description, count_stats=False)
+                                call.arguments = json.dumps(validated if validated is not None else args_obj)
                             if description_args != args_obj:
                                 correct_args = True
                             print("example dict output: ", description_args, args_obj)
                             count += 1
+                        span.set_attributes({"repair.attempts": count, "repair.valid": correct_args})
+
+            # Totals are also available from argument_repair.get_argument_repair_stats()
+            logger.debug("Argument repair stats: %s", REPAIR_STATS)
 
         # Delegate to parent with updated arguments
         async for event in super()._process_model_result(
@@ -0,0 +1,336 @@
+# Local, deterministic repair of tool-call arguments. PlannerAgent tries this first and
+# only asks an LLM to infer the arguments when the local validator cannot produce a
+# valid call. The rules mirror `_parse_congress_index_from_args` on the ragmcp server.
+
+import ast
+import copy
+import json
+import re
+from typing import Any, Optional, Tuple
+
+BILL_TYPES = ["hr", "s", "hjres", "sjres", "hconres", "sconres", "hres", "sres"]
+AMENDMENT_TYPES = ["hamdt", "samdt", "suamdt"]
+
+# Keys the server unwraps (see `_parse_congress_index_from_args`)
+WRAPPER_KEYS = ["congress_index", "self"]
+
+# Spellings agents commonly use for congress_index fields
+KEY_ALIASES = {
+    "billtype": "bill_type",
+    "type": "bill_type",
+    "billnumber": "bill_number",
+    "number": "bill_number",
+    "bill_no": "bill_number",
+    "congress_number": "congress",
+    "congressnumber": "congress",
+    "amendmenttype": "amendment_type",
+    "amdt_type": "amendment_type",
+    "amendment_number": "amdt_number",
+    "amendmentnumber": "amdt_number",
+    "amdtnumber": "amdt_number",
+    "submitted_date": "submittedDate",
+    "submitteddate": "submittedDate",
+    "report_type": "reportType",
+    "report_number": "reportNumber",
+    "bioguide_id": "bioguideId",
+    "bioguideid": "bioguideId",
+    "company": "company_name",
+    "companyname": "company_name",
+    "committee": "committee_name",
+    "state_code": "stateCode",
+    "statecode": "stateCode",
+}
+
+# LobbyView bill ids such as 'hr2307-117'
+LOBBYVIEW_ID = re.compile(r'^(s|hr|sconres|hconres|hjres|sjres|sres|hres)(\d{1,5})-(\d{2,3})$')
+
+# Counters showing how often the LLM could be skipped
+REPAIR_STATS = {
+    'calls_checked': 0,
+    'valid_as_sent': 0,
+    'repaired_locally': 0,
+    'llm_repairs': 0,
+    'llm_requests': 0,
+    'llm_requests_avoided': 0,
+}
+
+
+def get_argument_repair_stats() -> dict:
+    """Current argument repair counters"""
+    return REPAIR_STATS.copy()
+
+
+def _parse_json_maybe(s: Any) -> dict:
+    """
+    Attempts to parse a string as JSON. If that fails, tries to extract the first outermost JSON object from the string.
+    Returns a dict if possible, else {}.
+    """
+    if isinstance(s, dict):
+        return s
+    if not isinstance(s, str):
+        return {}
+    try:
+        obj = json.loads(s)
+        if isinstance(obj, dict):
+            return obj
+    except Exception:
+        pass
+    # Find all OUTERMOST {...} blocks in the string
+    stack = []
+    blocks = []
+    start = None
+    for i, c in enumerate(s):
+        if c == '{':
+            if not stack:
+                start = i
+            stack.append('{')
+        elif c == '}':
+            if stack:
+                stack.pop()
+                if not stack and start is not None:
+                    blocks.append(s[start:i+1])
+                    start = None
+    # Try to parse each outermost block, return the first valid dict
+    for block in blocks:
+        # Replace single quotes with double quotes for JSON compatibility
+        block_fixed = block.replace("'", '"')
+        try:
+            obj = json.loads(block_fixed)
+            if isinstance(obj, dict):
+                return obj
+        except Exception:
+            continue
+    return {}
+
+
+def _json_structures_equal(a, b):
+    """
+    Recursively compare the structure of two JSON objects (dicts/lists).
+    Structure is equal iff:
+      - Both are dicts with the same keys, and all values have equal structure
+      - Both are lists of the same length, and all elements have equal structure
+      - Both are not dict/list (i.e., primitives), then structure is equal
+
+    This function expects both arguments to be Python objects (not strings).
+    If you have a string, use _parse_json_maybe(string) to convert it first.
+    """
+    if isinstance(a, dict) and isinstance(b, dict):
+        if set(a.keys()) != set(b.keys()):
+            return False
+        for k in a:
+            if not _json_structures_equal(a[k], b[k]):
+                return False
+        return True
+    elif isinstance(a, list) and isinstance(b, list):
+        if len(a) != len(b):
+            return False
+        for i in range(len(a)):
+            if not _json_structures_equal(a[i], b[i]):
+                return False
+        return True
+    else:
+        # For primitives, structure is considered equal
+        return True
+
+
+def _parse_literal(value: Any) -> Any:
+    """Stringified dicts (JSON or Python literal) -> dict; everything else unchanged"""
+    if isinstance(value, str) and value.strip().startswith("{"):
+        try:
+            return json.loads(value)
+        except Exception:
+            try:
+                return ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                return value
+    return value
+
+
+def _schema_from_example(example: Any) -> dict:
+    """Derive a JSON schema from the example arguments in a tool description"""
+    if isinstance(example, dict):
+        return {
+            "type": "object",
+            "properties": {k: _schema_from_example(v) for k, v in example.items()},
+            "required": list(example.keys()),
+        }
+    if isinstance(example, bool):
+        return {"type": "boolean"}
+    if isinstance(example, int) or (isinstance(example, str) and example.isdigit()):
+        # The server formats these into URL paths, so both spellings work
+        return {"type": ["integer", "string"]}
+    return {"type": "string"}
+
+
+def build_argument_schema(tool_schema: Optional[dict], description: str) -> dict:
+    """
+    Merge the tool's advertised JSON schema with the example in its description.
+    Properties the server describes precisely win; vague ones (e.g. a bare
+    `{"type": "object"}` for congress_index) are filled in from the example.
+    """
+    # Copy: the advertised schema lives in the shared tool schema cache
+    advertised = copy.deepcopy((tool_schema or {}).get("parameters") or {})
+    example_schema = _schema_from_example(_parse_json_maybe(description))
+
+    properties = dict(advertised.get("properties") or {})
+    for name, sub in (example_schema.get("properties") or {}).items():
+        current = properties.get(name)
+        if not current or (current.get("type") == "object" and not current.get("properties")):
+            properties[name] = sub
+
+    required = list(advertised.get("required") or example_schema.get("required") or [])
+    schema = {"type": "object", "properties": properties, "required": required}
+    _add_known_enums(schema)
+    return schema
+
+
+def _add_known_enums(schema: dict) -> None:
+    """Bill/amendment types only have a handful of valid values; let the validator normalize them"""
+    for name, sub in (schema.get("properties") or {}).items():
+        if name == "bill_type" and "enum" not in sub:
+            sub["enum"] = BILL_TYPES
+        elif name == "amendment_type" and "enum" not in sub:
+            sub["enum"] = AMENDMENT_TYPES
+        elif sub.get("properties"):
+            _add_known_enums(sub)
+
+
+def _normalize_key(key: str, properties: dict) -> str:
+    if key in properties:
+        return key
+    alias = KEY_ALIASES.get(key.lower().replace("-", "_"))
+    if alias in properties:
+        return alias
+    # Last resort: case/underscore-insensitive match
+    flat = key.lower().replace("_", "")
+    for name in properties:
+        if name.lower().replace("_", "") == flat:
+            return name
+    return key
+
+
+def _index_from_lobbyview_id(value: str) -> Optional[dict]:
+    match = LOBBYVIEW_ID.match(value.strip().lower())
+    if not match:
+        return None
+    bill_type, number, congress = match.groups()
+    return {"congress": int(congress), "bill_type": bill_type, "bill_number": int(number)}
+
+
+def _coerce(value: Any, schema: dict) -> Tuple[Any, bool]:
+    """Coerce a value to a schema. Returns (value, ok)."""
+    types = schema.get("type")
+    types = types if isinstance(types, list) else [types] if types else []
+
+    if "object" in types or schema.get("properties"):
+        value = _parse_literal(value)
+        if isinstance(value, str):
+            value = _index_from_lobbyview_id(value) or value
+        if not isinstance(value, dict):
+            return value, False
+        return _coerce_object(value, schema)
+
+    if "enum" in schema:
+        if isinstance(value, str):
+            normalized = re.sub(r"[^a-z]", "", value.lower())
+            if normalized in schema["enum"]:
+                return normalized, True
+        return value, value in schema["enum"]
+
+    if "integer" in types:
+        if isinstance(value, bool):
+            return value, False
+        if isinstance(value, int):
+            return value, True
+        if isinstance(value, str) and value.strip().isdigit():
+            return (value.strip() if "string" in types else int(value.strip())), True
+        return value, False
+
+    if "string" in types:
+        if isinstance(value, str):
+            return value, bool(value.strip())
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value), True
+        return value, False
+
+    if "boolean" in types:
+        return value, isinstance(value, bool)
+
+    return value, value is not None
+
+
+def _coerce_object(args: dict, schema: dict) -> Tuple[dict, bool]:
+    properties = schema.get("properties") or {}
+    required = schema.get("required") or []
+
+    # Unwrap server-style wrappers that the schema does not expect
+    for key in WRAPPER_KEYS:
+        if key in args and key not in properties and len(args) == 1:
+            inner = _parse_literal(args[key])
+            if isinstance(inner, dict):
+                return _coerce_object(inner, schema)
+
+    result = {}
+    for key, value in args.items():
+        name = _normalize_key(key, properties)
+        if properties and name not in properties:
+            # Unknown keys would only make the call fail server-side
+            continue
+        result[name] = value
+
+    # Agents often send the bare index instead of {"congress_index": {...}}
+    wrapper = next((k for k in WRAPPER_KEYS if k in properties), None)
+    if wrapper and wrapper not in result:
+        inner_props = properties[wrapper].get("properties") or {}
+        bare = {k: v for k, v in args.items() if _normalize_key(k, inner_props) in inner_props}
+        if bare:
+            result = {k: v for k, v in result.items() if k not in bare}
+            result[wrapper] = bare
+
+    ok = all(name in result for name in required)
+    for name, value in list(result.items()):
+        if name in properties:
+            result[name], value_ok = _coerce(value, properties[name])
+            ok = ok and value_ok
+    return result, ok
+
+
+def repair_arguments_locally(sent_arguments: Any, tool_schema: Optional[dict], description: str,
+                             count_stats: bool = True) -> Optional[dict]:
+    """
+    Validate and repair tool-call arguments without an LLM.
+
+    Returns the (possibly repaired) arguments if they satisfy the tool's schema,
+    or None if an LLM has to infer them. `count_stats=False` re-checks arguments
+    (e.g. the LLM's answer) without counting them as another agent call.
+    """
+    if count_stats:
+        REPAIR_STATS['calls_checked'] += 1
+
+    args = _parse_json_maybe(sent_arguments)
+    if not args:
+        return None
+
+    schema = build_argument_schema(tool_schema, description)
+    if not schema["properties"]:
+        return None
+
+    repaired, ok = _coerce_object(args, schema)
+    if not ok:
+        return None
+
+    # The example values in the description are not real arguments
+    example = _parse_json_maybe(description)
+    if example and repaired == example:
+        return None
+
+    if not count_stats:
+        return repaired
+    if repaired == args:
+        REPAIR_STATS['valid_as_sent'] += 1
+    else:
+        REPAIR_STATS['repaired_locally'] += 1
+    # Previously every call not structurally matching the example went to the LLM
+    if not _json_structures_equal(args, example):
+        REPAIR_STATS['llm_requests_avoided'] += 1
+    return repaired
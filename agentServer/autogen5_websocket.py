@@ -1,20 +1,26 @@
 import asyncio
-import yaml
 import logging
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime
 from typing import Sequence, List
-import openai
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 import os
-from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams, SseServerParams
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import SelectorGroupChat
 from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
-from util.config_utils import _get_key
+from util.config_utils import _get_key_with_fallback
+from util.api_clients import get_shared_openai_client
+from util.prompt_registry import get_prompt_registry
+from util.record_replay import get_active_recording
+from util.tracing import get_tracer, with_trace_argument
 
 from PlannerAgent import PlannerAgent
 from FilteredWorkbench import FilteredWorkbench
+from workbench_pool import get_workbench_pool, default_server_params
 from stream_accumulator import StreamAccumulator
+from event_journal import EventJournal, journaling_enabled
 
 def _append_next_agent_instruction(agents_cfg: dict, agent_names: List[str]) -> None:
     """Mutate the description field of each agent by appending explicit hand-off instructions."""
@@ -145,17 +151,16 @@ def _check_agent_name_safety(agent_names: List[str]) -> bool:
                 
     return True
 
-def _create_llm_selector(agent_names: List[str], prompt_cfg: dict, oai_key: str) -> callable:
+def _create_llm_selector(agent_names: List[str]) -> callable:
     """Creates a closure for the selector function that has access to agent names."""
-    def _llm_selector(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
+    async def _llm_selector(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
         last_msg = next((m for m in reversed(thread) if isinstance(m, BaseChatMessage)), None)
         if not last_msg:
             return None
 
-        prompt = prompt_cfg["selector_prompt"]["description"].format(agent_names=agent_names, last_message=last_msg.content)
+        prompt = get_prompt_registry().get_prompt("selector_prompt").format(agent_names=agent_names, last_message=last_msg.content)
 
-        openai.api_key = oai_key
-        response = openai.chat.completions.create(
+        response = await get_shared_openai_client().chat.completions.create(
             model="gpt-4.1-mini",  # Updated to use mini model like autogen5.py
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that selects the next agent to call."},
@@ -171,8 +176,31 @@ def _create_llm_selector(agent_names: List[str], prompt_cfg: dict, oai_key: str)
 
     return _llm_selector
 
+def _compile_agent_name_patterns(agent_names: List[str]) -> tuple:
+    """
+    Precompiles the augmented agent names into one alternation (longest form first) plus a
+    lookup from normalized form to canonical name, so selection does no per-turn rebuilding.
+    Spaces in a form match any run of spaces/underscores ("committee_specialist").
+    """
+    form_to_name = {name.replace("_", " "): name for name in agent_names}
+    for augmented in __augment_agent_names(agent_names):
+        form_to_name.setdefault(augmented, __deaugment_agent_name(augmented, agent_names))
+
+    forms = sorted(form_to_name, key=len, reverse=True)
+    alternation = "|".join(r"[\s_]+".join(re.escape(word) for word in form.split(" ")) for form in forms)
+    name_regex = rf"(?<![A-Za-z0-9])(?:{alternation})(?![A-Za-z0-9])"
+
+    marker_pattern = re.compile(rf"NEXT_AGENT\s*:\s*[*`'\"]*\s*(?P<name>{name_regex})", re.IGNORECASE)
+    mention_pattern = re.compile(name_regex, re.IGNORECASE)
+    return marker_pattern, mention_pattern, form_to_name
+
+
 def _create_smart_selector(agent_names: List[str]) -> callable:
     """Creates a closure for the selector function that has access to agent names."""
+    marker_pattern, mention_pattern, form_to_name = _compile_agent_name_patterns(agent_names)
+
+    def _canonical(matched: str) -> str:
+        return form_to_name[re.sub(r"[\s_]+", " ", matched.lower())]
 
     def _explicit_selector(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
         """
@@ -180,13 +208,12 @@ def _create_smart_selector(agent_names: List[str]) -> callable:
 
         This function first checks for an explicit, reliable marker: `NEXT_AGENT: <name>`.
         If the marker is not found, it attempts a more lenient search, checking if the
-        last line of the message contains a mention of any of the available agents.
+        last line of the message contains a mention of exactly one other agent.
+        Returns None when there is no directive or the mention is ambiguous.
         """
         selector_logger.info("-" * 20)
         selector_logger.info("Selector function called.")
 
-        names = __augment_agent_names(agent_names)
-
         last_msg = next((m for m in reversed(thread) if isinstance(m, BaseChatMessage)), None)
 
         if not last_msg:
@@ -196,25 +223,29 @@ def _create_smart_selector(agent_names: List[str]) -> callable:
         txt = getattr(last_msg, "to_text", lambda: last_msg.content)()
         selector_logger.info(f"Analyzing message from '{last_msg.source}': '{txt.strip()}'")
 
-        # 1. Check for agent name mention (case-insensitive, underscore/space flexible).
-        last_line = txt.strip()
+        # 1. Explicit marker; the last one wins if the agent changed its mind
+        markers = list(marker_pattern.finditer(txt))
+        if markers:
+            name = _canonical(markers[-1].group("name"))
+            selector_logger.info(f"SUCCESS: Found explicit marker for '{name}'.")
+            return name
+
+        # 2. Check for agent name mention in the last line (case-insensitive, underscore/space flexible).
+        lines = [line for line in txt.strip().splitlines() if line.strip()]
+        last_line = lines[-1] if lines else ""
         selector_logger.info(f"No explicit marker. Analyzing last line for implicit mention: '{last_line}'")
 
-        lower_last_line = last_line.replace("_", " ").lower()
         mentioned_agents = []
-        for name in names:
-            # Check for forms like "committee_specialist" or "Committee agent"
-            name_with_space = name.replace("_", " ").lower()
-            if name.lower() in lower_last_line or name_with_space in lower_last_line:
-                if name != last_msg.source:
-                    mentioned_agents.append(name)
+        for match in mention_pattern.finditer(last_line):
+            name = _canonical(match.group(0))
+            if name != last_msg.source and name not in mentioned_agents:
+                mentioned_agents.append(name)
 
         if len(mentioned_agents) == 1:
             selector_logger.info(f"SUCCESS: Found implicit mention of '{mentioned_agents[0]}' in the last line.")
-            return __deaugment_agent_name(mentioned_agents[0], agent_names)
+            return mentioned_agents[0]
         elif len(mentioned_agents) > 1:
-            selector_logger.warning(f"Ambiguous: multiple agents {mentioned_agents} mentioned. We select the last one mentioned..")
-            return __deaugment_agent_name(mentioned_agents[-1], agent_names)
+            selector_logger.warning(f"Ambiguous: multiple agents {mentioned_agents} mentioned. Fallback to LLM.")
         else:
             selector_logger.info("No agent mentioned in last line. Fallback to LLM.")
 
@@ -222,15 +253,64 @@ def _create_smart_selector(agent_names: List[str]) -> callable:
 
     return _explicit_selector
 
+def _create_composite_selector(agent_names: List[str]) -> callable:
+    """
+    Creates a selector that tries the deterministic marker/mention parser first and only
+    asks the LLM when the parser finds nothing or an ambiguous mention. If the LLM answer
+    is unusable too, None lets SelectorGroupChat fall back to its own model-based selection.
+    Hit/miss counters are available on the returned function as `.stats`.
+    """
+    smart_selector = _create_smart_selector(agent_names)
+    llm_selector = _create_llm_selector(agent_names)
+    stats = {
+        'turns': 0,
+        'deterministic_hits': 0,
+        'llm_calls': 0,
+        'llm_hits': 0,
+        'llm_misses': 0,
+    }
+
+    async def _composite_selector(thread: Sequence[BaseAgentEvent | BaseChatMessage]) -> str | None:
+        with get_tracer().start_as_current_span("selector") as span:
+            stats['turns'] += 1
+            selected = smart_selector(thread)
+            if selected is not None:
+                stats['deterministic_hits'] += 1
+                span.set_attributes({"selector.method": "deterministic", "selector.agent": selected})
+                return selected
+
+            stats['llm_calls'] += 1
+            try:
+                selected = await llm_selector(thread)
+            except Exception as e:
+                selector_logger.warning(f"LLM selector failed: {e}")
+                selected = None
+            stats['llm_hits' if selected is not None else 'llm_misses'] += 1
+            selector_logger.info(f"LLM selector chose: {selected}")
+            span.set_attributes({"selector.method": "llm", "selector.agent": selected or ""})
+            return selected
+
+    _composite_selector.stats = stats
+    return _composite_selector
+
 
 # WebSocket Console that uses StreamAccumulator
 class WebSocketStreamingConsole:
     """Console that processes AutoGen stream messages and outputs to WebSocket"""
     
-    def __init__(self, stream_generator, websocket_callback=None, allowed_agents=None):
+    def __init__(self, stream_generator, websocket_callback=None, allowed_agents=None, journal=None):
         self.stream_generator = stream_generator
-        self.websocket_callback = websocket_callback
-        self.accumulator = StreamAccumulator(websocket_callback, allowed_agents)
+        self.journal = journal
+        # With a journal, every emitted event is recorded before it goes to the WebSocket
+        self.websocket_callback = self._journaling_callback(websocket_callback) if journal else websocket_callback
+        self.accumulator = StreamAccumulator(self.websocket_callback, allowed_agents)
+
+    def _journaling_callback(self, websocket_callback):
+        async def _emit(event):
+            self.journal.record(event)
+            if websocket_callback:
+                await websocket_callback(event)
+        return _emit
         
     async def run(self):
         """Process the stream by feeding messages directly to accumulator"""
@@ -271,72 +351,74 @@ selector_logger.addHandler(file_handler)
 local_path = os.path.dirname(os.path.abspath(__file__))
 
 
-async def run_full_investigation(company_name: str, bill: str, websocket_callback=None) -> None:
+@asynccontextmanager
+async def _lease_workbench(recording=None):
+    """Lease a pooled MCP workbench; when replaying a recording, no MCP server is contacted at all"""
+    if recording and recording.replaying:
+        yield recording.wrap_workbench(server_params=default_server_params())
+        return
+
+    pool = await get_workbench_pool()
+    async with pool.lease() as workbench:
+        yield recording.wrap_workbench(workbench) if recording else workbench
+
+
+async def _prefetch_bill_dossier(workbench, bill: str) -> None:
+    """Ask the ragMCP server to warm its caches for `bill` while the agents are being set up"""
+    if os.getenv("INVESTIGATION_PREFETCH", "1") == "0":
+        return
+    try:
+        await workbench.call_tool("prefetchBillDossier", with_trace_argument({"lobby_view_bill_id": bill}))
+    except Exception as e:
+        print(f"⚠️  Could not start prefetch for {bill}: {e}")
+
+
+async def run_full_investigation(company_name: str, bill: str, websocket_callback=None, session_id: str | None = None) -> None:
     """Run the full multi-agent investigation with WebSocket output using autogen5 configuration"""
     # -------------------- Config & constants --------------------
     year = 2018  # Added year parameter from autogen5.py
     selected_agent_names = ["committee_specialist", "bill_specialist", "orchestrator", "actions_specialist", "amendment_specialist", "congress_member_specialist"]
 
     # -------------------- Load YAML configs --------------------
-    # Updated to use agents_5.yaml and tasks_5.yaml
-    with open(f"{local_path}/config/agents_5.yaml", "r") as f:
-        agents_cfg = yaml.safe_load(f)
-    with open(f"{local_path}/config/tasks_5.yaml", "r") as f:
-        tasks_cfg = yaml.safe_load(f)
-    with open(f"{local_path}/config/prompt.yaml", "r") as f:
-        prompt_cfg = yaml.safe_load(f)
+    # Updated to use agents_5.yaml and tasks_5.yaml (parsed once, cached by the prompt registry)
+    registry = get_prompt_registry()
+    agents_cfg = registry.load("agents_5.yaml")
+    tasks_cfg = registry.load("tasks_5.yaml")
 
     # -------------------- Model client --------------------
-    try:
-        oai_key = _get_key("OPENAI_API_KEY")
-    except Exception as e:
-        print(f"⚠️  API key loading failed: {e}")
-        print("💡 Trying alternative approach...")
-        
-        # Try loading directly from secrets.ini
-        import configparser
-        config = configparser.ConfigParser()
-        secrets_paths = [
-            "/app/secrets.ini",
-            "/app/agentServer/secrets.ini", 
-            "secrets.ini"
-        ]
-        
-        oai_key = None
-        for path in secrets_paths:
-            if os.path.exists(path):
-                config.read(path)
-                try:
-                    oai_key = config["API_KEYS"]["OPENAI_API_KEY"]
-                    print(f"✅ Found API key in {path}")
-                    break
-                except KeyError:
-                    continue
-        
-        if not oai_key:
-            print("❌ Could not find OpenAI API key")
+    # With INVESTIGATION_RECORD_MODE=record/replay, completions and tool results are recorded or served offline
+    recording = get_active_recording()
+    if recording and recording.replaying:
+        recording.rewind()
+        model_client = recording.wrap_model_client()
+    else:
+        try:
+            oai_key = _get_key_with_fallback("OPENAI_API_KEY")
+        except ValueError as e:
+            print(f"❌ Could not find OpenAI API key: {e}")
             return
 
-    # Updated to use gpt-4.1-mini like autogen5.py
-    model_client = OpenAIChatCompletionClient(model="gpt-4.1-mini", api_key=oai_key)
+        # Updated to use gpt-4.1-mini like autogen5.py
+        model_client = OpenAIChatCompletionClient(model="gpt-4.1-mini", api_key=oai_key)
+        if recording:
+            model_client = recording.wrap_model_client(model_client)
 
     # -------------------- Workbench setup --------------------
-    # Connect to ragMCP server running in separate Docker container using SSE
-    ragmcp_base_url = os.getenv("RAGMCP_URL", "http://ragmcp:8080")
-    ragmcp_sse_url = f"{ragmcp_base_url}/sse"  # SSE endpoint path
-    params = SseServerParams(
-        url=ragmcp_sse_url,
-        timeout=60,  # Note: parameter name is 'timeout' not 'timeout_seconds'
-    )
+    # Lease a warm SSE session to the ragMCP server from the process-wide pool
+    async with _lease_workbench(recording) as workbench:
+        # Returns at once; recordings are skipped so their tool calls stay identical to a plain run
+        if not recording:
+            await _prefetch_bill_dossier(workbench, bill)
 
-    async with McpWorkbench(server_params=params) as workbench:
         # Updated tool allowlists to match autogen5.py
-        allowed_tool_names_orchestrator = ["getBillSummary"]
-        allowed_tool_names_comm = ["get_committee_members", "get_committee_actions", "getBillCommittees"]
-        allowed_tool_names_bill = ["getBillSponsors", "getBillCoSponsors", "getBillCommittees", "getRelevantBillSections", "getBillSummary"]
-        allowed_tool_names_actions = ["extractBillActions", "get_committee_actions"]
-        allowed_tool_names_amendments = ["getAmendmentSponsors", "getAmendmentCoSponsors", "getBillAmendments", "getAmendmentText", "getAmendmentActions"]
-        allowed_tool_names_congress_members = ["getCongressMemberName", "getCongressMemberParty", "getCongressMemberState", "getBillSponsors", "getBillCoSponsors"]
+        # fetchMore pages through tool responses the MCP server truncated to their token budget;
+        # queryWarehouse answers cross-bill questions from the member/committee/amendment sponsor views
+        allowed_tool_names_orchestrator = ["getBillSummary", "fetchMore"]
+        allowed_tool_names_comm = ["get_committee_members", "get_committee_actions", "getBillCommittees", "queryWarehouse", "fetchMore"]
+        allowed_tool_names_bill = ["getBillSponsors", "getBillCosponsors", "getBillCommittees", "getRelevantBillSections", "getBillSummary", "fetchMore"]
+        allowed_tool_names_actions = ["extractBillActions", "get_committee_actions", "fetchMore"]
+        allowed_tool_names_amendments = ["getAmendmentSponsors", "getAmendmentCoSponsors", "getBillAmendments", "getAmendmentText", "getAmendmentActions", "queryWarehouse", "fetchMore"]
+        allowed_tool_names_congress_members = ["getCongressMember", "getCongressMembersBatch", "getCongressMembersByState", "getBillSponsors", "getBillCosponsors", "queryWarehouse", "fetchMore"]
 
         workbench_comm = FilteredWorkbench(workbench, allowed_tool_names_comm)
         workbench_bill = FilteredWorkbench(workbench, allowed_tool_names_bill)
@@ -403,8 +485,7 @@ async def run_full_investigation(company_name: str, bill: str, websocket_callbac
         agents.append(orchestrator)
             
         # Create the selector function with access to the agent names
-        smart_selector = _create_smart_selector(agent_names=[a.name for a in agents])
-        llm_selector = _create_llm_selector(agent_names=[a.name for a in agents], prompt_cfg=prompt_cfg, oai_key=oai_key)
+        selector = _create_composite_selector(agent_names=[a.name for a in agents])
 
         if not _check_agent_name_safety(agent_names):
                 raise ValueError("Agent names are not safe to use in the selector function.")
@@ -412,7 +493,7 @@ async def run_full_investigation(company_name: str, bill: str, websocket_callbac
         team = SelectorGroupChat(
                 agents,
                 termination_condition=termination_condition,
-                selector_func=llm_selector,
+                selector_func=selector,
                 model_client=model_client,
                 max_turns=150
             )
@@ -421,13 +502,34 @@ async def run_full_investigation(company_name: str, bill: str, websocket_callbac
         # Define all agents for full investigation
         all_agent_names = [agent.name for agent in agents]
             
+        # Record the emitted events so the session can be replayed later
+        journal = None
+        if journaling_enabled():
+            journal = EventJournal(
+                session_id or f"{company_name}_{bill}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                metadata={"company": company_name, "bill": bill, "agents": all_agent_names},
+            )
+
         console = WebSocketStreamingConsole(
                 # Updated task format to match autogen5.py (using year and bill_name parameters)
                 team.run_stream(task=tasks_cfg["main_task"]["description"].format(year=year, bill_name=bill, company_name=company_name)),
                 websocket_callback,
-                allowed_agents=all_agent_names  # Pass all agent names for full investigation
+                allowed_agents=all_agent_names,  # Pass all agent names for full investigation
+                journal=journal
             )
-        await console.run()
+        try:
+            await console.run()
+        finally:
+            if journal:
+                journal.close()
+            if recording:
+                recording.save()
+
+        stats = selector.stats
+        hit_rate = stats['deterministic_hits'] / stats['turns'] if stats['turns'] else 0.0
+        print(f"🧭 Speaker selection: {stats['deterministic_hits']}/{stats['turns']} deterministic ({hit_rate:.0%}), "
+              f"{stats['llm_calls']} LLM calls ({stats['llm_misses']} unresolved)")
+        selector_logger.info(f"Selector stats: {stats}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Headless batch runner: investigates every (company, bill) pair of a LobbyView CSV.
+
+    python batch_runner.py ../frontend_demo/data/big_oil.csv --workers 4
+
+Pairs are deduplicated (a company lobbies on the same bill in many reports) and run as
+`run_full_investigation` on a bounded pool of async workers in this process, so they share
+the MCP workbench pool, the OpenAI client, the prompt registry and ragmcp's response cache.
+Each finished pair is written to `<output>/results/` (default batch/<csv name>) and appended to
+`<output>/checkpoint.jsonl`; running the same command again after a crash skips the pairs already
+concluded (failed and incomplete pairs are retried).
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from autogen5_websocket import run_full_investigation
+from workbench_pool import close_workbench_pool
+from util.tracing import setup_tracing, investigation_span, current_trace_id, pop_session_summary
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+RESULTS_DIR = "results"
+# Statuses that count as done on resume; "incomplete" and "failed" pairs are run again
+DONE_STATUSES = ("concluded",)
+
+Pair = Tuple[str, str]
+
+
+def load_investigation_pairs(csv_path: str, company_column: str = "client_name", bill_column: str = "bill_id",
+                             limit: Optional[int] = None) -> List[Pair]:
+    """Distinct (company, bill) pairs of a LobbyView CSV, in order of first appearance"""
+    pairs: Dict[Pair, None] = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            company = (row.get(company_column) or "").strip()
+            bill = (row.get(bill_column) or "").strip().lower()
+            if company and bill:
+                pairs.setdefault((company, bill), None)
+            if limit and len(pairs) >= limit:
+                break
+    return list(pairs)
+
+
+def pair_id(company: str, bill: str) -> str:
+    """Filesystem and session safe id of a pair"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", f"{company}__{bill}").strip("_")
+
+
+class BatchCheckpoint:
+    """Append-only JSONL log of finished pairs; the last line per pair wins"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        self.results_dir = self.output_dir / RESULTS_DIR
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.output_dir / CHECKPOINT_FILE
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # line cut short by a crash
+                    self.entries[entry["id"]] = entry
+        self._lock = asyncio.Lock()
+
+    def is_done(self, company: str, bill: str) -> bool:
+        entry = self.entries.get(pair_id(company, bill))
+        return entry is not None and entry["status"] in DONE_STATUSES
+
+    async def record(self, company: str, bill: str, status: str, seconds: float,
+                     result: Optional[dict] = None, error: Optional[str] = None) -> dict:
+        entry = {
+            "id": pair_id(company, bill),
+            "company": company,
+            "bill": bill,
+            "status": status,
+            "seconds": round(seconds, 2),
+            "finished_at": datetime.now().isoformat(),
+        }
+        if error:
+            entry["error"] = error
+        async with self._lock:
+            if result is not None:
+                # Written to a temp file first so a crash never leaves a half-written result
+                result_path = self.results_dir / f"{entry['id']}.json"
+                tmp_path = result_path.with_suffix(".json.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({**entry, **result}, f, indent=2, default=str)
+                os.replace(tmp_path, result_path)
+                entry["result_file"] = str(result_path.relative_to(self.output_dir))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[entry["id"]] = entry
+        return entry
+
+
+class ResultCollector:
+    """WebSocket callback that keeps what a batch result needs instead of streaming it"""
+
+    def __init__(self):
+        self.events = 0
+        self.messages: List[dict] = []
+        self.conclusion: Optional[dict] = None
+
+    async def __call__(self, event):
+        self.events += 1
+        data = event.get("data") or {}
+        if event["type"] == "agent_communication":
+            self.messages.append({"agent": data.get("agent"), "content": data.get("fullContent")})
+        elif event["type"] == "investigation_concluded":
+            self.conclusion = data
+
+    def result(self) -> dict:
+        return {
+            "events": self.events,
+            "final_message": self.messages[-1] if self.messages else None,
+            "table": self.conclusion.get("table_data") if self.conclusion else None,
+            "messages": self.messages,
+        }
+
+
+async def _investigate(company: str, bill: str, checkpoint: BatchCheckpoint, timeout: Optional[float]) -> dict:
+    session_id = f"batch_{pair_id(company, bill)}"
+    collector = ResultCollector()
+    start = time.perf_counter()
+    trace_id = None
+    try:
+        with investigation_span(session_id, company, bill):
+            trace_id = current_trace_id()
+            await asyncio.wait_for(run_full_investigation(company, bill, collector, session_id=session_id), timeout)
+    except Exception as e:
+        return await checkpoint.record(company, bill, "failed", time.perf_counter() - start,
+                                       result=collector.result(), error=f"{type(e).__name__}: {e}")
+    finally:
+        summary = pop_session_summary(trace_id)
+        if summary:
+            print(summary)
+    if collector.events == 0:
+        # run_full_investigation returns quietly when it can't set up (e.g. no OpenAI key)
+        return await checkpoint.record(company, bill, "failed", time.perf_counter() - start,
+                                       result=collector.result(), error="The investigation emitted no events")
+    status = "concluded" if collector.conclusion else "incomplete"
+    return await checkpoint.record(company, bill, status, time.perf_counter() - start, result=collector.result())
+
+
+async def run_batch(pairs: List[Pair], output_dir: str, workers: int = 2, timeout: Optional[float] = None) -> dict:
+    """Runs all pairs not done yet in `output_dir` on `workers` concurrent investigations"""
+    checkpoint = BatchCheckpoint(output_dir)
+    pending = [(company, bill) for company, bill in pairs if not checkpoint.is_done(company, bill)]
+    print(f"📋 {len(pairs)} pairs, {len(pairs) - len(pending)} already done, {len(pending)} to run on {workers} workers")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for pair in pending:
+        queue.put_nowait(pair)
+    counts: Dict[str, int] = {}
+
+    async def _worker(worker_id: int):
+        while True:
+            try:
+                company, bill = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            print(f"▶️  [worker {worker_id}] {company} / {bill} ({queue.qsize()} queued)")
+            entry = await _investigate(company, bill, checkpoint, timeout)
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+            print(f"✅ [worker {worker_id}] {company} / {bill}: {entry['status']} in {entry['seconds']}s")
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(_worker(i + 1) for i in range(max(1, workers))))
+    finally:
+        await close_workbench_pool()
+    print(f"📊 Batch finished in {time.perf_counter() - start:.1f}s: {counts}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path", help="LobbyView CSV (e.g. ../frontend_demo/data/big_oil.csv)")
+    parser.add_argument("--output", default=None,
+                        help="Directory for results and the checkpoint (default batch/<csv name>, reuse it to resume)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BATCH_WORKERS", "2")),
+                        help="Concurrent investigations (keep RAGMCP_POOL_MAX_SIZE at least this high)")
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N distinct pairs")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before an investigation counts as failed")
+    parser.add_argument("--company-column", default="client_name")
+    parser.add_argument("--bill-column", default="bill_id")
+    args = parser.parse_args()
+
+    # Journals of a whole sector are rarely replayed; keep them off unless asked for
+    os.environ.setdefault("INVESTIGATION_JOURNAL", "0")
+    setup_tracing()
+
+    # Derived from the CSV, not the date, so the same command resumes after midnight
+    output_dir = args.output or os.path.join("batch", Path(args.csv_path).stem)
+    pairs = load_investigation_pairs(args.csv_path, args.company_column, args.bill_column, args.limit)
+    asyncio.run(run_batch(pairs, output_dir, args.workers, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Per-session investigation event journal.
+
+Every event an investigation emits to the frontend is appended to a JSONL file
+(optionally zstd-compressed) together with its offset from the session start,
+so a past session can be replayed to a client without running agents or LLMs.
+
+Line format:
+    {"t": 0.0, "session": {"session_id": ..., "company": ..., "bill": ..., ...}}
+    {"t": 1.234, "event": {"type": "agent_communication", ...}}
+"""
+
+import asyncio
+import io
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JOURNAL_DIR = os.getenv("INVESTIGATION_JOURNAL_DIR", "journals")
+JOURNAL_SUFFIXES = (".jsonl", ".jsonl.zst")
+# Buffered events are flushed at most this often (and on close), a crashed session loses only those
+FLUSH_INTERVAL = float(os.getenv("INVESTIGATION_JOURNAL_FLUSH_SECONDS", "5"))
+
+
+def journaling_enabled() -> bool:
+    return os.getenv("INVESTIGATION_JOURNAL", "1").lower() not in ("0", "false", "no")
+
+
+def _default_compression() -> bool:
+    return os.getenv("INVESTIGATION_JOURNAL_COMPRESSION", "").lower() == "zstd"
+
+
+class EventJournal:
+    """Append-only JSONL journal of the events of one investigation session"""
+
+    def __init__(self, session_id: str, metadata: Optional[dict] = None,
+                 journal_dir: str = JOURNAL_DIR, compress: Optional[bool] = None):
+        self.session_id = session_id
+        self.journal_dir = Path(journal_dir)
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+
+        compress = _default_compression() if compress is None else compress
+        if compress and zstandard is None:
+            print("⚠️  zstandard is not installed, writing an uncompressed journal")
+            compress = False
+        self.compressed = compress
+
+        safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in session_id)
+        self.path = self.journal_dir / f"{safe_id}{JOURNAL_SUFFIXES[1] if compress else JOURNAL_SUFFIXES[0]}"
+
+        self._raw = open(self.path, "ab")
+        self._writer = zstandard.ZstdCompressor().stream_writer(self._raw) if compress else self._raw
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self.events_written = 0
+        self._closed = False
+
+        self._write({
+            "t": 0.0,
+            "session": {
+                "session_id": session_id,
+                "started_at": datetime.now().isoformat(),
+                **(metadata or {}),
+            },
+        })
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, default=str, ensure_ascii=False) + "\n"
+        self._writer.write(line.encode("utf-8"))
+        # Not per line: every flush is a blocking write and ends a zstd block
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_INTERVAL:
+            self._writer.flush()
+            self._last_flush = now
+
+    def record(self, event: dict) -> None:
+        """Append one emitted event"""
+        if self._closed:
+            return
+        try:
+            self._write({"t": round(time.monotonic() - self._start, 4), "event": event})
+            self.events_written += 1
+        except Exception as e:
+            print(f"⚠️  Could not journal event: {e}")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.compressed:
+                self._writer.close()  # also closes the underlying file
+            else:
+                self._raw.close()
+        except Exception as e:
+            print(f"⚠️  Could not close journal {self.path}: {e}")
+        print(f"📓 Journal saved: {self.path} ({self.events_written} events)")
+
+
+def find_journal(session_id: str, journal_dir: str = JOURNAL_DIR) -> Optional[Path]:
+    """Journal file of a session, or None"""
+    safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in session_id)
+    for suffix in JOURNAL_SUFFIXES:
+        path = Path(journal_dir) / f"{safe_id}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def list_journals(journal_dir: str = JOURNAL_DIR) -> List[dict]:
+    """Recorded sessions, newest first"""
+    journals = []
+    for path in Path(journal_dir).glob("*.jsonl*"):
+        if not path.name.endswith(JOURNAL_SUFFIXES):
+            continue
+        journals.append({
+            "sessionId": path.name.split(".jsonl")[0],
+            "file": path.name,
+            "size": path.stat().st_size,
+            "modified": path.stat().st_mtime,
+        })
+    return sorted(journals, key=lambda j: j["modified"], reverse=True)
+
+
+def read_journal(path: Path) -> Iterator[Tuple[float, dict]]:
+    """
+    Yields (offset, record) for every line of a journal. `record` has either a "session"
+    or an "event" key. A truncated last line (crashed session) is ignored.
+    """
+    path = Path(path)
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read compressed journals")
+        raw = open(path, "rb")
+        stream = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw), encoding="utf-8")
+    else:
+        stream = open(path, "r", encoding="utf-8")
+
+    with stream:
+        for line in stream:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            yield record.get("t", 0.0), record
+
+
+def read_journal_header(path: Path) -> dict:
+    """The "session" metadata of a journal (its first line), or {}"""
+    records = read_journal(path)
+    try:
+        for _, record in records:
+            return record.get("session", {})
+        return {}
+    finally:
+        # Closes the file now rather than whenever the generator is collected
+        records.close()
+
+
+async def replay_journal(path: Path, send: Callable[[dict], Awaitable[None]], speed: float = 1.0) -> int:
+    """
+    Re-emits the events of a journal through `send`, keeping their original spacing
+    divided by `speed` (speed <= 0 sends as fast as possible). Returns the number of events sent.
+    """
+    sent = 0
+    previous = 0.0
+    for offset, record in read_journal(path):
+        event = record.get("event")
+        if event is None:
+            continue
+        if speed > 0 and offset > previous:
+            await asyncio.sleep((offset - previous) / speed)
+        previous = offset
+        await send(dict(event))
+        sent += 1
+    return sent
@@ -2,49 +2,24 @@
 LLM Summarization utilities for AutoGen communications and tool results.
 """
 
-import openai
-import configparser
-import os
-from pathlib import Path
+from util.api_clients import get_shared_openai_client
+from util.tracing import traced
 
 class LLMSummarizer:
     def __init__(self):
         self.client = None
-        self._load_api_key()
+        self._load_client()
     
-    def _load_api_key(self):
-        """Load OpenAI API key from secrets.ini"""
+    def _load_client(self):
+        """Reuse the process-wide AsyncOpenAI client"""
         try:
-            config = configparser.ConfigParser()
-            # Try multiple possible locations
-            secrets_paths = [
-                "/app/secrets.ini",
-                "/app/agentServer/secrets.ini",
-                "secrets.ini",
-                Path(__file__).parent / "secrets.ini",
-                Path(__file__).parent.parent / "secrets.ini"
-            ]
-            
-            api_key = None
-            for path in secrets_paths:
-                if os.path.exists(str(path)):
-                    config.read(str(path))
-                    try:
-                        # Use the correct section and key names
-                        api_key = config["API_KEYS"]["OPENAI_API_KEY"]
-                        print(f"✅ LLM Summarizer: Found API key in {path}")
-                        break
-                    except KeyError:
-                        continue
-            
-            if api_key:
-                self.client = openai.OpenAI(api_key=api_key)
-                print("✅ LLM Summarizer: Initialized successfully")
-            else:
-                print("⚠️  LLM Summarizer: API key not found, summarization disabled")
+            self.client = get_shared_openai_client()
+        except ValueError:
+            print("⚠️  LLM Summarizer: API key not found, summarization disabled")
         except Exception as e:
-            print(f"❌ LLM Summarizer: Error loading API key: {e}")
+            print(f"❌ LLM Summarizer: Error creating client: {e}")
     
+    @traced("summarizer.agent_communication")
     async def summarize_agent_communication(self, agent_name: str, full_content: str) -> str:
         """
         Generate a very concise summary of agent communication (10 tokens max) for the UI box display.
@@ -63,7 +38,7 @@ class LLMSummarizer:
             Return a summary of EXACTLY 20 tokens or less
             """
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 messages=[
                     {"role": "system", "content": "You are a concise summarizer. Respond with EXACTLY 10 tokens or less. Focus on the main action or finding."},
@@ -84,6 +59,7 @@ class LLMSummarizer:
             print(f"Error summarizing agent communication: {e}")
             return full_content[:200] + "..." if len(full_content) > 200 else full_content
     
+    @traced("summarizer.tool_result")
     async def summarize_tool_call_result(self, tool_name: str, result_content: str) -> str:
         """
         Generate a 5-word summary of tool call results for the loading box.
@@ -105,7 +81,7 @@ Examples:
 
 5-word summary:"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You summarize tool results in exactly 5 words. Be specific about numbers and outcomes."},
@@ -127,6 +103,7 @@ Examples:
             print(f"Error summarizing tool result: {e}")
             return f"{tool_name} completed"
     
+    @traced("summarizer.tool_call_details")
     async def parse_tool_call_details(self, tool_name: str, arguments: dict, result_content: str) -> dict:
         """
         Parse tool call results into structured format for detailed display.
@@ -160,7 +137,7 @@ Format as JSON:
   "success": true
 }}"""
 
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You extract structured data from tool call results. Return valid JSON only."},
@@ -2,11 +2,15 @@
 """
 Silent buffer-based logging system
 - NO console output during runtime
-- Buffers ALL logs in memory
-- Writes buffer to file ONLY at shutdown
+- Buffers logs in a bounded in-memory ring buffer
+- A background writer thread flushes batches to rotating, gzip-compressed log files
 """
 
+import atexit
+import gzip
 import logging
+import os
+import shutil
 import sys
 import time
 import threading
@@ -16,20 +20,76 @@ from collections import deque
 import json
 import re
 
+# All patterns are compiled once; each stage is a single regex pass per record. Keyword
+# patterns are lowercase and run on the lowercased text (much faster than re.IGNORECASE).
+
+# Timestamp/level/logger prefix and an optional "LEVEL:autogen...:" prefix
+PREFIX_PATTERN = re.compile(
+    r'^(?:\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}\s*\|\s*\w+\s*\|\s*\w+\s*\|\s*)?'
+    r'(?:(?:INFO|DEBUG|WARNING|ERROR):autogen[^:]*:\s*)?'
+)
+HTTP_REQUEST_PREFIX = re.compile(r'^.*HTTP Request:\s*')
+
+# Agent communications, tool calls, investigation status and errors are always kept
+KEEP_PATTERN = re.compile(
+    r'orchestrator|committee_specialist|bill_specialist|actions_specialist|amendment_specialist|congress_member_specialist'
+    r'|tool_call|execute_function|function_result'
+    r'|investigation|starting|complete|concluded|terminate'
+    r'|error|exception|failed|traceback|429|rate limit'
+)
+
+# Common noise, only skipped in short messages
+NOISE_PATTERN = re.compile(
+    r'starting|ready|listening|connected|disconnected|received ping|sent pong|heartbeat|keepalive|health check'
+)
+HTTP_SUCCESS_PATTERN = re.compile(r'http/1\.1 20[01]')
+ERROR_OR_FAILED_PATTERN = re.compile(r'error|failed')
+
+# Message classification: one alternation with a named group per type. Types earlier in
+# CLASSIFICATION_PRIORITY win when several match, as with the former one-pattern-per-type loop.
+CLASSIFICATION_PRIORITY = ['openai_error', 'tool_call', 'error', 'warning']
+CLASSIFY_PATTERN = re.compile(
+    r'(?P<openai_error>429|too many requests|rate limit|retrying request)'
+    r'|(?P<tool_call>tool_call|toolcallevent|execute_function|calling function)'
+    r'|(?P<error>error|exception|traceback|failed)'
+    r'|(?P<warning>warning|warn)'
+)
+# Message type -> stats counter
+TYPE_STATS = {
+    'openai_error': 'openai_errors',
+    'tool_call': 'tool_calls',
+    'error': 'errors',
+    'warning': 'warnings',
+}
+
+# Startup/status prints that still reach the real console
+CONSOLE_MARKERS = re.compile('[🚀📍🔇📁🤐]')
+
 class SilentBufferLogger:
-    """Captures all logs silently in buffer, writes at shutdown only"""
+    """Captures all logs silently in a bounded buffer, streams them to disk in the background"""
     
-    def __init__(self, log_dir="logs"):
+    def __init__(self, log_dir="logs", buffer_size=10000, batch_size=500, flush_interval=1.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=10, capture=True):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(exist_ok=True)
         
-        # In-memory buffer for all log messages
-        self.message_buffer = []
-        self.buffer_lock = threading.Lock()
+        # Bounded ring buffer of raw records not yet processed. Producers only append
+        # (atomic on a deque, no lock); the writer thread extracts, classifies and writes.
+        # When the writer falls behind, the oldest records are dropped instead of growing
+        # memory without limit.
+        self.message_buffer = deque(maxlen=buffer_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        # Rotation: the active file is rolled into a compressed segment once it exceeds max_bytes
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.segment = 0
         
         # Session info
         self.start_time = datetime.now()
         self.session_id = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.log_file = self.log_dir / f"silent_autogen_{self.session_id}.log"
         
         # Stats tracking
         self.stats = {
@@ -40,21 +100,27 @@ class SilentBufferLogger:
             'warnings': 0,
             'info': 0
         }
+        self.dropped_messages = 0
+        self.written_messages = 0
         
-        # Message classification patterns
-        self.patterns = {
-            'openai_error': re.compile(r'(429|Too Many Requests|rate limit|Retrying request)', re.IGNORECASE),
-            'tool_call': re.compile(r'(tool_call|ToolCallEvent|execute_function|calling function)', re.IGNORECASE),
-            'error': re.compile(r'(ERROR|Exception|Traceback|Failed)', re.IGNORECASE),
-            'warning': re.compile(r'(WARNING|WARN)', re.IGNORECASE)
-        }
+        # Background writer
+        self._file = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._closed = False
+        self._open_log_file()
+        self._writer = threading.Thread(target=self._writer_loop, name="silent-log-writer", daemon=True)
+        self._writer.start()
+        # Flush what we have even if shutdown_logging() is never reached
+        atexit.register(self.write_buffer_to_file)
         
         # Setup silent logging capture
-        self.setup_silent_capture()
+        if capture:
+            self.setup_silent_capture()
         
         # ONLY print startup message, then go silent
-        print(f"🔇 Silent logging active - buffer mode")
-        print(f"📁 Will write to: logs/silent_autogen_{self.session_id}.log")
+        print(f"🔇 Silent logging active - streaming buffer mode")
+        print(f"📁 Writing to: {self.log_file} (rotated segments are gzip-compressed)")
         print("🤐 Console output suppressed during runtime")
     
     def setup_silent_capture(self):
@@ -121,7 +187,7 @@ class SilentBufferLogger:
                         f'captured_{self.stream_name}'
                     )
                 # Also write to original stream for critical messages
-                if ('🚀' in text or '📍' in text or '🔇' in text or '📁' in text or '🤐' in text):
+                if CONSOLE_MARKERS.search(text):
                     self.original_stream.write(text)
                     self.original_stream.flush()
             
@@ -133,42 +199,51 @@ class SilentBufferLogger:
         sys.stderr = BufferWriter(self, 'stderr')
     
     def buffer_message(self, message, level, logger_name):
-        """Add message to buffer with content extraction and filtering (completely silent)"""
+        """Enqueue a raw record (completely silent, lock-free; processed by the writer thread)"""
         try:
-            with self.buffer_lock:
-                # Extract actual content from the message
-                extracted_content = self.extract_message_content(message, logger_name)
-                
-                # Skip if no meaningful content after extraction
-                if not extracted_content or self.should_skip_message(extracted_content, logger_name):
-                    return
-                
-                # Classify the extracted content
-                msg_type = self.classify_message(extracted_content)
-                
-                # Update stats
-                self.stats['total_messages'] += 1
-                if msg_type in self.stats:
-                    self.stats[msg_type] += 1
-                elif level.upper() in ['INFO', 'DEBUG']:
-                    self.stats['info'] += 1
-                
-                # Create enhanced buffer entry
-                entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'level': level,
-                    'logger': logger_name,
-                    'type': msg_type,
-                    'content': extracted_content,
-                    'raw_message': message if extracted_content != message else None
-                }
-                
-                self.message_buffer.append(entry)
-                
+            buffer = self.message_buffer
+            if len(buffer) == buffer.maxlen:
+                self.dropped_messages += 1
+            buffer.append((datetime.now(), message, level, logger_name))
+            if len(buffer) >= self.batch_size:
+                self._wakeup.set()
         except Exception:
             # Completely silent - no error handling output
             pass
     
+    def process_record(self, timestamp, message, level, logger_name):
+        """Extract, filter and classify one raw record. Returns the log entry or None if skipped."""
+        try:
+            # Extract actual content from the message
+            extracted_content = self.extract_message_content(message, logger_name)
+            
+            # Skip if no meaningful content after extraction
+            if not extracted_content or self.should_skip_message(extracted_content, logger_name):
+                return None
+            
+            # Classify the extracted content
+            msg_type = self.classify_message(extracted_content)
+            
+            # Update stats (only the writer thread touches them)
+            self.stats['total_messages'] += 1
+            if msg_type in TYPE_STATS:
+                self.stats[TYPE_STATS[msg_type]] += 1
+            elif level.upper() in ['INFO', 'DEBUG']:
+                self.stats['info'] += 1
+            
+            # Create enhanced buffer entry
+            return {
+                'timestamp': timestamp.isoformat(),
+                'level': level,
+                'logger': logger_name,
+                'type': msg_type,
+                'content': extracted_content,
+                'raw_message': message if extracted_content != message else None
+            }
+        except Exception:
+            # Completely silent - no error handling output
+            return None
+    
     def extract_message_content(self, message, logger_name):
         """Extract actual content from log messages, removing prefixes and metadata"""
         try:
@@ -177,13 +252,8 @@ class SilentBufferLogger:
                 return message.strip()
             
             # Remove timestamp prefixes like "2025-08-17 14:30:15,123 | INFO | autogen | "
-            content = re.sub(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}\s*\|\s*\w+\s*\|\s*\w+\s*\|\s*', '', message)
-            
-            # Remove additional AutoGen prefixes
-            content = re.sub(r'^INFO:autogen[^:]*:\s*', '', content)
-            content = re.sub(r'^DEBUG:autogen[^:]*:\s*', '', content)
-            content = re.sub(r'^WARNING:autogen[^:]*:\s*', '', content)
-            content = re.sub(r'^ERROR:autogen[^:]*:\s*', '', content)
+            # and AutoGen prefixes like "INFO:autogen_core:" in one pass
+            content = PREFIX_PATTERN.sub('', message, count=1)
             
             # Remove HTTP request prefixes but keep the important part
             if 'HTTP Request:' in content:
@@ -191,27 +261,15 @@ class SilentBufferLogger:
                 if '200' in content or '201' in content:
                     return None  # Skip successful HTTP requests
                 # Keep errors and rate limits
-                content = re.sub(r'^.*HTTP Request:\s*', 'HTTP Request: ', content)
-            
-            # Extract AutoGen agent communications
-            if any(agent in content.lower() for agent in ['orchestrator', 'committee_specialist', 'bill_specialist', 'actions_specialist', 'amendment_specialist', 'congress_member_specialist']):
-                # This looks like agent communication - keep it all
-                return content.strip()
+                content = HTTP_REQUEST_PREFIX.sub('HTTP Request: ', content, count=1)
             
-            # Extract tool calls and results
-            if any(keyword in content.lower() for keyword in ['tool_call', 'execute_function', 'function_result']):
-                return content.strip()
-            
-            # Extract investigation status messages
-            if any(keyword in content.lower() for keyword in ['investigation', 'starting', 'complete', 'concluded', 'terminate']):
-                return content.strip()
+            cleaned = content.strip()
             
-            # Extract errors and important warnings
-            if any(keyword in content.lower() for keyword in ['error', 'exception', 'failed', 'traceback', '429', 'rate limit']):
-                return content.strip()
+            # Agent communications, tool calls, status messages and errors are kept whole
+            if KEEP_PATTERN.search(content.lower()):
+                return cleaned
             
-            # For other messages, clean and return if substantial
-            cleaned = content.strip()
+            # For other messages, return if substantial
             if len(cleaned) > 10:  # Only keep messages with some substance
                 return cleaned
             
@@ -230,29 +288,15 @@ class SilentBufferLogger:
             content_lower = content.lower()
             
             # Skip common noise
-            noise_patterns = [
-                'starting',
-                'ready',
-                'listening',
-                'connected',
-                'disconnected',
-                'received ping',
-                'sent pong',
-                'heartbeat',
-                'keepalive',
-                'health check'
-            ]
-            
-            for pattern in noise_patterns:
-                if pattern in content_lower and len(content) < 50:
-                    return True
+            if len(content) < 50 and NOISE_PATTERN.search(content_lower):
+                return True
             
             # Skip repetitive HTTP success messages
-            if 'http/1.1 200' in content_lower or 'http/1.1 201' in content_lower:
+            if HTTP_SUCCESS_PATTERN.search(content_lower):
                 return True
             
             # Skip verbose websocket messages unless they're errors
-            if 'websocket' in content_lower and 'error' not in content_lower and 'failed' not in content_lower:
+            if 'websocket' in content_lower and not ERROR_OR_FAILED_PATTERN.search(content_lower):
                 return True
             
             # Skip asyncio debug messages
@@ -265,20 +309,94 @@ class SilentBufferLogger:
             return False  # When in doubt, keep the message
     
     def classify_message(self, message):
-        """Classify message type"""
+        """Classify message type in a single scan of the message"""
         try:
-            for msg_type, pattern in self.patterns.items():
-                if pattern.search(message):
+            found = set()
+            for match in CLASSIFY_PATTERN.finditer(message.lower()):
+                if match.lastgroup == CLASSIFICATION_PRIORITY[0]:
+                    return match.lastgroup
+                found.add(match.lastgroup)
+            for msg_type in CLASSIFICATION_PRIORITY:
+                if msg_type in found:
                     return msg_type
             return 'info'
         except Exception:
             return 'unknown'
     
+    def _open_log_file(self):
+        self._file = open(self.log_file, 'a', encoding='utf-8')
+        self._file.write("=== SILENT AUTOGEN SESSION LOG ===\n")
+        self._file.write(f"Session: {self.session_id}\n")
+        self._file.write(f"Segment: {self.segment}\n")
+        self._file.write("=" * 50 + "\n\n")
+        self._file.write("=== FILTERED AUTOGEN CONTENT ===\n\n")
+        self._file.flush()
+    
+    def _rotate(self):
+        """Compress the active file into a numbered segment and start a new one"""
+        self._file.close()
+        self.segment += 1
+        segment_file = self.log_dir / f"silent_autogen_{self.session_id}.{self.segment}.log.gz"
+        with open(self.log_file, 'rb') as src, gzip.open(segment_file, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.log_file)
+        
+        # Keep only the newest backup_count segments
+        expired = self.log_dir / f"silent_autogen_{self.session_id}.{self.segment - self.backup_count}.log.gz"
+        if expired.exists():
+            expired.unlink()
+        self._open_log_file()
+    
+    @staticmethod
+    def _format_entry(entry):
+        # Write in a more readable format
+        text = (f"[{entry['timestamp']}] [{entry['level']}] [{entry['type'].upper()}]\n"
+                f"Logger: {entry['logger']}\n"
+                f"Content: {entry['content']}\n")
+        if entry.get('raw_message') and entry['raw_message'] != entry['content']:
+            text += f"Raw: {entry['raw_message']}\n"
+        return text + "\n" + "-"*80 + "\n\n"
+    
+    def _next_batch(self):
+        batch = []
+        buffer = self.message_buffer
+        while buffer and len(batch) < self.batch_size:
+            entry = self.process_record(*buffer.popleft())
+            if entry is not None:
+                batch.append(entry)
+        return batch
+    
+    def _flush_batch(self):
+        """Process and write everything currently buffered; runs on the writer thread (or at shutdown)"""
+        batch = self._next_batch()
+        while batch:
+            self._file.write("".join(self._format_entry(entry) for entry in batch))
+            self.written_messages += len(batch)
+            batch = self._next_batch()
+        self._file.flush()
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+    
+    def _writer_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._flush_batch()
+            except Exception:
+                # Completely silent - keep the writer alive
+                pass
+    
     def write_buffer_to_file(self):
-        """Write entire buffer to file at shutdown"""
+        """Stop the writer, flush the remaining buffer and write the session summary"""
+        if self._closed:
+            return str(self.log_file)
+        self._closed = True
         try:
-            # Generate final log file
-            log_file = self.log_dir / f"silent_autogen_{self.session_id}.log"
+            self._stopped.set()
+            self._wakeup.set()
+            self._writer.join(timeout=5)
+            self._flush_batch()
             
             # Calculate session duration
             end_time = datetime.now()
@@ -290,43 +408,31 @@ class SilentBufferLogger:
                 'start_time': self.start_time.isoformat(),
                 'end_time': end_time.isoformat(),
                 'duration_seconds': duration,
-                'total_messages': len(self.message_buffer),
+                'total_messages': self.stats['total_messages'],
+                'written_messages': self.written_messages,
+                'dropped_messages': self.dropped_messages,
+                'segments': self.segment + 1,
                 'stats': self.stats
             }
             
-            with open(log_file, 'w', encoding='utf-8') as f:
-                # Write session header
-                f.write("=== SILENT AUTOGEN SESSION LOG ===\n")
-                f.write(f"Session: {self.session_id}\n")
-                f.write(f"Duration: {duration:.1f} seconds\n")
-                f.write(f"Total Messages: {len(self.message_buffer)}\n")
-                f.write(f"OpenAI Errors: {self.stats['openai_errors']}\n")
-                f.write(f"Tool Calls: {self.stats['tool_calls']}\n")
-                f.write(f"Errors: {self.stats['errors']}\n")
-                f.write(f"Warnings: {self.stats['warnings']}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                # Write session metadata as JSON
-                f.write("SESSION_METADATA: " + json.dumps(session_info) + "\n\n")
-                
-                # Write filtered and cleaned messages
-                f.write("=== FILTERED AUTOGEN CONTENT ===\n\n")
-                
-                for entry in self.message_buffer:
-                    # Write in a more readable format
-                    f.write(f"[{entry['timestamp']}] [{entry['level']}] [{entry['type'].upper()}]\n")
-                    f.write(f"Logger: {entry['logger']}\n")
-                    f.write(f"Content: {entry['content']}\n")
-                    if entry.get('raw_message') and entry['raw_message'] != entry['content']:
-                        f.write(f"Raw: {entry['raw_message']}\n")
-                    f.write("\n" + "-"*80 + "\n\n")
+            f = self._file
+            f.write("=== SESSION SUMMARY ===\n")
+            f.write(f"Duration: {duration:.1f} seconds\n")
+            f.write(f"Total Messages: {self.stats['total_messages']}\n")
+            f.write(f"Dropped Messages: {self.dropped_messages}\n")
+            f.write(f"OpenAI Errors: {self.stats['openai_errors']}\n")
+            f.write(f"Tool Calls: {self.stats['tool_calls']}\n")
+            f.write(f"Errors: {self.stats['errors']}\n")
+            f.write(f"Warnings: {self.stats['warnings']}\n")
+            f.write("SESSION_METADATA: " + json.dumps(session_info) + "\n")
+            f.close()
             
             # Print final summary (ONLY thing printed during shutdown)
             print(f"\n📊 SESSION COMPLETE")
-            print(f"Duration: {duration:.1f}s | Messages: {len(self.message_buffer)} | Errors: {self.stats['openai_errors']}")
-            print(f"📁 Full log saved: {log_file}")
+            print(f"Duration: {duration:.1f}s | Messages: {self.written_messages} | Dropped: {self.dropped_messages} | Errors: {self.stats['openai_errors']}")
+            print(f"📁 Full log saved: {self.log_file} (+{self.segment} compressed segments)")
             
-            return str(log_file)
+            return str(self.log_file)
             
         except Exception as e:
             print(f"Error writing log file: {e}")
@@ -338,6 +444,9 @@ class SilentBufferLogger:
             'session_id': self.session_id,
             'duration': (datetime.now() - self.start_time).total_seconds(),
             'buffer_size': len(self.message_buffer),
+            'written_messages': self.written_messages,
+            'dropped_messages': self.dropped_messages,
+            'segments': self.segment + 1,
             'stats': self.stats.copy()
         }
 
@@ -352,7 +461,7 @@ def setup_silent_logging():
     return _global_logger
 
 def shutdown_logging():
-    """Write buffer to file and cleanup"""
+    """Flush the remaining buffer to file and cleanup"""
     global _global_logger
     if _global_logger:
         return _global_logger.write_buffer_to_file()
@@ -21,6 +21,7 @@ sys.path.append(str(current_dir))
 
 from websocket_server import WebSocketServer  
 from silent_buffer_logger import setup_silent_logging, shutdown_logging
+from workbench_pool import close_workbench_pool
 
 class LoggingWebSocketServer(WebSocketServer):
     """Enhanced WebSocket server with silent buffer logging"""
@@ -122,6 +123,11 @@ async def main():
                     task.cancel()
             except Exception as e:
                 print(f"Error during cleanup: {e}")
+
+        try:
+            await close_workbench_pool()
+        except Exception as e:
+            print(f"Error closing MCP workbench pool: {e}")
         
         # Write buffer to log file
         try:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark the silent logging pipeline on a recorded investigation log.
+
+Usage:
+    python tests/benchmark_log_pipeline.py [path/to/silent_autogen_*.log[.gz] ...]
+
+Without arguments the newest logs/silent_autogen_*.log is used. Reports records/second
+for the producer side (buffer_message, what every log call and print pays) and for the
+writer side (extraction, filtering and classification).
+"""
+
+import gzip
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from silent_buffer_logger import SilentBufferLogger
+
+
+def load_records(path: Path) -> list:
+    """(message, level, logger) records from a silent_autogen log, or one record per line of any other log"""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+
+    records = []
+    level, logger, content = "INFO", "autogen", None
+    for line in lines:
+        if line.startswith("[") and "] [" in line:
+            level = line.split("] [")[1]
+        elif line.startswith("Logger: "):
+            logger = line[len("Logger: "):]
+        elif line.startswith("Content: "):
+            content = line[len("Content: "):]
+        elif line.startswith("Raw: "):
+            content = line[len("Raw: "):]
+        elif line.startswith("-" * 80) and content is not None:
+            records.append((content, level, logger))
+            content = None
+
+    if not records:
+        records = [(line, "INFO", "autogen") for line in lines if line.strip()]
+    return records
+
+
+def benchmark(records: list, repeat: int = 5) -> None:
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = SilentBufferLogger(log_dir=log_dir, buffer_size=len(records) * repeat + 1,
+                                    batch_size=len(records) * repeat + 1, flush_interval=3600, capture=False)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for message, level, logger_name in records:
+                logger.buffer_message(message, level, logger_name)
+        enqueue_elapsed = time.perf_counter() - start
+
+        now = datetime.now()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for message, level, logger_name in records:
+                logger.process_record(now, message, level, logger_name)
+        process_elapsed = time.perf_counter() - start
+
+        logger.message_buffer.clear()
+        logger.write_buffer_to_file()
+
+    total = len(records) * repeat
+    print(f"📊 {len(records)} records x {repeat}")
+    print(f"   enqueue (buffer_message): {total / enqueue_elapsed:,.0f} records/s")
+    print(f"   process (extract/filter/classify): {total / process_elapsed:,.0f} records/s")
+    print(f"   stats: {logger.stats}")
+
+
+if __name__ == "__main__":
+    paths = [Path(p) for p in sys.argv[1:]]
+    if not paths:
+        recorded = sorted(Path("logs").glob("silent_autogen_*.log"))
+        if not recorded:
+            print("❌ No recorded log found; pass a silent_autogen_*.log from an investigation")
+            sys.exit(1)
+        paths = [recorded[-1]]
+
+    records = []
+    for path in paths:
+        records.extend(load_records(path))
+    print(f"📁 Loaded {len(records)} records from {', '.join(str(p) for p in paths)}")
+    benchmark(records)
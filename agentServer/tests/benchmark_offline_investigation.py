@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+End-to-end investigation benchmark that runs without network access.
+
+Record once (needs OpenAI and the ragmcp server):
+    python tests/benchmark_offline_investigation.py --record --recording recordings/s383-116
+
+Then benchmark the orchestration overhead anywhere (e.g. CI), served from the recording:
+    python tests/benchmark_offline_investigation.py --recording recordings/s383-116 --runs 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+class CountingCallback:
+    """WebSocket callback that only counts events"""
+
+    def __init__(self):
+        self.events = 0
+        self.by_type = {}
+
+    async def __call__(self, event):
+        self.events += 1
+        self.by_type[event["type"]] = self.by_type.get(event["type"], 0) + 1
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--company", default="ExxonMobil")
+    parser.add_argument("--bill", default="s383-116")
+    parser.add_argument("--recording", default=os.path.join("recordings", "default"))
+    parser.add_argument("--record", action="store_true", help="Run against the real services and save the responses")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    # Must be set before the investigation modules create their clients
+    os.environ["INVESTIGATION_RECORD_MODE"] = "record" if args.record else "replay"
+    os.environ["INVESTIGATION_RECORDING_DIR"] = args.recording
+    os.environ.setdefault("INVESTIGATION_JOURNAL", "0")
+
+    from autogen5_websocket import run_full_investigation
+    from util.record_replay import get_active_recording
+
+    timings = []
+    for run in range(1 if args.record else args.runs):
+        callback = CountingCallback()
+        start = time.perf_counter()
+        await run_full_investigation(args.company, args.bill, callback)
+        timings.append(time.perf_counter() - start)
+        print(f"⏱️  Run {run + 1}: {timings[-1]:.2f}s, {callback.events} events {callback.by_type}")
+
+    recording = get_active_recording()
+    print(f"📊 {'Recorded' if args.record else 'Replayed'} {args.company} / {args.bill}: "
+          f"best {min(timings):.2f}s, mean {sum(timings) / len(timings):.2f}s over {len(timings)} run(s)")
+    print(f"📼 Recording stats: {recording.stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test local argument repair with argument shapes agents actually send
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from argument_repair import repair_arguments_locally, get_argument_repair_stats
+
+BILL_DESCRIPTION = (
+    "Takes: An obtained Congress API Index representing a bill in the format of: "
+    "{'congress_index':{ 'congress': 115, 'bill_type': 'hjres', 'bill_number': 44 }}. "
+    "Returns: { 'summary': list of summary dicts, 'debug': list of debug messages }."
+)
+BILL_SCHEMA = {
+    "name": "getBillSummary",
+    "parameters": {
+        "type": "object",
+        "properties": {"congress_index": {"type": "object"}},
+        "required": ["congress_index"],
+    },
+}
+
+# (sent arguments, expected repaired arguments or None if the LLM is needed)
+CASES = [
+    ('{"congress": 117, "bill_type": "H.R.", "bill_number": 2307}',
+     {"congress_index": {"congress": 117, "bill_type": "hr", "bill_number": 2307}}),
+    ('{"congress_index": "hr2307-117"}',
+     {"congress_index": {"congress": 117, "bill_type": "hr", "bill_number": 2307}}),
+    ({"congress_index": {"congress_index": {"congress": 117, "billType": "hr", "number": 2307}}},
+     {"congress_index": {"congress": 117, "bill_type": "hr", "bill_number": 2307}}),
+    ("{'congress_index': {'congress': 117, 'bill_type': 's', 'bill_number': 383}}",
+     {"congress_index": {"congress": 117, "bill_type": "s", "bill_number": 383}}),
+    # Copy of the description example
+    ('{"congress_index": {"congress": 115, "bill_type": "hjres", "bill_number": 44}}', None),
+    # Missing fields / empty arguments
+    ('{"congress_index": {"congress": 117}}', None),
+    ("{}", None),
+]
+
+
+def test_argument_repair():
+    for sent, expected in CASES:
+        repaired = repair_arguments_locally(sent, BILL_SCHEMA, BILL_DESCRIPTION)
+        assert repaired == expected, f"{sent!r}: expected {expected}, got {repaired}"
+        print(f"✅ {sent!r} -> {repaired}")
+
+    stats = get_argument_repair_stats()
+    print(f"📊 Repair stats: {stats}")
+    assert stats['llm_requests_avoided'] > 0
+
+
+def test_llm_repaired_call_not_counted_as_avoided():
+    before = get_argument_repair_stats()
+
+    # The agent's arguments can't be repaired locally, so PlannerAgent asks the LLM ...
+    assert repair_arguments_locally('{"congress_index": {"congress": 117}}', BILL_SCHEMA, BILL_DESCRIPTION) is None
+    # ... and re-checks its well-formed answer without counting it as another call
+    llm_answer = {"congress_index": {"congress": 117, "bill_type": "hr", "bill_number": 2307}}
+    assert repair_arguments_locally(llm_answer, BILL_SCHEMA, BILL_DESCRIPTION, count_stats=False) == llm_answer
+
+    after = get_argument_repair_stats()
+    assert after['calls_checked'] == before['calls_checked'] + 1, f"{before} -> {after}"
+    for counter in ('valid_as_sent', 'repaired_locally', 'llm_requests_avoided'):
+        assert after[counter] == before[counter], f"{counter} changed by the LLM re-check: {before} -> {after}"
+    print(f"✅ LLM-repaired call left the avoided counter at {after['llm_requests_avoided']}")
+
+
+if __name__ == "__main__":
+    test_argument_repair()
+    test_llm_repaired_call_not_counted_as_avoided()
@@ -6,7 +6,11 @@ Handles creation and configuration of external API clients (Congress.gov, GPO, O
 from openai import AsyncOpenAI
 from google import genai
 from .cdg_client import CDGClient, GPOClient
-from .config_utils import _get_key
+from .config_utils import _get_key, _get_key_with_fallback
+from .record_replay import get_active_recording
+
+# Shared client instance (one connection pool for every LLM call in the process)
+_shared_openai_client = None
 
 
 def get_openai_client() -> AsyncOpenAI:
@@ -20,6 +24,31 @@ def get_openai_client() -> AsyncOpenAI:
     return AsyncOpenAI(api_key=openai_key)
 
 
+def get_shared_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide AsyncOpenAI client, creating it on first use.
+    Used by PlannerAgent, the agent selector and the LLM summarizer.
+    
+    Returns:
+        Shared AsyncOpenAI client
+        
+    Raises:
+        ValueError: If no OpenAI API key can be found
+    """
+    global _shared_openai_client
+    if _shared_openai_client is None:
+        # Record/replay (INVESTIGATION_RECORD_MODE) wraps the client; replay needs no key at all
+        recording = get_active_recording()
+        if recording and recording.replaying:
+            _shared_openai_client = recording.wrap_openai_client()
+        else:
+            openai_key = _get_key_with_fallback("OPENAI_API_KEY")
+            _shared_openai_client = AsyncOpenAI(api_key=openai_key)
+            if recording:
+                _shared_openai_client = recording.wrap_openai_client(_shared_openai_client)
+    return _shared_openai_client
+
+
 def get_google_ai_client():
     """
     Create and configure Google AI client with API key from secrets.
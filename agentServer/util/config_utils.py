@@ -45,6 +45,40 @@ def _get_key(key_name: str):
     return cfg["API_KEYS"][key_name]
 
 
+# Other places a secrets.ini may live when SECRETS_INI_FILE is not mounted
+FALLBACK_SECRETS_PATHS = [
+    "/app/secrets.ini",
+    "/app/agentServer/secrets.ini",
+    "secrets.ini",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "secrets.ini"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "secrets.ini"),
+]
+
+
+def _get_key_with_fallback(key_name: str):
+    """
+    Like _get_key, but also searches the fallback secrets.ini locations.
+
+    Raises:
+        ValueError: If the key cannot be found anywhere
+    """
+    try:
+        return _get_key(key_name)
+    except (KeyError, ValueError):
+        pass
+
+    for path in FALLBACK_SECRETS_PATHS:
+        if os.path.exists(path):
+            fallback_cfg = configparser.ConfigParser()
+            fallback_cfg.read(path)
+            try:
+                return fallback_cfg["API_KEYS"][key_name]
+            except KeyError:
+                continue
+
+    raise ValueError(f"Key name {key_name} not found in any secrets.ini")
+
+
 def get_function_description(func_name: str, path: str = None) -> str:
     """
     Get functional descriptions for MCP functions that agents use to choose tools.
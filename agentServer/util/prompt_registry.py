@@ -0,0 +1,104 @@
+"""
+Prompt Registry
+Caches parsed YAML configuration files and reloads them only when they change on disk
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import yaml
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "config")
+
+# Prompt config files in order of preference
+PROMPT_FILES = ("prompts.yaml", "prompt.yaml")
+
+
+class PromptRegistry:
+    """
+    Process-wide cache of YAML config files (prompts, agents, tasks).
+
+    Each file is parsed once and kept in memory. The file's mtime is re-checked at
+    most every `check_interval` seconds, so edits are picked up without a restart
+    while hot paths (one lookup per model result) do no disk I/O.
+    """
+
+    def __init__(self, config_dir: str = CONFIG_DIR, check_interval: float = 2.0):
+        self.config_dir = config_dir
+        self.check_interval = check_interval
+        # path -> (mtime, last_checked, parsed data)
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        # Which of PROMPT_FILES exists, resolved on first use
+        self._prompts_name: Optional[str] = None
+
+    def _resolve(self, name: str) -> str:
+        return name if os.path.isabs(name) else os.path.join(self.config_dir, name)
+
+    def load(self, name: str) -> Dict[str, Any]:
+        """
+        Return the parsed content of a YAML file (absolute path or file name in config/).
+
+        Raises:
+            FileNotFoundError: If the file does not exist and was never loaded
+        """
+        path = self._resolve(name)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and now - cached[1] < self.check_interval:
+                return cached[2]
+
+            try:
+                mtime = os.stat(path).st_mtime
+            except FileNotFoundError:
+                self._cache.pop(path, None)
+                raise
+
+            if cached and cached[0] == mtime:
+                self._cache[path] = (mtime, now, cached[2])
+                return cached[2]
+
+            with open(path, "r") as f:
+                data = yaml.safe_load(f) or {}
+            self._cache[path] = (mtime, now, data)
+            return data
+
+    def get_prompts(self) -> Dict[str, Any]:
+        """Prompt config; prefers config/prompts.yaml if present, falls back to config/prompt.yaml"""
+        if self._prompts_name is not None:
+            try:
+                return self.load(self._prompts_name)
+            except FileNotFoundError:
+                self._prompts_name = None
+        name = next((name for name in PROMPT_FILES if os.path.exists(self._resolve(name))), None)
+        if name is None:
+            return {}
+        self._prompts_name = name
+        return self.load(name)
+
+    def get_prompt(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the `description` text of a prompt entry, or `default` if missing"""
+        entry = self.get_prompts().get(key) or {}
+        return entry.get("description") or default
+
+    def invalidate(self) -> None:
+        """Forget all cached files"""
+        with self._lock:
+            self._cache.clear()
+            self._prompts_name = None
+
+
+# Global registry instance
+_global_registry = None
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Return the process-wide prompt registry"""
+    global _global_registry
+    if _global_registry is None:
+        _global_registry = PromptRegistry()
+    return _global_registry
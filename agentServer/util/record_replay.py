@@ -0,0 +1,246 @@
+"""
+Record/Replay
+Captures everything an investigation fetches over the network (agent model-client
+completions, direct OpenAI calls and MCP tool results) keyed by a hash of the request,
+and serves it back offline so `run_full_investigation` can be benchmarked end to end
+without OpenAI or congress.gov.
+
+Modes (INVESTIGATION_RECORD_MODE):
+    off     - default, nothing is recorded
+    record  - real calls, responses are saved to INVESTIGATION_RECORDING_DIR
+    replay  - no network; responses come from INVESTIGATION_RECORDING_DIR and
+              unrecorded requests raise RecordingMissError
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Optional
+
+from autogen_core import CacheStore
+from autogen_core.models import CreateResult, ModelFamily, ModelInfo
+from autogen_core.tools import ToolResult, ToolSchema
+from autogen_ext.models.cache import CHAT_CACHE_VALUE_TYPE, ChatCompletionCache
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from openai.types.chat import ChatCompletion
+
+from .tracing import TRACE_ARGUMENT
+
+RECORD_MODES = ("off", "record", "replay")
+DEFAULT_RECORDING_DIR = os.path.join("recordings", "default")
+
+# Model info of gpt-4.1-mini, needed by the offline model client so agents still get tools
+REPLAY_MODEL_INFO = ModelInfo(
+    vision=True,
+    function_calling=True,
+    json_output=True,
+    family=ModelFamily.GPT_41,
+    structured_output=True,
+)
+
+
+class RecordingMissError(KeyError):
+    """A request in replay mode that was never recorded"""
+
+
+def request_hash(payload: Any) -> str:
+    """Stable hash of a JSON-like request payload"""
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class _ModelClientStore(CacheStore[CHAT_CACHE_VALUE_TYPE]):
+    """
+    CacheStore for ChatCompletionCache (which computes the request hash). Keeps live
+    results while recording; streamed results are filled in after `set`, so they are
+    only serialized when the recording is saved.
+    """
+
+    def __init__(self, recording: "Recording"):
+        self.recording = recording
+        self.live: Dict[str, CHAT_CACHE_VALUE_TYPE] = {}
+
+    def get(self, key: str, default: Optional[CHAT_CACHE_VALUE_TYPE] = None) -> Optional[CHAT_CACHE_VALUE_TYPE]:
+        if self.recording.recording:
+            return self.live.get(key, default)
+        stored = self.recording.entries["model"].get(key)
+        if stored is None:
+            self.recording.stats["misses"] += 1
+            raise RecordingMissError(f"No recorded model completion for request {key[:12]}")
+        self.recording.stats["hits"] += 1
+        if stored["kind"] == "stream":
+            return [chunk if isinstance(chunk, str) else CreateResult.model_validate(chunk) for chunk in stored["items"]]
+        return CreateResult.model_validate(stored["result"])
+
+    def set(self, key: str, value: CHAT_CACHE_VALUE_TYPE) -> None:
+        if self.recording.recording:
+            self.live[key] = value
+
+    def dump(self) -> Dict[str, dict]:
+        dumped = {}
+        for key, value in self.live.items():
+            if isinstance(value, list):
+                items = [item if isinstance(item, str) else item.model_dump(mode="json") for item in value]
+                dumped[key] = {"kind": "stream", "items": items}
+            else:
+                dumped[key] = {"kind": "result", "result": value.model_dump(mode="json")}
+        return dumped
+
+
+class RecordingOpenAIClient:
+    """Stand-in for AsyncOpenAI exposing `chat.completions.create`, recorded or replayed"""
+
+    def __init__(self, recording: "Recording", client=None):
+        self._recording = recording
+        self._client = client
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs) -> ChatCompletion:
+        key = request_hash(kwargs)
+        stored = self._recording.next_response("openai", key)
+        if stored is not None:
+            return ChatCompletion.model_validate(stored)
+        response = await self._client.chat.completions.create(**kwargs)
+        self._recording.add_response("openai", key, response.model_dump(mode="json"))
+        return response
+
+
+class RecordingWorkbench:
+    """
+    Wraps a leased McpWorkbench so tool listings and results are recorded, or stands in
+    for it entirely when replaying. FilteredWorkbench only needs list_tools, call_tool
+    and server_params from the workbench it wraps.
+    """
+
+    def __init__(self, recording: "Recording", workbench=None, server_params=None):
+        self._recording = recording
+        self._workbench = workbench
+        self.server_params = workbench.server_params if workbench is not None else server_params
+
+    async def list_tools(self) -> List[ToolSchema]:
+        key = request_hash({"list_tools": True})
+        stored = self._recording.next_response("mcp", key)
+        if stored is not None:
+            return stored
+        tools = list(await self._workbench.list_tools())
+        self._recording.add_response("mcp", key, tools)
+        return tools
+
+    async def call_tool(self, name: str, arguments: Mapping[str, Any] | None = None, **kwargs) -> ToolResult:
+        # The trace context differs on every call, so it is not part of the request identity
+        key_arguments = {k: v for k, v in (arguments or {}).items() if k != TRACE_ARGUMENT}
+        key = request_hash({"tool": name, "arguments": key_arguments})
+        stored = self._recording.next_response("mcp", key)
+        if stored is not None:
+            return ToolResult.model_validate(stored)
+        result = await self._workbench.call_tool(name, arguments, **kwargs)
+        self._recording.add_response("mcp", key, result.model_dump(mode="json"))
+        return result
+
+
+class Recording:
+    """
+    A directory of recorded responses (model.json, openai.json, mcp.json), each mapping
+    request hash -> response(s). Identical requests that got different responses are
+    replayed in their recorded order.
+    """
+
+    KINDS = ("model", "openai", "mcp")
+
+    def __init__(self, directory: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Recording mode must be 'record' or 'replay', got '{mode}'")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.entries: Dict[str, Dict[str, Any]] = {kind: {} for kind in self.KINDS}
+        self._cursors: Dict[str, int] = {}
+        self._model_store = _ModelClientStore(self)
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+        # Recording always starts from scratch, so a directory holds exactly one run
+        if self.replaying:
+            for kind in self.KINDS:
+                path = self.directory / f"{kind}.json"
+                if path.exists():
+                    with open(path, "r", encoding="utf-8") as f:
+                        self.entries[kind] = json.load(f)
+                else:
+                    print(f"⚠️  No recorded {kind} responses in {self.directory}")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def next_response(self, kind: str, key: str) -> Any:
+        """Next recorded response for a request; None while recording, RecordingMissError when replaying"""
+        if self.recording:
+            return None
+        responses = self.entries[kind].get(key)
+        if not responses:
+            self.stats["misses"] += 1
+            raise RecordingMissError(f"No recorded {kind} response for request {key[:12]}")
+        cursor = self._cursors.get(f"{kind}:{key}", 0)
+        self._cursors[f"{kind}:{key}"] = cursor + 1
+        self.stats["hits"] += 1
+        # Past the end, keep serving the last response
+        return responses[min(cursor, len(responses) - 1)]
+
+    def rewind(self) -> None:
+        """Replay repeated requests from their first recorded response again (start of a run)"""
+        self._cursors.clear()
+
+    def add_response(self, kind: str, key: str, response: Any) -> None:
+        self.entries[kind].setdefault(key, []).append(response)
+        self.stats["recorded"] += 1
+
+    def wrap_model_client(self, client=None) -> ChatCompletionCache:
+        """Agent model client: records `client`, or replays without any client"""
+        if client is None:
+            client = ReplayChatCompletionClient([], model_info=REPLAY_MODEL_INFO)
+        return ChatCompletionCache(client, self._model_store)
+
+    def wrap_openai_client(self, client=None) -> RecordingOpenAIClient:
+        return RecordingOpenAIClient(self, client)
+
+    def wrap_workbench(self, workbench=None, server_params=None) -> RecordingWorkbench:
+        return RecordingWorkbench(self, workbench, server_params)
+
+    def save(self) -> None:
+        """Write recorded responses to disk (record mode only)"""
+        if not self.recording:
+            return
+        self.entries["model"] = self._model_store.dump()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for kind in self.KINDS:
+            path = self.directory / f"{kind}.json"
+            tmp_path = path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries[kind], f)
+            os.replace(tmp_path, path)
+        print(f"💾 Recording saved: {self.directory} ({len(self.entries['model'])} model completions, {self.stats['recorded']} other responses)")
+
+
+# Global recording instance
+_global_recording = None
+
+
+def get_record_mode() -> str:
+    mode = os.getenv("INVESTIGATION_RECORD_MODE", "off").lower()
+    return mode if mode in RECORD_MODES else "off"
+
+
+def get_active_recording() -> Optional[Recording]:
+    """The process-wide recording, or None when record/replay is off"""
+    global _global_recording
+    mode = get_record_mode()
+    if mode == "off":
+        return None
+    if _global_recording is None or _global_recording.mode != mode:
+        _global_recording = Recording(os.getenv("INVESTIGATION_RECORDING_DIR", DEFAULT_RECORDING_DIR), mode)
+    return _global_recording
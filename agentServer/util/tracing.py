@@ -0,0 +1,229 @@
+"""
+Tracing
+OpenTelemetry span tracing for investigations. Every investigation gets a root span whose
+trace id is propagated through agent turns, speaker selection, argument repair and MCP tool
+calls into the ragmcp server (in the reserved `_trace` tool argument), where tool handlers,
+Congress.gov fetches and BillTextRAG stages continue the same trace.
+
+Enable with TRACING_ENABLED=1. Finished spans are appended as JSON lines to TRACE_FILE
+(default traces/agentserver_spans.jsonl). A per-session summary is printed when an
+investigation ends, and span files of both services can be merged into a report:
+
+    python -m util.tracing traces/agentserver_spans.jsonl ../ragmcp/traces/ragmcp_spans.jsonl
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+# Tool argument carrying the W3C traceparent to the MCP server (stripped there before validation)
+TRACE_ARGUMENT = "_trace"
+DEFAULT_TRACE_FILE = os.path.join("traces", "agentserver_spans.jsonl")
+
+_tracer_provider: Optional[TracerProvider] = None
+_summary_processor: Optional["SessionSummaryProcessor"] = None
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("TRACING_ENABLED", "0").lower() in ("1", "true", "yes")
+
+
+def span_to_record(span: ReadableSpan, service: str) -> Dict[str, Any]:
+    """Compact JSON-serializable form of a finished span"""
+    context = span.get_span_context()
+    return {
+        "trace_id": format(context.trace_id, "032x"),
+        "span_id": format(context.span_id, "016x"),
+        "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+        "name": span.name,
+        "service": service,
+        "start": span.start_time / 1e9,
+        "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonlFileSpanExporter(SpanExporter):
+    """Appends finished spans to a local JSONL file"""
+
+    def __init__(self, path: str, service: str):
+        self.path = path
+        self.service = service
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(span_to_record(span, self.service), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+class SessionSummaryProcessor(SpanProcessor):
+    """Keeps finished spans per trace in memory until the session summary is taken"""
+
+    def __init__(self, service: str, max_traces: int = 50):
+        self.service = service
+        self.max_traces = max_traces
+        self._spans: Dict[int, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: ReadableSpan) -> None:
+        trace_id = span.get_span_context().trace_id
+        with self._lock:
+            if trace_id not in self._spans and len(self._spans) >= self.max_traces:
+                # Forget the oldest unfinished session rather than growing without bound
+                self._spans.pop(next(iter(self._spans)))
+            self._spans.setdefault(trace_id, []).append(span_to_record(span, self.service))
+
+    def pop(self, trace_id: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._spans.pop(trace_id, [])
+
+
+def setup_tracing(service: str = "agentServer") -> bool:
+    """Install the process-wide tracer provider (once). Returns False if tracing is disabled."""
+    global _tracer_provider, _summary_processor
+    if _tracer_provider is not None:
+        return True
+    if not tracing_enabled():
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service}))
+    exporter = JsonlFileSpanExporter(os.getenv("TRACE_FILE", DEFAULT_TRACE_FILE), service)
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    _summary_processor = SessionSummaryProcessor(service)
+    provider.add_span_processor(_summary_processor)
+    trace.set_tracer_provider(provider)
+    _tracer_provider = provider
+    print(f"🔭 Tracing enabled, spans exported to {exporter.path}")
+    return True
+
+
+def get_tracer():
+    return trace.get_tracer("agentServer")
+
+
+def traced(name: str):
+    """Decorator running an async function inside a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with get_tracer().start_as_current_span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def investigation_span(session_id: str, company_name: str, bill: str):
+    """Root span of one investigation session (use with `with`)"""
+    return get_tracer().start_as_current_span(
+        "investigation",
+        kind=trace.SpanKind.SERVER,
+        attributes={"session.id": session_id, "investigation.company": company_name, "investigation.bill": bill},
+    )
+
+
+def current_trace_id() -> Optional[str]:
+    context = trace.get_current_span().get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+
+def with_trace_argument(arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Copy of the tool arguments with the current trace context added (unchanged when not tracing)"""
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    if "traceparent" not in carrier:
+        return dict(arguments or {})
+    return {**(arguments or {}), TRACE_ARGUMENT: carrier["traceparent"]}
+
+
+def summarize_spans(spans: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-span-name count / total / mean / max durations, plus each name's share of the root span"""
+    spans = list(spans)
+    by_name: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        by_name[f"{span['service']}:{span['name']}"].append(span["duration_ms"])
+
+    roots = [span for span in spans if span["parent_id"] is None and span["name"] == "investigation"]
+    total_ms = max((span["duration_ms"] for span in roots), default=0.0)
+
+    stages = []
+    for name, durations in by_name.items():
+        total = sum(durations)
+        stages.append({
+            "name": name,
+            "count": len(durations),
+            "total_ms": round(total, 1),
+            "mean_ms": round(total / len(durations), 1),
+            "max_ms": round(max(durations), 1),
+            "share": round(total / total_ms, 3) if total_ms else None,
+        })
+    stages.sort(key=lambda stage: stage["total_ms"], reverse=True)
+
+    return {
+        "session_id": roots[0]["attributes"].get("session.id") if roots else None,
+        "total_ms": total_ms,
+        "spans": len(spans),
+        "stages": stages,
+    }
+
+
+def format_summary(summary: Dict[str, Any], limit: int = 25) -> str:
+    lines = [f"🔭 Trace summary for session {summary['session_id']}: "
+             f"{summary['total_ms'] / 1000:.1f}s, {summary['spans']} spans"]
+    lines.append(f"   {'stage':<55} {'count':>6} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'share':>6}")
+    for stage in summary["stages"][:limit]:
+        share = f"{stage['share']:.0%}" if stage["share"] is not None else "-"
+        lines.append(f"   {stage['name'][:55]:<55} {stage['count']:>6} {stage['total_ms'] / 1000:>9.2f} "
+                     f"{stage['mean_ms']:>9.1f} {stage['max_ms']:>9.1f} {share:>6}")
+    return "\n".join(lines)
+
+
+def pop_session_summary(trace_id: Optional[str]) -> Optional[str]:
+    """Formatted summary of a finished session's spans in this process, or None when not tracing"""
+    if _summary_processor is None or not trace_id:
+        return None
+    spans = _summary_processor.pop(int(trace_id, 16))
+    return format_summary(summarize_spans(spans)) if spans else None
+
+
+def load_span_files(paths: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Spans from one or more span files, grouped by trace id"""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m util.tracing <span file> [<span file> ...]")
+        sys.exit(1)
+    for trace_id, spans in load_span_files(sys.argv[1:]).items():
+        if any(span["name"] == "investigation" for span in spans):
+            print(f"trace {trace_id}")
+            print(format_summary(summarize_spans(spans)))
+            print()
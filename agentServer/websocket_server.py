@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import os
 from datetime import datetime
 from typing import Dict, Set
 import websockets
@@ -8,6 +9,9 @@ from websockets.server import WebSocketServerProtocol
 
 from serverTest import run_investigation
 from autogen5_websocket import run_full_investigation
+from workbench_pool import get_workbench_pool, close_workbench_pool
+from event_journal import find_journal, list_journals, read_journal_header, replay_journal
+from util.tracing import setup_tracing, investigation_span, current_trace_id, pop_session_summary
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_COMPANY_NAME = "ExxonMobil"
 DEFAULT_BILL_NAME = "hr2307-117"
+DEFAULT_REPLAY_SPEED = float(os.getenv("REPLAY_SPEED", "1.0"))
 
 class WebSocketServer:
     def __init__(self, host="0.0.0.0", port=8766):
@@ -83,6 +88,13 @@ class WebSocketServer:
                 await self.start_full_investigation(websocket, data)
             elif message_type == "stop_investigation":
                 await self.stop_investigation(websocket, data)
+            elif message_type == "replay_investigation":
+                await self.replay_investigation(websocket, data)
+            elif message_type == "list_journals":
+                await self.send_to_client(websocket, {
+                    "type": "journals",
+                    "journals": list_journals()
+                })
             elif message_type == "ping":
                 await self.send_to_client(websocket, {"type": "pong"})
             else:
@@ -126,23 +138,28 @@ class WebSocketServer:
             await self.broadcast_to_all(event)
         
         # Start the investigation task (using full 6-agent investigation)
+        # The task inherits the root span, so every agent turn and tool call joins this trace
+        trace_id = None
         try:
-            task = asyncio.create_task(
-                run_full_investigation(company_name, bill, websocket_callback)
-            )
-            self.active_investigations[session_id] = task
-            
-            # Send confirmation
-            await self.send_to_client(websocket, {
-                "type": "investigation_started",
-                "sessionId": session_id,
-                "company": company_name,
-                "bill": bill,
-                "agents": ["committee_specialist", "bill_specialist", "actions_specialist", "amendment_specialist", "congress_member_specialist", "orchestrator"]
-            })
-            
-            # Wait for investigation to complete
-            await task
+            with investigation_span(session_id, company_name, bill):
+                trace_id = current_trace_id()
+                task = asyncio.create_task(
+                    run_full_investigation(company_name, bill, websocket_callback, session_id=session_id)
+                )
+                self.active_investigations[session_id] = task
+                
+                # Send confirmation
+                await self.send_to_client(websocket, {
+                    "type": "investigation_started",
+                    "sessionId": session_id,
+                    "company": company_name,
+                    "bill": bill,
+                    "traceId": trace_id,
+                    "agents": ["committee_specialist", "bill_specialist", "actions_specialist", "amendment_specialist", "congress_member_specialist", "orchestrator"]
+                })
+                
+                # Wait for investigation to complete
+                await task
             
             # Clean up
             if session_id in self.active_investigations:
@@ -159,6 +176,10 @@ class WebSocketServer:
             # Clean up on error
             if session_id in self.active_investigations:
                 del self.active_investigations[session_id]
+        
+        summary = pop_session_summary(trace_id)
+        if summary:
+            logger.info(summary)
     
     async def start_full_investigation(self, websocket: WebSocketServerProtocol, data: dict):
         """Start a full multi-agent AutoGen investigation"""
@@ -183,23 +204,28 @@ class WebSocketServer:
             await self.broadcast_to_all(event)
         
         # Start the full investigation task
+        # The task inherits the root span, so every agent turn and tool call joins this trace
+        trace_id = None
         try:
-            task = asyncio.create_task(
-                run_full_investigation(company_name, bill, websocket_callback)
-            )
-            self.active_investigations[session_id] = task
-            
-            # Send confirmation
-            await self.send_to_client(websocket, {
-                "type": "full_investigation_started",
-                "sessionId": session_id,
-                "company": company_name,
-                "bill": bill,
-                "agents": ["committee_specialist", "bill_specialist", "actions_specialist", "amendment_specialist", "congress_member_specialist", "orchestrator"]
-            })
-            
-            # Wait for investigation to complete
-            await task
+            with investigation_span(session_id, company_name, bill):
+                trace_id = current_trace_id()
+                task = asyncio.create_task(
+                    run_full_investigation(company_name, bill, websocket_callback, session_id=session_id)
+                )
+                self.active_investigations[session_id] = task
+                
+                # Send confirmation
+                await self.send_to_client(websocket, {
+                    "type": "full_investigation_started",
+                    "sessionId": session_id,
+                    "company": company_name,
+                    "bill": bill,
+                    "traceId": trace_id,
+                    "agents": ["committee_specialist", "bill_specialist", "actions_specialist", "amendment_specialist", "congress_member_specialist", "orchestrator"]
+                })
+                
+                # Wait for investigation to complete
+                await task
             
             # Clean up
             if session_id in self.active_investigations:
@@ -216,7 +242,67 @@ class WebSocketServer:
             # Clean up on error
             if session_id in self.active_investigations:
                 del self.active_investigations[session_id]
+        
+        summary = pop_session_summary(trace_id)
+        if summary:
+            logger.info(summary)
     
+    async def replay_investigation(self, websocket: WebSocketServerProtocol, data: dict):
+        """Stream a recorded session's events to this client without running agents or LLMs"""
+        recorded_session_id = data.get("recordedSessionId")
+        speed = float(data.get("speed", DEFAULT_REPLAY_SPEED))
+        session_id = data.get("sessionId", f"replay_session_{datetime.now().timestamp()}")
+
+        journal_path = find_journal(recorded_session_id) if recorded_session_id else None
+        if not journal_path:
+            await self.send_to_client(websocket, {
+                "type": "error",
+                "message": f"No journal found for session {recorded_session_id}"
+            })
+            return
+
+        if session_id in self.active_investigations:
+            await self.send_to_client(websocket, {
+                "type": "error",
+                "message": f"Investigation {session_id} is already running"
+            })
+            return
+
+        recorded = read_journal_header(journal_path)
+        logger.info(f"Replaying {journal_path} as {session_id} at {speed}x")
+
+        async def send_replayed(event):
+            event["sessionId"] = session_id
+            event["timestamp"] = datetime.now().isoformat()
+            await self.send_to_client(websocket, event)
+
+        task = asyncio.create_task(replay_journal(journal_path, send_replayed, speed))
+        self.active_investigations[session_id] = task
+
+        await self.send_to_client(websocket, {
+            "type": "full_investigation_started",
+            "sessionId": session_id,
+            "company": recorded.get("company", DEFAULT_COMPANY_NAME),
+            "bill": recorded.get("bill", DEFAULT_BILL_NAME),
+            "agents": recorded.get("agents", []),
+            "replay": {"recordedSessionId": recorded_session_id, "speed": speed}
+        })
+
+        try:
+            sent = await task
+            logger.info(f"Replay {session_id} finished: {sent} events")
+        except asyncio.CancelledError:
+            logger.info(f"Replay {session_id} cancelled")
+        except Exception as e:
+            logger.error(f"Error in replay {session_id}: {e}")
+            await self.send_to_client(websocket, {
+                "type": "investigation_error",
+                "sessionId": session_id,
+                "error": str(e)
+            })
+        finally:
+            self.active_investigations.pop(session_id, None)
+
     async def stop_investigation(self, websocket: WebSocketServerProtocol, data: dict):
         """Stop a running investigation"""
         session_id = data.get("sessionId")
@@ -264,6 +350,7 @@ class WebSocketServer:
     async def start_server(self):
         """Start the WebSocket server"""
         logger.info(f"Starting WebSocket server on {self.host}:{self.port}")
+        setup_tracing("agentServer")
         
         server = await websockets.serve(
             self.handle_client,
@@ -272,6 +359,14 @@ class WebSocketServer:
         )
         
         logger.info("WebSocket server started successfully")
+
+        # Warm the MCP session pool so the first investigation doesn't pay the handshake
+        try:
+            pool = await get_workbench_pool()
+            logger.info(f"MCP workbench pool ready: {pool.get_stats()}")
+        except Exception as e:
+            logger.warning(f"MCP workbench pool warm-up failed, sessions will be opened lazily: {e}")
+
         return server
 
 async def main():
@@ -291,7 +386,8 @@ async def main():
         for session_id, task in server_instance.active_investigations.items():
             task.cancel()
             logger.info(f"Cancelled investigation: {session_id}")
-        
+
+        await close_workbench_pool()
         server.close()
         await server.wait_closed()
         logger.info("Server shutdown complete")
@@ -0,0 +1,205 @@
+"""
+Process-wide pool of warm MCP workbench sessions to the ragmcp server.
+
+Opening an McpWorkbench means an SSE handshake plus MCP initialization and
+tool-list negotiation. Instead of paying that on every investigation, the
+server keeps a few sessions open and investigations lease one for their run.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
+
+from autogen_ext.tools.mcp import McpWorkbench, SseServerParams
+
+from FilteredWorkbench import refresh_session_tools
+
+
+def default_server_params() -> SseServerParams:
+    """SSE params for the ragmcp container (same endpoint the investigations always used)."""
+    ragmcp_base_url = os.getenv("RAGMCP_URL", "http://ragmcp:8080")
+    return SseServerParams(
+        url=f"{ragmcp_base_url}/sse",
+        timeout=60,  # Note: parameter name is 'timeout' not 'timeout_seconds'
+    )
+
+
+class _PooledWorkbench:
+    """A pooled McpWorkbench together with its health bookkeeping"""
+
+    def __init__(self, workbench: McpWorkbench):
+        self.workbench = workbench
+        self.last_checked = time.monotonic()
+        self.suspect = False
+
+
+class McpWorkbenchPool:
+    """
+    Keeps `min_size` MCP sessions open and hands them out exclusively to
+    investigations. Grows up to `max_size` under load, health-checks idle
+    sessions before re-use and transparently reconnects broken ones.
+    """
+
+    def __init__(
+        self,
+        server_params=None,
+        min_size: int = 2,
+        max_size: int = 6,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 10.0,
+    ):
+        self.server_params = server_params or default_server_params()
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._all: List[_PooledWorkbench] = []
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+        self.stats = {
+            'leases': 0,
+            'created': 0,
+            'reconnects': 0,
+            'health_checks': 0,
+            'health_check_failures': 0,
+            'waits': 0,
+        }
+
+    async def start(self) -> None:
+        """Open the warm sessions. Failures are tolerated; sessions are created lazily later."""
+        async with self._lock:
+            while len(self._all) < self.min_size:
+                try:
+                    pooled = await self._create()
+                except Exception as e:
+                    print(f"⚠️  Could not warm MCP session: {e}")
+                    break
+                self._idle.put_nowait(pooled)
+
+    async def _create(self) -> _PooledWorkbench:
+        workbench = McpWorkbench(server_params=self.server_params)
+        try:
+            await asyncio.wait_for(workbench.start(), self.health_check_timeout)
+            # Fetching the tool list once completes the MCP negotiation up front
+            # and seeds the per-session tool schema cache
+            tools = await asyncio.wait_for(workbench.list_tools(), self.health_check_timeout)
+        except BaseException:
+            # Don't leak a (half) open SSE session
+            try:
+                await workbench.stop()
+            except Exception:
+                pass
+            raise
+        refresh_session_tools(workbench, tools)
+        pooled = _PooledWorkbench(workbench)
+        self._all.append(pooled)
+        self.stats['created'] += 1
+        return pooled
+
+    async def _is_healthy(self, pooled: _PooledWorkbench) -> bool:
+        self.stats['health_checks'] += 1
+        try:
+            tools = await asyncio.wait_for(pooled.workbench.list_tools(), self.health_check_timeout)
+            if refresh_session_tools(pooled.workbench, tools):
+                print("🔄 MCP server tool list changed, cached tool schemas invalidated")
+            pooled.last_checked = time.monotonic()
+            pooled.suspect = False
+            return True
+        except Exception as e:
+            self.stats['health_check_failures'] += 1
+            print(f"⚠️  MCP session failed health check: {e}")
+            return False
+
+    async def _reconnect(self, pooled: _PooledWorkbench) -> _PooledWorkbench:
+        await self._discard(pooled)
+        self.stats['reconnects'] += 1
+        return await self._create()
+
+    async def _discard(self, pooled: _PooledWorkbench) -> None:
+        if pooled in self._all:
+            self._all.remove(pooled)
+        try:
+            await pooled.workbench.stop()
+        except Exception:
+            pass
+
+    async def _acquire(self) -> _PooledWorkbench:
+        if self._closed:
+            raise RuntimeError("McpWorkbenchPool is closed")
+
+        try:
+            pooled = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pooled = None
+            async with self._lock:
+                if len(self._all) < self.max_size:
+                    pooled = await self._create()
+            if pooled is None:
+                self.stats['waits'] += 1
+                pooled = await self._idle.get()
+
+        stale = time.monotonic() - pooled.last_checked > self.health_check_interval
+        if (pooled.suspect or stale) and not await self._is_healthy(pooled):
+            pooled = await self._reconnect(pooled)
+        return pooled
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[McpWorkbench]:
+        """Lease a live McpWorkbench for the duration of the `async with` block"""
+        pooled = await self._acquire()
+        self.stats['leases'] += 1
+        try:
+            yield pooled.workbench
+        except BaseException:
+            # The session may have been the reason for the failure; re-check it before re-use
+            pooled.suspect = True
+            raise
+        finally:
+            if self._closed:
+                await self._discard(pooled)
+            else:
+                self._idle.put_nowait(pooled)
+
+    async def close(self) -> None:
+        """Stop every pooled session"""
+        self._closed = True
+        for pooled in list(self._all):
+            await self._discard(pooled)
+
+    def get_stats(self) -> dict:
+        return {
+            'size': len(self._all),
+            'idle': self._idle.qsize(),
+            **self.stats,
+        }
+
+
+# Global pool instance
+_global_pool = None
+
+
+async def get_workbench_pool() -> McpWorkbenchPool:
+    """Return the process-wide pool, creating and warming it on first use"""
+    global _global_pool
+    if _global_pool is None:
+        pool = McpWorkbenchPool(
+            min_size=int(os.getenv("RAGMCP_POOL_MIN_SIZE", "2")),
+            max_size=int(os.getenv("RAGMCP_POOL_MAX_SIZE", "6")),
+        )
+        # Publish before warming so concurrent callers share the same pool
+        _global_pool = pool
+        await pool.start()
+    return _global_pool
+
+
+async def close_workbench_pool() -> None:
+    """Close the process-wide pool (on server shutdown)"""
+    global _global_pool
+    if _global_pool is not None:
+        await _global_pool.close()
+        _global_pool = None
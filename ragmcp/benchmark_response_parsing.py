@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark of Congress.gov response parsing, XML and JSON, on recorded responses.
+
+    python benchmark_response_parsing.py --record      # fetch the fixtures once (needs the API key)
+    python benchmark_response_parsing.py --repeat 200
+
+For every fixture in data/fixtures/responses/ the records of its spec (util/parse/specs.py) are
+extracted with:
+
+    findtext   ElementTree tree, one findall plus one findtext per field (what the tools did)
+    etree      ElementTree tree, compiled specs (util/parse/records.py)
+    lxml       lxml tree, compiled specs (only when lxml is installed)
+    stream     iterparse streaming with parse_page, whatever the page size (the server only
+               streams pages of at least XML_STREAM_MIN_BYTES)
+    json       the JSON response of the same request (fixture <name>.json), parsed with
+               orjson when it is installed (json otherwise), compiled specs
+
+and the median time per response is printed, with the peak memory of the XML tree, XML
+streaming and JSON. Every XML mode must return the same records as findtext, otherwise the
+benchmark stops. JSON records that differ are marked "differs": that endpoint must stay on
+XML (see CONGRESS_JSON_ENDPOINTS in util/parse/parse.py) until its spec maps the JSON keys.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add the script directory to Python path (for the rag/util packages)
+sys.path.append(str(Path(__file__).parent))
+
+from util.parse import records, specs
+from util.parse.records import RecordSpec, loads_json, parse_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fixtures", "responses")
+
+# fixture name: (Congress.gov path, spec name); hr3684-117 has long action, cosponsor and amendment lists
+FIXTURES = {
+    "bill_actions": ("bill/117/hr/3684/actions", "BILL_ACTIONS"),
+    "bill_cosponsors": ("bill/117/hr/3684/cosponsors", "BILL_COSPONSORS"),
+    "bill_amendments": ("bill/117/hr/3684/amendments", "BILL_AMENDMENTS"),
+    "bill_committees": ("bill/117/hr/3684/committees", "BILL_COMMITTEE_ACTIONS"),
+    "bill_summaries": ("bill/117/hr/3684/summaries", "BILL_SUMMARIES"),
+    "amendment_actions": ("amendment/117/samdt/2137/actions", "AMENDMENT_ACTIONS"),
+    "amendment_cosponsors": ("amendment/117/samdt/2137/cosponsors", "AMENDMENT_COSPONSORS"),
+    "member": ("member/W000819", "MEMBER"),
+}
+
+
+def record_fixtures(directory: str) -> None:
+    from util.parse.parse import cdg_client
+
+    os.makedirs(directory, exist_ok=True)
+    for name, (path, _) in FIXTURES.items():
+        data, _ = cdg_client.get(endpoint=path, params={"offset": 0, "limit": 250})
+        with open(os.path.join(directory, f"{name}.xml"), "wb") as f:
+            f.write(data)
+        # The client hands JSON back parsed; the fixture is its compact serialization
+        document, _ = cdg_client.get(endpoint=path, params={"offset": 0, "limit": 250, "format": "json"})
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump(document, f, separators=(",", ":"))
+        print(f"📥 {name}: {path} ({len(data) / 1024:.0f} KiB XML)")
+
+
+def findtext_extract(spec: RecordSpec, element):
+    """The spec evaluated the way the tools used to: findall, then one findtext per field"""
+    def record(item):
+        result = {}
+        for key, field in spec.fields.items():
+            if isinstance(field, RecordSpec):
+                value = findtext_extract(field, item)
+                if field.optional and not value:
+                    continue
+            else:
+                if field._attribute:
+                    node = item.find(field._element_path)
+                    text = node.get(field._attribute) if node is not None else None
+                else:
+                    text = item.findtext(field._element_path)
+                if field.optional and text is None:
+                    continue
+                value = field.convert(text) if field.convert is not None else text
+            result[key] = value
+        return result
+
+    items = element.findall(spec.items)
+    if spec.first:
+        return record(items[0]) if items else None
+    return [record(item) for item in items]
+
+
+def _median_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _peak_kib(function) -> float:
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def _with_parser(use_lxml: bool, function, stream_min_bytes: int = records.STREAM_MIN_BYTES):
+    def run():
+        records.USE_LXML = use_lxml
+        records.STREAM_MIN_BYTES = stream_min_bytes
+        return function()
+    return run
+
+
+def benchmark(directory: str, repeat: int) -> None:
+    modes = ["findtext", "etree"] + (["lxml"] if records.lxml_etree is not None else []) + ["stream", "json"]
+    print(f"JSON parser: {'orjson' if records.orjson is not None else 'json'}")
+    print(f"{'fixture':<22}{'KiB':>7}{'records':>9}" + "".join(f"{mode + ' ms':>13}" for mode in modes)
+          + f"{'tree peak KiB':>15}{'stream peak KiB':>17}{'json peak KiB':>15}")
+
+    for name, (_, spec_name) in FIXTURES.items():
+        path = os.path.join(directory, f"{name}.xml")
+        if not os.path.exists(path):
+            print(f"{name:<22}   (not recorded)")
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        spec = getattr(specs, spec_name)
+        json_path = os.path.join(directory, f"{name}.json")
+        json_data = None
+        if os.path.exists(json_path):
+            with open(json_path, "rb") as f:
+                json_data = f.read()
+
+        runs = {
+            "findtext": lambda: findtext_extract(spec, ET.fromstring(data)),
+            "etree": _with_parser(False, lambda: spec.extract(records.parse_xml(data))),
+            "lxml": _with_parser(True, lambda: spec.extract(records.parse_xml(data))),
+            "stream": _with_parser(records.lxml_etree is not None, lambda: parse_page(data, spec)[0], stream_min_bytes=0),
+            "json": lambda: spec.extract(loads_json(json_data)),
+        }
+        expected = runs["findtext"]()
+        row = f"{name:<22}{len(data) / 1024:>7.0f}{len(expected) if isinstance(expected, list) else 1:>9}"
+        for mode in modes:
+            if (mode == "stream" and (spec.first or spec._stream_tags is None)) or (mode == "json" and json_data is None):
+                row += f"{'-':>13}"
+                continue
+            if mode == "json" and runs[mode]() != expected:
+                row += f"{'differs':>13}"
+                continue
+            if runs[mode]() != expected:
+                sys.exit(f"❌ {mode} records of {name} differ from findtext")
+            row += f"{_median_ms(runs[mode], repeat):>13.3f}"
+        row += f"{_peak_kib(runs['etree']):>15.0f}"
+        row += f"{_peak_kib(runs['stream']):>17.0f}" if not spec.first and spec._stream_tags else f"{'-':>17}"
+        row += f"{_peak_kib(runs['json']):>15.0f}" if json_data is not None else f"{'-':>15}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory of the recorded responses")
+    parser.add_argument("--record", action="store_true", help="Fetch the fixtures from Congress.gov first")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per fixture and mode")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.fixtures)
+    if not os.path.isdir(args.fixtures):
+        sys.exit(f"No fixtures in {args.fixtures}, record them with --record")
+    benchmark(args.fixtures, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
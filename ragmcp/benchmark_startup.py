@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the MCP server's startup: how long `import main` (tool registration, schemas,
+tracing setup) takes in fresh interpreters, with a `python -X importtime` breakdown.
+
+    python benchmark_startup.py
+    python benchmark_startup.py --repeat 10 --top 25 --max-seconds 0.8
+
+Prints the median import time, the modules that cost the most in an extra -X importtime run
+(self time summed per top-level package, and the slowest imports including their
+dependencies; importtime itself slows imports down, so these add up to more) and fails (exit code 1) when
+the median is above --max-seconds or one of the --lazy modules was imported at startup.
+Those load on first use (the RAG stack with the first getRelevantBillSections call, bs4 with
+the first HTML bill text), so they must not show up here.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules only some tools need, imported by them on first use
+LAZY_MODULES = ["rag.BillTextRAG", "langchain_core", "langchain_community", "langchain_openai", "chromadb", "bs4", "tiktoken"]
+
+# import time: self [us] | cumulative | imported package
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+_MARKER = "__startup_benchmark__ "
+
+_CHILD = f"""
+import sys, time
+t = time.perf_counter()
+import {{module}}
+seconds = time.perf_counter() - t
+print({_MARKER!r} + __import__("json").dumps({{{{"seconds": seconds, "modules": sorted(sys.modules)}}}}))
+"""
+
+
+def run_once(module: str, importtime: bool = False) -> tuple:
+    """(seconds, imported module names, [(self us, cumulative us, depth, name)] with importtime) of one import"""
+    result = subprocess.run(
+        [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", _CHILD.format(module=module)],
+        cwd=SCRIPT_DIR, capture_output=True, text=True,
+    )
+    report = next((line[len(_MARKER):] for line in result.stdout.splitlines() if line.startswith(_MARKER)), None)
+    if result.returncode != 0 or report is None:
+        sys.exit(f"import {module} failed:\n{result.stderr[-3000:]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    report = json.loads(report)
+    return report["seconds"], set(report["modules"]), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument("--max-seconds", type=float, default=1.0, help="Fail when the median import time is above this")
+    parser.add_argument("--lazy", nargs="*", default=LAZY_MODULES, help="Modules that must not be imported at startup")
+    args = parser.parse_args()
+
+    # Also compiles the .pyc files before the timed runs; -X importtime itself slows imports down
+    _, modules, imports = run_once(args.module, importtime=True)
+    runs = [run_once(args.module)[0] for _ in range(args.repeat)]
+    median = statistics.median(runs)
+
+    by_package = defaultdict(int)
+    for self_us, _, _, name in imports:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import {args.module}: median {median * 1000:.0f} ms over {args.repeat} runs "
+          f"({', '.join(f'{seconds * 1000:.0f}' for seconds in runs)} ms)\n")
+    print(f"{'package (-X importtime)':<40}{'self ms':>10}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<40}{self_us / 1000:>10.1f}")
+    print(f"\n{'import (with its dependencies)':<60}{'cumulative ms':>14}")
+    for _, cumulative_us, depth, name in sorted(imports, key=lambda entry: -entry[1])[:args.top]:
+        print(f"{'  ' * depth + name:<60}{cumulative_us / 1000:>14.1f}")
+
+    failures = []
+    eager = [name for name in args.lazy if name in modules]
+    if eager:
+        failures.append(f"imported at startup instead of on first use: {eager}")
+    if median > args.max_seconds:
+        failures.append(f"median import time {median:.2f} s is above {args.max_seconds:.2f} s")
+    for failure in failures:
+        print(f"\n❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"\n✅ ready in {median * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
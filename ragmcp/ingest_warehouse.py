@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Incremental ingest of Congress.gov bill metadata into the local warehouse (util/warehouse.py).
+
+    python ingest_warehouse.py --congress 117 118 119
+    python ingest_warehouse.py --congress 119 --max-bills 200 --workers 8
+
+For each congress the bill list is read newest `updateDate` first, starting from the
+watermark of the previous run, and only bills whose update date changed are fetched again
+(sponsors, cosponsors, actions, amendments and their sponsors, committees and their
+activities, through the same tool functions the MCP server serves). Sponsors and cosponsors not yet in the members
+table are fetched afterwards. The watermark only advances when every changed bill was
+stored, so an interrupted or failed run is picked up by the next one.
+"""
+
+import argparse
+import inspect
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional
+
+# Add the script directory to Python path (for the rag/util packages)
+sys.path.append(str(Path(__file__).parent))
+
+from main import TOOL_FUNCTIONS
+from util.parse.parse import cdg_client
+from util.warehouse import BILL_DETAIL_TOOLS, get_warehouse
+
+PAGE_LIMIT = 250
+
+
+def _tool(name: str):
+    # Without the warehouse-first, metrics and budget decorators: ingest must see Congress.gov
+    return inspect.unwrap(TOOL_FUNCTIONS[name])
+
+
+def _list_bill(item: ET.Element) -> dict:
+    congress, bill_type, number = int(item.findtext("congress")), item.findtext("type").lower(), int(item.findtext("number"))
+    return {
+        "bill_key": f"{bill_type}{number}-{congress}",
+        "congress": congress,
+        "bill_type": bill_type,
+        "bill_number": number,
+        "title": item.findtext("title"),
+        "origin_chamber": item.findtext("originChamber"),
+        "latest_action_date": item.findtext("latestAction/actionDate"),
+        "latest_action_text": item.findtext("latestAction/text"),
+        # Includes text-only updates, which updateDate misses
+        "update_date": item.findtext("updateDateIncludingText") or item.findtext("updateDate"),
+    }
+
+
+def _api_datetime(value: str) -> str:
+    """Congress.gov's fromDateTime format (YYYY-MM-DDT00:00:00Z) of an update date"""
+    value = value.rstrip("Z")
+    return (value if "T" in value else f"{value}T00:00:00")[:19] + "Z"
+
+
+def changed_bills(congress: int, watermark: Optional[str], max_bills: Optional[int] = None) -> List[dict]:
+    """Bills of a congress updated after `watermark`, newest first"""
+    warehouse = get_warehouse()
+    changed, offset = [], 0
+    while True:
+        params = {"sort": "updateDate desc", "offset": offset, "limit": PAGE_LIMIT}
+        if watermark:
+            params["fromDateTime"] = _api_datetime(watermark)
+        data, _ = cdg_client.get(endpoint=f"bill/{congress}", params=params)
+        items = ET.fromstring(data).findall(".//bills/bill")
+        bills = [_list_bill(item) for item in items]
+        stored = warehouse.bill_update_dates([bill["bill_key"] for bill in bills]) if bills else {}
+        changed.extend(bill for bill in bills if stored.get(bill["bill_key"]) != bill["update_date"])
+        print(f"📄 bill/{congress} offset {offset}: {len(bills)} bills, {len(changed)} changed so far")
+        if len(items) < PAGE_LIMIT or (max_bills and len(changed) >= max_bills):
+            break
+        offset += PAGE_LIMIT
+    return changed[:max_bills] if max_bills else changed
+
+
+def ingest_bill(bill: dict, amendment_sponsors: bool = True) -> None:
+    congress_index = {"congress": bill["congress"], "bill_type": bill["bill_type"], "bill_number": bill["bill_number"]}
+    details = {name: _tool(name)(congress_index) for name in BILL_DETAIL_TOOLS}
+    if amendment_sponsors:
+        # One request per amendment; feeds the amendment_sponsor_bills view
+        get_sponsors = _tool("getAmendmentSponsors")
+        details["amendment_sponsors"] = {
+            (amendment["type"].lower(), amendment["number"]): get_sponsors({
+                "congress": amendment["congress"], "amendment_type": amendment["type"].lower(), "amdt_number": amendment["number"],
+            })
+            for amendment in details["getBillAmendments"]["amendments"]
+        }
+    get_warehouse().store_bill(bill, details)
+
+
+def ingest_members(workers: int) -> int:
+    warehouse = get_warehouse()
+    missing = warehouse.missing_members()
+    get_member = _tool("getCongressMember")
+
+    def _ingest(bioguide_id: str):
+        warehouse.store_member(bioguide_id, get_member(bioguide_id))
+
+    stored = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_ingest, bioguide_id): bioguide_id for bioguide_id in missing}
+        for future in as_completed(futures):
+            try:
+                future.result()
+                stored += 1
+            except Exception as e:
+                print(f"⚠️  Member {futures[future]}: {e}")
+    return stored
+
+
+def ingest_congress(congress: int, workers: int = 4, max_bills: Optional[int] = None, full: bool = False,
+                    amendment_sponsors: bool = True) -> dict:
+    warehouse = get_warehouse()
+    source = f"bill/{congress}"
+    watermark = None if full else warehouse.get_watermark(source)
+    bills = changed_bills(congress, watermark, max_bills)
+    print(f"🏛️  Congress {congress}: {len(bills)} bills to ingest (watermark {watermark})")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(ingest_bill, bill, amendment_sponsors): bill for bill in bills}
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                future.result()
+            except Exception as e:
+                failed += 1
+                print(f"⚠️  {futures[future]['bill_key']}: {e}")
+            if i % 50 == 0:
+                print(f"   {i}/{len(bills)} bills")
+
+    # A capped run only covers the newest bills, so it must not move the watermark past the rest
+    complete = not failed and not (max_bills and len(bills) >= max_bills)
+    if bills and complete:
+        warehouse.set_watermark(source, max(bill["update_date"] for bill in bills))
+    return {"congress": congress, "bills": len(bills) - failed, "failed": failed, "watermark_advanced": bool(bills and complete)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--congress", type=int, nargs="+", required=True)
+    parser.add_argument("--workers", type=int, default=4, help="Bills fetched concurrently")
+    parser.add_argument("--max-bills", type=int, default=None, help="At most this many changed bills per congress")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and compare every bill")
+    parser.add_argument("--skip-members", action="store_true")
+    parser.add_argument("--skip-amendment-sponsors", action="store_true",
+                        help="Don't fetch amendment sponsors (one request per amendment)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    for congress in args.congress:
+        print(f"✅ {ingest_congress(congress, args.workers, args.max_bills, args.full, not args.skip_amendment_sponsors)}")
+    if not args.skip_members:
+        print(f"👤 Stored {ingest_members(args.workers)} new members")
+    print(f"📊 Ingest finished in {time.perf_counter() - start:.1f}s ({get_warehouse().path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,33 @@
-import os, re, yaml, requests
-import xml.etree.ElementTree as ET
+import os, re, time, yaml, requests
 import sys
+import sqlite3
+import functools
+import inspect
 
 from util.fetch.descriptions import _get_description_for_function
+from util.fetch.schemas import build_tool_schemas, call_tool_with_arguments
+from util.tracing import setup_tracing, install_tool_tracing, tool_span, get_tracer
+from util.metrics import tool_metrics, record_upstream_call, get_metrics_registry, METRICS_CONTENT_TYPE
+from util.budget import token_budget, fetch_more, serialize_response
+from util.prefetch import get_bill_prefetcher
+from util.warehouse import warehouse_first, get_warehouse, QUERY_VIEWS, MAX_QUERY_ROWS
+from util.member_cache import get_member_cache, BIOGUIDE_PATTERN, MAX_BATCH_SIZE
+from util.state_members import get_state_member_index, STATE_CODES
+from util.singleflight import singleflight, install_tool_threads, run_in_tool_thread
 from mcp.server.fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from util.parse.parse import _call_and_parse, _parse_congress_index_from_args
+from util.parse.parse import _call_and_parse, _call_api, _parse_congress_index_from_args, _normalize_congress_index, cdg_client
+from util.parse.records import parse_page, parse_xml
+from util.parse import specs
 from util.parse.crep import _parse_committee_report_text_links
-from util.parse.committee import _get_committee_code
+from util.parse.committee import _get_committee_code, _load_committee_roster
 from util.parse.amendment import _searchAmendmentInCR
 from util.parse.text_parse import _extract_htm_pdf_from_xml
 from util.parse.votes import _parse_roll_call_number_house
+from util.parse.member import _parse_member_profile
 from util._main import extractBillText, getBillSummary
-from rag.BillTextRAG import BillTextRAG
 
 local_path = os.path.dirname(os.path.abspath(__file__))
 
@@ -23,7 +38,14 @@ class MCPServerWrapper:
     def __init__(self):
         pass
 
+    # Prometheus scrape endpoint, served next to the SSE transport
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(get_metrics_registry().render(), media_type=METRICS_CONTENT_TYPE)
+
     @mcp.tool(description=_get_description_for_function("convertLVtoCongress"))
+    @tool_metrics
+    @token_budget()
     def convertLVtoCongress(lobby_view_bill_id: str) -> dict:
         debug = []
         if not lobby_view_bill_id:
@@ -46,30 +68,24 @@ class MCPServerWrapper:
         }
 
     @mcp.tool(description=_get_description_for_function("getBillSponsors"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("sponsors")
     def getBillSponsors(congress_index: dict) -> dict:
         debug = []
         if not congress_index:
             debug.append("Empty argument passed to getBillSponsors. Provide a congress_index like { 'congress': 115, 'bill_type': 'hjres', 'bill_number': 44 }.")
             return {"sponsors": [], "debug": debug}
         root = _call_and_parse(congress_index, "bill/{congress}/{bill_type}/{bill_number}")
-        sponsors = []
-        for item in root.findall(".//sponsors/item"):
-            sponsors.append({
-                "bioguide_id": item.findtext("bioguideId"),
-                "full_name": item.findtext("fullName"),
-                "first_name": item.findtext("firstName"),
-                "last_name": item.findtext("lastName"),
-                "party": item.findtext("party"),
-                "state": item.findtext("state"),
-                "url": item.findtext("url"),
-                "middle_name": item.findtext("middleName"),
-                "district": item.findtext("district"),
-                "is_by_request": item.findtext("isByRequest") == "Y",
-            })
+        sponsors = specs.BILL_SPONSORS.extract(root)
         debug.append(f"Found {len(sponsors)} sponsors for bill {congress_index}")
         return {"sponsors": sponsors, "debug": debug}
     
     @mcp.tool(description=_get_description_for_function("getBillSummary"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def getBillSummary(congress_index: dict) -> dict:
         debug = []
         parsed_index = _parse_congress_index_from_args(congress_index)
@@ -80,27 +96,15 @@ class MCPServerWrapper:
         endpoint = "bill/{congress}/{bill_type}/{bill_number}/summaries"
         root = _call_and_parse(parsed_index, endpoint)
 
-        summaries = []
-        for summary_elem in root.findall('.//summaries/summary'):
-            version_code = summary_elem.findtext('versionCode')
-            action_date = summary_elem.findtext('actionDate')
-            action_desc = summary_elem.findtext('actionDesc')
-            update_date = summary_elem.findtext('updateDate')
-            # The summary text is inside <cdata><text>
-            text_elem = summary_elem.find('.//cdata/text')
-            summary_text = text_elem.text if text_elem is not None else None
-
-            summaries.append({
-                "versionCode": version_code,
-                "actionDate": action_date,
-                "actionDesc": action_desc,
-                "updateDate": update_date,
-                "summary": summary_text
-            })
+        summaries = specs.BILL_SUMMARIES.extract(root)
         debug.append(f"Extracted {len(summaries)} summaries for bill {parsed_index}")
         return {"summary": summaries, "debug": debug}
 
     @mcp.tool(description=_get_description_for_function("getBillCommittees"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("committees")
     def getBillCommittees(congress_index: dict) -> dict:
         debug = []
         parsed_index = _parse_congress_index_from_args(congress_index)
@@ -108,58 +112,34 @@ class MCPServerWrapper:
             debug.append(f"Could not parse congress_index from input: {congress_index}")
             return {"committees": [], "debug": debug}
         root = _call_and_parse(parsed_index, "bill/{congress}/{bill_type}/{bill_number}/committees")
-        committees = []
-        for committee in root.findall(".//committees/item"):
-            try:
-                c = {
-                    "system_code": committee.findtext("systemCode"),
-                    "name": committee.findtext("name"),
-                    "chamber": committee.findtext("chamber"),
-                    "type": committee.findtext("type"),
-                    "subcommittees": [],
-                }
-                # Add subcommittees if any
-                for sub in committee.findall("./subcommittees/item"):
-                    sub_obj = {
-                        "system_code": sub.findtext("systemCode"),
-                        "name": sub.findtext("name")
-                    }
-                    c["subcommittees"].append(sub_obj)
-                committees.append(c)
-                debug.append(f"Parsed committee: {c['name']} with {len(c['subcommittees'])} subcommittees")
-            except Exception as e:
-                debug.append(f"Failed to parse committee: {e}")
+        committees = specs.BILL_COMMITTEES.extract(root)
+        for c in committees:
+            debug.append(f"Parsed committee: {c['name']} with {len(c['subcommittees'])} subcommittees")
         return {
             "committees": committees,
             "debug": debug
         }
 
     @mcp.tool(description=_get_description_for_function("getBillCosponsors"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("cosponsors")
     def getBillCosponsors(congress_index: dict) -> dict:
         debug = []
         if not congress_index:
             debug.append("Empty argument passed to getBillCosponsors. Provide a congress_index like { 'congress': 115, 'bill_type': 'hjres', 'bill_number': 44 }.")
             return {"cosponsors": [], "debug": debug}
         root = _call_and_parse(congress_index, "bill/{congress}/{bill_type}/{bill_number}/cosponsors")
-        cosponsors = [
-            {
-                "bioguide_id": item.findtext("bioguideId"),
-                "full_name": item.findtext("fullName"),
-                "first_name": item.findtext("firstName"),
-                "last_name": item.findtext("lastName"),
-                "party": item.findtext("party"),
-                "state": item.findtext("state"),
-                "url": item.findtext("url"),
-                "district": item.findtext("district"),
-                "sponsorship_date": item.findtext("sponsorshipDate"),
-                "is_original_cosponsor": item.findtext("isOriginalCosponsor") == "True",
-            }
-            for item in root.findall(".//cosponsors/item")
-        ]
+        cosponsors = specs.BILL_COSPONSORS.extract(root)
         debug.append(f"Found {len(cosponsors)} cosponsors for bill {congress_index}")
         return {"cosponsors": cosponsors, "debug": debug}
 
     @mcp.tool(description=_get_description_for_function("get_committee_actions"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("committee_actions")
     def get_committee_actions(congress_index: dict) -> dict:
         debug = []
         parsed_index = _parse_congress_index_from_args(congress_index)
@@ -167,46 +147,19 @@ class MCPServerWrapper:
             debug.append(f"Could not parse congress_index from input: {congress_index}")
             return {"committees": [], "debug": debug}
         root = _call_and_parse(parsed_index, "bill/{congress}/{bill_type}/{bill_number}/committees")
-        committees = []
-        for committee in root.findall(".//committees/item"):
-            try:
-                c = {
-                    "system_code": committee.findtext("systemCode"),
-                    "name": committee.findtext("name"),
-                    "chamber": committee.findtext("chamber"),
-                    "type": committee.findtext("type"),
-                    "actions": [],
-                }
-                # Add committee-level activities
-                for act in committee.findall("./activities/item"):
-                    c["actions"].append({
-                        "name": act.findtext("name"),
-                        "date": act.findtext("date"),
-                    })
-                # Add subcommittees if any
-                c["subcommittees"] = []
-                for sub in committee.findall("./subcommittees/item"):
-                    sub_obj = {
-                        "system_code": sub.findtext("systemCode"),
-                        "name": sub.findtext("name"),
-                        "actions": []
-                    }
-                    for act in sub.findall("./activities/item"):
-                        sub_obj["actions"].append({
-                            "name": act.findtext("name"),
-                            "date": act.findtext("date"),
-                        })
-                    c["subcommittees"].append(sub_obj)
-                committees.append(c)
-                debug.append(f"Parsed committee actions: {c['name']} with {len(c['actions'])} actions")
-            except Exception as e:
-                debug.append(f"Failed to parse committee actions: {e}")
+        committees = specs.BILL_COMMITTEE_ACTIONS.extract(root)
+        for c in committees:
+            debug.append(f"Parsed committee actions: {c['name']} with {len(c['actions'])} actions")
         return {
             "committees": committees,
             "debug": debug
         }
 
     @mcp.tool(description=_get_description_for_function("extractBillActions"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("actions")
     def extractBillActions(congress_index: dict) -> dict:
         debug = []
         parsed_index = _parse_congress_index_from_args(congress_index)
@@ -215,18 +168,13 @@ class MCPServerWrapper:
             return {"actions": [], "debug": debug}
         
         root = _call_and_parse(parsed_index, "bill/{congress}/{bill_type}/{bill_number}/actions")
-        actions = [
-            {
-                "date": item.findtext("actionDate"),
-                "text": item.findtext("text"),
-                "type": item.findtext("type"),
-            }
-            for item in root.findall(".//actions/item")
-        ]
+        actions = specs.BILL_ACTIONS.extract(root)
         debug.append(f"Extracted {len(actions)} actions for bill {parsed_index}")
         return {"actions": actions, "debug": debug}
 
     @mcp.tool(description=_get_description_for_function("get_committee_members"))
+    @tool_metrics
+    @token_budget()
     def get_committee_members(committee_name: str, congress: int) -> dict:
         """
         Retrieves committee members for a specific committee and congress.
@@ -252,8 +200,7 @@ class MCPServerWrapper:
         committee_code = committee_code.lower()
         debug_messages.append(f"committee_code obtained: {committee_code}")
 
-        with open(committee_data_path, 'r') as f:
-            data = yaml.safe_load(f)
+        data = _load_committee_roster(congress)
 
         try:
             committee_id = f"{committee_code}_{congress}"
@@ -279,51 +226,28 @@ class MCPServerWrapper:
         return {"members": result, "debug": debug_messages}
 
     @mcp.tool(description=_get_description_for_function("getCongressMember"))
+    @tool_metrics
+    @token_budget()
+    @singleflight()
+    @warehouse_first("member")
     def getCongressMember(bioguideId: str) -> dict:
 
         endpoint = "member/{bioguideId}"
         root = _call_and_parse({"bioguideId": bioguideId}, endpoint)
         
         debug = []
-        
-        try:
-            first = root.find(".//firstName").text
-            last = root.find(".//lastName").text
-            middle = root.findtext(".//directOrderName")
-            full_name = middle if middle else f"{first} {last}"
-            debug.append(f"Parsed full name: {full_name}")
-        except Exception as e:
-            full_name = None
-            debug.append(f"Failed to parse name: {e}")
+        # Same profile as getCongressMembersBatch: current party, state code of the latest term
+        member = _parse_member_profile(root)
+
+        full_name = member["fullName"]
+        state = member["state"]
+        state_code = member["stateCode"]
+        party = member["party"]
+        congresses = member["congressesServed"]
+        for label, value in (("full name", full_name), ("state", state), ("stateCode", state_code), ("party", party)):
+            debug.append(f"Parsed {label}: {value}" if value else f"Failed to parse {label}")
+        debug.append(f"Parsed congress sessions: {congresses}")
 
-        try:
-            state = root.findtext(".//state")
-            debug.append(f"Parsed state: {state}")
-        except Exception as e:
-            state = None
-            debug.append(f"Failed to parse state: {e}")
-        
-        try:
-            state_code = root.find(".//terms/item/stateCode").text
-            debug.append(f"Parsed stateCode: {state_code}")
-        except Exception as e:
-            state_code = None
-            debug.append(f"Failed to parse stateCode: {e}")
-        try:
-            party = root.find(".//partyHistory/item/partyName").text
-            debug.append(f"Parsed party: {party}")
-        except Exception as e:
-            party = None
-            debug.append(f"Failed to parse party: {e}")
-
-        try:
-            congress_items = root.findall(".//terms/item/congress")
-            congresses = sorted({int(c.text) for c in congress_items})
-            debug.append(f"Parsed congress sessions: {congresses}")
-        except Exception as e:
-            congresses = []
-            debug.append(f"Failed to parse congress sessions: {e}")
-        
         return {
             "fullName": full_name,
             "state": state,
@@ -333,41 +257,52 @@ class MCPServerWrapper:
             "debug": debug
         }
 
-    @mcp.tool(description=_get_description_for_function("getCongressMembersByState"))
-    def getCongressMembersByState(stateCode: str) -> dict:
+    @mcp.tool(description=_get_description_for_function("getCongressMembersBatch"))
+    @tool_metrics
+    @token_budget()
+    @singleflight()
+    def getCongressMembersBatch(bioguideIds: list, names_only: bool = False, congress: int = 0) -> dict:
         debug = []
+        requested = [str(b).strip().upper() for b in bioguideIds or []]
+        invalid = [b for b in requested if not BIOGUIDE_PATTERN.match(b)]
+        if invalid:
+            debug.append(f"Skipped invalid bioguide ids (expected e.g. 'L000174'): {invalid}")
+        ids = [b for b in requested if BIOGUIDE_PATTERN.match(b)]
+        if len(ids) > MAX_BATCH_SIZE:
+            debug.append(f"Only the first {MAX_BATCH_SIZE} ids were looked up, call again for the rest")
+            ids = ids[:MAX_BATCH_SIZE]
+
+        cache = get_member_cache(_fetch_member_profile)
+        # Copies, the cached profiles are shared
+        members = [dict(member) for member in cache.get_many(ids, names_only=names_only).values()]
+        if congress:
+            for member in members:
+                member["committees"] = cache.committees(member["bioguideId"], congress)
+        failed = [m["bioguideId"] for m in members if "error" in m]
+        debug.append(f"Looked up {len(members)} members" + (f", {len(failed)} failed: {failed}" if failed else ""))
+        return {"members": members, "debug": debug}
 
-        stateCodes = [
-            'AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA','KS','KY','LA','ME','MD',
-            'MA','MI','MN','MS','MO','MT','NE','NV','NH','NJ','NM','NY','NC','ND','OH','OK','OR','PA','RI','SC',
-            'SD','TN','TX','UT','VT','VA','WA','WV','WI','WY','DC'
-        ]
+    @mcp.tool(description=_get_description_for_function("getCongressMembersByState"))
+    @tool_metrics
+    @token_budget()
+    @singleflight()
+    def getCongressMembersByState(stateCode: str, congress: int = 0, current_only: bool = False) -> dict:
+        debug = []
 
-        if stateCode not in stateCodes:
+        stateCode = stateCode.strip().upper()
+        if stateCode not in STATE_CODES:
             debug.append(f"{stateCode} is not a valid U.S. State Code")
             return {"members": None, "debug": debug}
 
-        endpoint = f"member/{stateCode}"
-        root = _call_and_parse({"stateCode": stateCode}, endpoint)
-        debug.append(f"Called endpoint: {endpoint}")
-
-        members = []
-        for m in root.findall(".//members/member"):
-            try:
-                member_data = {
-                    "bioguideId": m.findtext("bioguideId"),
-                    "name": m.findtext("name"),
-                    "state": m.findtext("state"),
-                    "party": m.findtext("partyName"),
-                    "district": m.findtext("district"),
-                    "chambers": list({term.findtext("chamber") for term in m.findall(".//terms/item/item")}),
-                    "url": m.findtext("url"),
-                    "imageUrl": m.findtext(".//depiction/imageUrl"),
-                }
-                members.append(member_data)
-                debug.append(f"Parsed member: {member_data['name']} ({member_data['bioguideId']})")
-            except Exception as e:
-                debug.append(f"Failed to parse member: {e}")
+        index = get_state_member_index(_fetch_state_member_page)
+        members = index.members(stateCode, congress or None, current_only)
+        fetched_at = index.get(stateCode)["fetched_at"]
+        debug.append(
+            f"{len(members)} members of {stateCode}"
+            + (f" serving in congress {congress}" if congress else "")
+            + (" (current only)" if current_only else "")
+            + f", from the state index of {time.strftime('%Y-%m-%d %H:%M', time.localtime(fetched_at))}"
+        )
 
         return {
             "members": members,
@@ -375,6 +310,9 @@ class MCPServerWrapper:
         }
 
     @mcp.tool(description=_get_description_for_function("get_committee_meeting"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def get_committee_meeting(congress_index: dict) -> dict:
         """
         congress_index: {"congress": 115, "chamber": "house"/"senate", "eventid": "117-456"}
@@ -391,50 +329,14 @@ class MCPServerWrapper:
         parsed_index["eventid"] = ''.join(parsed_index["eventid"].split("-"))
         root = _call_and_parse(parsed_index, "committee-meeting/{congress}/{chamber}/{eventid}")
 
-        # title
-        title = root.findtext(".//committeeMeeting/title")
-
-        # pick first committee name
-        committee_elem = root.find(".//committeeMeeting/committees/item")
-        committee_name = committee_elem.findtext("name") if committee_elem is not None else None
-
-        # meeting documents
-        documents = []
-        for doc in root.findall(".//committeeMeeting/meetingDocuments/item"):
-            documents.append({
-                "name":        doc.findtext("name"),
-                "documentType": doc.findtext("documentType"),
-                "format":      doc.findtext("format"),
-                "url":         doc.findtext("url"),
-            })
-
-        # witness documents
-        witness_documents = []
-        for wdoc in root.findall(".//committeeMeeting/witnessDocuments/item"):
-            witness_documents.append({
-                "documentType": wdoc.findtext("documentType"),
-                "format":      wdoc.findtext("format"),
-                "url":         wdoc.findtext("url"),
-            })
-
-        # witnesses
-        witnesses = []
-        for w in root.findall(".//committeeMeeting/witnesses/item"):
-            witnesses.append({
-                "name":         w.findtext("name"),
-                "position":     w.findtext("position"),
-                "organization": w.findtext("organization"),
-            })
-
-        return {
-            "title":            title,
-            "committee":        committee_name,
-            "documents":        documents,
-            "witnessDocuments": witness_documents,
-            "witnesses":        witnesses,
-        }
+        # title, first committee name, meeting documents, witness documents and witnesses
+        meeting = specs.COMMITTEE_MEETING.extract(root)
+        return meeting or {"title": None, "committee": None, "documents": [], "witnessDocuments": [], "witnesses": []}
 
     @mcp.tool(description=_get_description_for_function("get_committee_report"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def get_committee_report(congress_index: dict) -> dict:
         
         parsed_index = _parse_congress_index_from_args(congress_index)
@@ -450,46 +352,24 @@ class MCPServerWrapper:
         base_endpoint = f"committee-report/{congress}/{report_type}/{report_number}"
         root = _call_and_parse(parsed_index, base_endpoint)
 
-        report_elem = root.find('.//committeeReport')
-        if report_elem is None:
+        result = specs.COMMITTEE_REPORT.extract(root)
+        if result is None:
             return {}
-        
-        result = {
-            'citation': report_elem.findtext('citation'),
-            'title': report_elem.findtext('title'),
-            'congress': int(report_elem.findtext('congress')) if report_elem.findtext('congress') else None,
-            'chamber': report_elem.findtext('chamber'),
-            'sessionNumber': report_elem.findtext('sessionNumber'),
-            'reportType': report_elem.findtext('reportType'),
-            'isConferenceReport': report_elem.findtext('isConferenceReport') == 'True',
-            'part': report_elem.findtext('part'),
-            'updateDate': report_elem.findtext('updateDate'),
-            'issueDate': report_elem.findtext('issueDate'),
-        }
-
-        result['associatedBills'] = [
-            {
-                'congress': int(b.findtext('congress')) if b.findtext('congress') else None,
-                'type': b.findtext('type'),
-                'number': b.findtext('number'),
-                'url': b.findtext('url')
-            }
-            for b in report_elem.findall('.//associatedBill/item')
-        ]
 
         # ---- Fetch TEXT endpoint ----
         text_root = _call_and_parse(parsed_index, base_endpoint + "/text")
 
-        # Flatten all <formats/item> under <text/item>
-        text_items = []
-        for t in text_root.findall('.//text/item'):
-            text_items.extend(t.findall('./formats/item'))
+        # All <formats/item> under <text/item>
+        text_formats = specs.COMMITTEE_REPORT_TEXT_FORMATS.extract(text_root)
 
-        result['text_links'] = _parse_committee_report_text_links(text_items)
+        result['text_links'] = _parse_committee_report_text_links(text_formats)
 
         return result
 
     @mcp.tool(description=_get_description_for_function("getRelevantBillSections"))
+    @tool_metrics
+    @token_budget(8000)
+    @singleflight(congress_index=_normalize_congress_index)
     def getRelevantBillSections(congress_index: dict, company_name: str) -> dict:
         bill_text = extractBillText(congress_index)
         raw_text = bill_text["text_versions"]["text"]
@@ -499,10 +379,13 @@ class MCPServerWrapper:
 
         bill_name = f"{congress_index['bill_type']}{congress_index['bill_number']}-{congress_index['congress']}"
 
-        bill_text_rag = BillTextRAG(bill_name)
+        bill_text_rag = _bill_text_rag(bill_name)
         return bill_text_rag.run_relevant_sections(company_name=company_name, bill_text=raw_text, bill_summary_text=bill_summary_text)
 
     @mcp.tool(description=_get_description_for_function("getRelevantBillSectionsReport"))
+    @tool_metrics
+    @token_budget(8000)
+    @singleflight(congress_index=_normalize_congress_index)
     def getRelevantBillSectionsReport(congress_index: dict, company_name: str) -> dict:
         bill_text = extractBillText(congress_index)
         raw_text = bill_text["text_versions"]["text"]
@@ -512,10 +395,14 @@ class MCPServerWrapper:
 
         bill_name = f"{congress_index['bill_type']}{congress_index['bill_number']}-{congress_index['congress']}"
 
-        bill_text_rag = BillTextRAG(bill_name)
+        bill_text_rag = _bill_text_rag(bill_name)
         return bill_text_rag.run_report(company_name=company_name, bill_text=raw_text, bill_summary_text=bill_summary_text)
     
     @mcp.tool(description=_get_description_for_function("getBillAmendments"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
+    @warehouse_first("amendments")
     def getBillAmendments(congress_index:dict) -> dict:
         debug = []
         debug.append(f"RAW ARGUMENT: {congress_index!r}")
@@ -530,20 +417,12 @@ class MCPServerWrapper:
         limit = 250
         while True:
             params = {"limit": limit, "offset": offset}
-            root = _call_and_parse(congress_index, endpoint, params=params)
-            amendments = root.findall('.//amendment')
+            # Streamed: big pages are never held as a whole tree
+            amendments, total = parse_page(_call_api(congress_index, endpoint, params), specs.BILL_AMENDMENTS)
             if not amendments:
                 break
-            for am in amendments:
-                results.append({
-                    'number': am.findtext('number').strip(),
-                    'congress': int(am.findtext('congress')),
-                    'type': am.findtext('type'),
-                    'updateDate': am.findtext('updateDate'),
-                    'detailUrl': am.findtext('url'),
-                })
-            total = int(root.findtext('.//pagination/count', default='0'))
-            if offset + limit >= total:
+            results.extend(amendments)
+            if offset + limit >= (total or 0):
                 break
             offset += limit
         debug = [f"Found {len(results)} amendments for bill {congress_index}"]
@@ -553,6 +432,9 @@ class MCPServerWrapper:
         }
 
     @mcp.tool(description=_get_description_for_function("getAmendmentSponsors"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def getAmendmentSponsors(congress_index: dict) -> dict:
         debug = []
         debug.append(f"RAW ARGUMENT: {congress_index!r}")
@@ -574,17 +456,7 @@ class MCPServerWrapper:
         params = {"format": "xml"}
         # call API and parse XML
         root = _call_and_parse(congress_index, endpoint, params=params)
-        sponsors = []
-        for item in root.findall('.//sponsors/item'):
-            sponsors.append({
-                'bioguideId': item.findtext('bioguideId').strip() if item.findtext('bioguideId') else None,
-                'firstName': item.findtext('firstName').strip() if item.findtext('firstName') else None,
-                'lastName': item.findtext('lastName').strip() if item.findtext('lastName') else None,
-                'fullName': item.findtext('fullName').strip() if item.findtext('fullName') else None,
-                'party': item.findtext('party').strip() if item.findtext('party') else None,
-                'state': item.findtext('state').strip() if item.findtext('state') else None,
-                'url': item.findtext('url').strip() if item.findtext('url') else None,
-            })
+        sponsors = specs.AMENDMENT_SPONSORS.extract(root)
         debug= [f"Found {len(sponsors)} amendment sponsors for {congress_index}"]
         return {
             'sponsors': sponsors,
@@ -592,6 +464,9 @@ class MCPServerWrapper:
         }
 
     @mcp.tool(description=_get_description_for_function("getAmendmentText"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def getAmendmentText(congress_index: dict) -> dict:
         debug = []
         if not congress_index:
@@ -608,6 +483,9 @@ class MCPServerWrapper:
         return {"text_urls": text_urls, "debug": debug}
 
     @mcp.tool(description=_get_description_for_function("getAmendmentActions"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def getAmendmentActions(congress_index: dict) -> dict:
         debug = []
         if not congress_index:
@@ -615,38 +493,14 @@ class MCPServerWrapper:
             return {"actions": [], "debug": debug}
         endpoint = "amendment/{congress}/{amendment_type}/{amdt_number}/actions"
         root = _call_and_parse(congress_index, endpoint)
-        actions = []
-        for item in root.findall(".//actions/item"):
-            action = {
-                "actionDate": item.findtext("actionDate"),
-                "text":       item.findtext("text"),
-                "type":       item.findtext("type"),
-            }
-            if item.findtext("actionCode") is not None:
-                action["actionCode"] = item.findtext("actionCode")
-            ss = item.find("sourceSystem")
-            if ss is not None:
-                action["sourceSystem"] = {
-                    "code": ss.findtext("code"),
-                    "name": ss.findtext("name"),
-                }
-            votes = []
-            for rv in item.findall(".//recordedVote"):
-                votes.append({
-                    "rollNumber":    rv.findtext("rollNumber"),
-                    "chamber":       rv.findtext("chamber"),
-                    "congress":      rv.findtext("congress"),
-                    "date":          rv.findtext("date"),
-                    "sessionNumber": rv.findtext("sessionNumber"),
-                    "url":           rv.findtext("url"),
-                })
-            if votes:
-                action["recordedVotes"] = votes
-            actions.append(action)
+        actions = specs.AMENDMENT_ACTIONS.extract(root)
         debug.append(f"Extracted {len(actions)} amendment actions for {congress_index}")
         return {"actions": actions, "debug": debug}
 
     @mcp.tool(description=_get_description_for_function("getAmendmentCoSponsors"))
+    @tool_metrics
+    @token_budget()
+    @singleflight(congress_index=_normalize_congress_index)
     def getAmendmentCoSponsors(congress_index: dict) -> dict:
         debug = []
         if not congress_index:
@@ -654,29 +508,8 @@ class MCPServerWrapper:
             return {"pagination": {}, "cosponsors": [], "debug": debug}
         endpoint = "amendment/{congress}/{amendment_type}/{number}/cosponsors"
         root = _call_and_parse(congress_index, endpoint)
-        pag = root.find(".//pagination")
-        pagination = {
-            "count": int(pag.findtext("count", default="0")),
-            "countIncludingWithdrawnCosponsors": int(
-                pag.findtext("countIncludingWithdrawnCosponsors", default="0")
-            ),
-        }
-        cosponsors = []
-        for item in root.findall(".//cosponsors/item"):
-            cs = {
-                "bioguideId":         item.findtext("bioguideId"),
-                "fullName":           item.findtext("fullName"),
-                "firstName":          item.findtext("firstName"),
-                "lastName":           item.findtext("lastName"),
-                "party":              item.findtext("party"),
-                "state":              item.findtext("state"),
-                "url":                item.findtext("url"),
-                "sponsorshipDate":    item.findtext("sponsorshipDate"),
-                "isOriginalCosponsor": item.findtext("isOriginalCosponsor") == "True",
-            }
-            if item.findtext("middleName") is not None:
-                cs["middleName"] = item.findtext("middleName")
-            cosponsors.append(cs)
+        pagination = specs.AMENDMENT_COSPONSOR_PAGINATION.extract(root)
+        cosponsors = specs.AMENDMENT_COSPONSORS.extract(root)
         debug.append(f"Found {len(cosponsors)} amendment cosponsors for {congress_index}")
         return {
             "pagination": pagination,
@@ -685,6 +518,9 @@ class MCPServerWrapper:
         }
 
     @mcp.tool(description=_get_description_for_function("get_senate_votes"))
+    @tool_metrics
+    @token_budget()
+    @singleflight()
     def get_senate_votes(congress: int, session: int, roll_call_vote_no: int) -> dict:
 
         base = "https://www.senate.gov/legislative/LIS/roll_call_votes"
@@ -692,52 +528,74 @@ class MCPServerWrapper:
         filename = f"vote_{congress}_{session}_{roll_call_vote_no:05d}.xml"
         url = f"{base}/{directory}/{filename}"
 
+        record_upstream_call(url)
         resp = requests.get(url)
         resp.raise_for_status()
 
-        root = ET.fromstring(resp.content)
+        root = parse_xml(resp.content)
         votes = {}
-        for member in root.findall(".//member"):
-
-            member_id = member.findtext("lis_member_id") or ""
-            vote_obj ={
-                "name":      member.findtext("member_full") or "",
-                "party":     member.findtext("party") or "",
-                "vote":      member.findtext("vote_cast") or "",
-            }
-            votes[member_id] = vote_obj
+        for member in specs.SENATE_VOTES.extract(root):
+            votes[member.pop("lis_member_id")] = member
         return votes
 
     @mcp.tool(description=_get_description_for_function("get_house_votes"))
+    @tool_metrics
+    @token_budget()
+    @singleflight()
     def get_house_votes(year: int, roll_call_number: int) -> dict:
 
         roll = _parse_roll_call_number_house(roll_call_number)
         url = f"https://clerk.house.gov/evs/{year}/roll{roll}.xml"
+        record_upstream_call(url)
         resp = requests.get(url)
         resp.raise_for_status()
 
-        root = ET.fromstring(resp.content)
+        root = parse_xml(resp.content)
         votes = {}
-        # iterate over each recorded-vote element
-        for rv in root.findall(".//recorded-vote"):
-            leg = rv.find("legislator")
-            if leg is None:
+        for rv in specs.HOUSE_VOTES.extract(root):
+            # Recorded votes without a legislator are skipped
+            if "name" not in rv:
                 continue
-
-            name      = (leg.text or "").strip()
-            member_id = leg.attrib.get("name-id", "").strip()
-            party     = leg.attrib.get("party", "").strip()
-            vote_cast = (rv.findtext("vote") or "").strip()
-
-            votes[member_id] = {
-                "name":      name,
-                "party":     party,
-                "vote":      vote_cast
+            votes[rv["name_id"]] = {
+                "name":      rv["name"],
+                "party":     rv["party"],
+                "vote":      rv["vote"]
             }
 
         return votes
 
+    @mcp.tool(description=_get_description_for_function("prefetchBillDossier"))
+    @tool_metrics
+    def prefetchBillDossier(lobby_view_bill_id: str) -> dict:
+        parsed = _unwrapped_tool("convertLVtoCongress")(lobby_view_bill_id)
+        if not parsed["result"]:
+            return {"status": "invalid", "debug": parsed["debug"]}
+        return _start_bill_prefetch(lobby_view_bill_id.lower(), parsed["result"])
+
+    @mcp.tool(description=_get_description_for_function("queryWarehouse"))
+    @tool_metrics
+    @token_budget()
+    def queryWarehouse(sql: str, parameters: list = None, max_rows: int = 0) -> dict:
+        # 0 or less means the default; fetchmany would read the whole result for those
+        max_rows = min(max_rows, MAX_QUERY_ROWS) if max_rows > 0 else MAX_QUERY_ROWS
+        try:
+            result = get_warehouse().query(sql, parameters, max_rows)
+        except (sqlite3.Error, sqlite3.Warning) as e:
+            return {"columns": [], "rows": [], "debug": [f"Query failed: {e}. Only single read-only SELECT statements "
+                                                          f"over the views {QUERY_VIEWS} and the warehouse tables are allowed."]}
+        debug = [f"Returned {len(result['rows'])} rows" + (f" (cut at {max_rows}, aggregate or filter more)" if result["truncated"] else "")]
+        return {**result, "debug": debug}
+
+    @mcp.tool(description=_get_description_for_function("fetchMore"))
+    @tool_metrics
+    def fetchMore(cursor: str, max_tokens: int = 0) -> dict:
+        return fetch_more(cursor, max_tokens or None)
+
     def run(self):
+        get_member_cache(_fetch_member_profile).warm()
+        refresh_hours = float(os.getenv("STATE_MEMBERS_REFRESH_HOURS", "24"))
+        if refresh_hours > 0:
+            get_state_member_index(_fetch_state_member_page).start_refresher(refresh_hours)
         print("Starting RAG Congress MCP server at PORT 8080...")
         print("Using SSE transport for better compatibility...")
         self.mcp.run(transport="sse")
@@ -768,6 +626,61 @@ class MCPServerWrapper:
         # print(self.getBillSponsors({"congress": 117, "bill_type": "hr", "bill_number": 2307}))
         # print(self.getBillCosponsors({"congress": 117, "bill_type": "hr", "bill_number": 2307}))
 
+# Tool functions as registered with FastMCP, and precise input schemas for them built once at
+# startup. FastMCP derives only {"type": "object"} from `congress_index: dict`, which made agents
+# send empty or misshapen arguments, so we advertise the generated schemas instead.
+TOOL_FUNCTIONS = {tool.name: tool.fn for tool in MCPServerWrapper.mcp._tool_manager.list_tools()}
+TOOL_SCHEMAS = build_tool_schemas(TOOL_FUNCTIONS)
+for _tool in MCPServerWrapper.mcp._tool_manager.list_tools():
+    _tool.parameters = TOOL_SCHEMAS[_tool.name]
+
+# Tools whose upstream responses prefetchBillDossier warms, all called with the bill's congress_index
+PREFETCH_TOOLS = ["getBillSummary", "getBillSponsors", "getBillCosponsors", "getBillCommittees",
+                  "extractBillActions", "getBillAmendments", "get_committee_actions"]
+
+
+def _fetch_member_profile(bioguide_id: str) -> dict:
+    return _parse_member_profile(_call_and_parse({"bioguideId": bioguide_id}, "member/{bioguideId}"))
+
+
+def _fetch_state_member_page(state_code: str, offset: int, limit: int) -> bytes:
+    path = f"member/{state_code}"
+    with get_tracer().start_as_current_span(
+        "congress_api.get",
+        attributes={"http.path_template": "member/{stateCode}", "http.path": path, "page.offset": offset},
+    ):
+        data, _ = cdg_client.get(endpoint=path, params={"offset": offset, "limit": limit})
+    return data
+
+
+def _unwrapped_tool(name: str):
+    """Tool function without its metrics/budget decorators (their work is wasted on prefetches)"""
+    return inspect.unwrap(TOOL_FUNCTIONS[name])
+
+
+def _bill_text_rag(bill_name: str):
+    # Imported on first use: the LangChain/Chroma/OpenAI stack dominates the server's startup time
+    from rag.BillTextRAG import BillTextRAG
+    return BillTextRAG(bill_name)
+
+
+def _index_bill_text(bill_name: str, congress_index: dict) -> None:
+    bill_text = extractBillText(congress_index)
+    _bill_text_rag(bill_name).build_index(bill_text["text_versions"]["text"])
+
+
+def _start_bill_prefetch(bill_name: str, congress_index: dict) -> dict:
+    tasks = {name: functools.partial(_unwrapped_tool(name), congress_index) for name in PREFETCH_TOOLS}
+    # The RAG tools fetch the text themselves, so indexing it is the step that saves the most
+    after = {"indexBillText": functools.partial(_index_bill_text, bill_name, congress_index)}
+    return get_bill_prefetcher().start(bill_name, tasks, after)
+
+# Tool calls continue the caller's trace (TRACING_ENABLED=1); the `_trace` argument is always stripped
+setup_tracing("ragmcp")
+install_tool_tracing(MCPServerWrapper.mcp._tool_manager)
+# Sync tools run in worker threads (TOOL_WORKER_THREADS), so concurrent calls overlap and @singleflight can join them
+install_tool_threads(MCPServerWrapper.mcp._tool_manager)
+
 if __name__ == "__main__":
     
     # Simple detection for stdio vs HTTP mode
@@ -780,30 +693,26 @@ if __name__ == "__main__":
         
         # Create standard MCP server
         server = Server("rag-congress-mcp")
-        wrapper = MCPServerWrapper()
         
         @server.call_tool()
         async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             try:
-                method = getattr(wrapper, name)
-                result = method(arguments)
-                return [TextContent(type="text", text=str(result))]
+                with tool_span(name, arguments):
+                    result = await run_in_tool_thread(functools.partial(call_tool_with_arguments, TOOL_FUNCTIONS[name], arguments))
+                return [TextContent(type="text", text=serialize_response(result))]
             except Exception as e:
                 return [TextContent(type="text", text=f"Error: {str(e)}")]
         
         @server.list_tools()
         async def list_tools() -> list[Tool]:
-            tools = []
-            tool_names = [attr for attr in dir(wrapper) 
-                         if not attr.startswith('_') and callable(getattr(wrapper, attr))
-                         and attr not in ['run', '__init__']]
-            for name in tool_names:
-                tools.append(Tool(
+            return [
+                Tool(
                     name=name,
-                    description=f"Tool: {name}",
-                    inputSchema={"type": "object", "properties": {}, "required": []}
-                ))
-            return tools
+                    description=_get_description_for_function(name) or f"Tool: {name}",
+                    inputSchema=TOOL_SCHEMAS[name]
+                )
+                for name in TOOL_FUNCTIONS
+            ]
         
         async def main():
             async with stdio_server() as (read, write):
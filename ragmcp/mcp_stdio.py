@@ -18,8 +18,11 @@ from mcp.server import Server
 from mcp.types import Tool, TextContent
 import importlib.util
 
-# Import the main server wrapper
-from main import MCPServerWrapper
+# Import the registered tools and their input schemas (built once when main is imported)
+from main import TOOL_FUNCTIONS, TOOL_SCHEMAS
+from util.fetch.schemas import call_tool_with_arguments
+from util.tracing import tool_span
+from util.budget import serialize_response
 
 def get_tool_description(tool_name: str) -> str:
     """Get a basic description for a tool"""
@@ -34,7 +37,8 @@ def get_tool_description(tool_name: str) -> str:
         "extractBillActions": "Get timeline of actions taken on a bill",
         "getBillAmendments": "Get amendments to a bill",
         "getAmendmentSponsors": "Get sponsors of an amendment",
-        "getRelevantBillSections": "Get bill sections relevant to a company using RAG"
+        "getRelevantBillSections": "Get bill sections relevant to a company using RAG",
+        "fetchMore": "Continue a truncated tool response from its cursor"
     }
     return descriptions.get(tool_name, f"Tool: {tool_name}")
 
@@ -42,30 +46,15 @@ async def main():
     # Create standard MCP server for stdio communication
     server = Server("rag-congress-mcp")
     
-    # Create wrapper instance to access methods
-    wrapper = MCPServerWrapper()
-    
     # Register tool call handler
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         try:
-            # Get the method from wrapper instance
-            if hasattr(wrapper, name):
-                method = getattr(wrapper, name)
-                # Call the method with proper arguments
-                if name in ['getBillSummary', 'getBillSponsors', 'getBillCosponsors', 'getBillCommittees', 
-                           'extractBillActions', 'getBillAmendments', 'get_committee_actions']:
-                    result = method(arguments)
-                elif name == 'get_committee_members':
-                    result = method(arguments.get('committee_name'), arguments.get('congress'))
-                elif name == 'getCongressMember':
-                    result = method(arguments.get('bioguideId'))
-                elif name == 'getRelevantBillSections':
-                    result = method(arguments.get('congress_index'), arguments.get('company_name'))
-                else:
-                    result = method(arguments)
-                
-                return [TextContent(type="text", text=str(result))]
+            if name in TOOL_FUNCTIONS:
+                # Arguments matching the tool signature are passed as keywords
+                with tool_span(name, arguments):
+                    result = call_tool_with_arguments(TOOL_FUNCTIONS[name], arguments)
+                return [TextContent(type="text", text=serialize_response(result))]
             else:
                 return [TextContent(type="text", text=f"Error: Tool '{name}' not found")]
         except Exception as e:
@@ -80,19 +69,15 @@ async def main():
             'getBillSummary', 'getBillSponsors', 'getBillCosponsors', 'getBillCommittees',
             'get_committee_members', 'get_committee_actions', 'getCongressMember',
             'extractBillActions', 'getBillAmendments', 'getAmendmentSponsors',
-            'getRelevantBillSections'
+            'getRelevantBillSections', 'fetchMore'
         ]
         
         for tool_name in tool_methods:
-            if hasattr(wrapper, tool_name):
+            if tool_name in TOOL_FUNCTIONS:
                 tools.append(Tool(
                     name=tool_name,
                     description=get_tool_description(tool_name),
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
+                    inputSchema=TOOL_SCHEMAS[tool_name]
                 ))
         
         return tools
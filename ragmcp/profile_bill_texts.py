@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Bulk token profile of bill texts, to predict RAG indexing cost and choose chunk sizes.
+
+    python profile_bill_texts.py ../frontend_demo/data/big_oil.csv --output data/bill_token_profile.csv
+    python profile_bill_texts.py bills.csv --output profile.parquet --chunk-sizes 250 500 1000
+
+Texts are fetched concurrently in threads through the cached Congress.gov client, then
+tokenized and chunked (with the section splitter BillTextRAG indexes with) in a process pool
+whose workers load the encoder once. One row per bill: characters, tokens, sections, and
+for every chunk size the number of text/title chunks and the tokens that would be embedded.
+Parquet output needs pyarrow; without it the report is written as CSV.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Add the script directory to Python path (for the rag/util packages)
+sys.path.append(str(Path(__file__).parent))
+
+BILL_ID_PATTERN = re.compile(r'^(s|hr|sconres|hconres|hjres|sjres)(\d{1,5})-(1\d{2}|200)$')
+# BillTextRAG splits with chunk_size=250
+DEFAULT_CHUNK_SIZES = (250, 500, 1000)
+
+
+def read_bill_ids(csv_path: str, column: str = "bill_id", limit: Optional[int] = None) -> List[str]:
+    """Distinct bill ids of a CSV (e.g. LobbyView data), in order of first appearance"""
+    bill_ids: Dict[str, None] = {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            bill_id = (row.get(column) or "").strip().lower()
+            if bill_id:
+                bill_ids.setdefault(bill_id, None)
+            if limit and len(bill_ids) >= limit:
+                break
+    return list(bill_ids)
+
+
+def fetch_bill_text(bill_id: str) -> str:
+    """Latest text version of a bill, through the cached client"""
+    from util._main import extractBillText
+
+    match = BILL_ID_PATTERN.match(bill_id)
+    if not match:
+        raise ValueError(f"Could not parse bill id {bill_id}")
+    bill_type, number, congress = match.groups()
+    text_versions = extractBillText({"congress": congress, "bill_type": bill_type, "bill_number": number})["text_versions"]
+    if not text_versions or not text_versions.get("text"):
+        raise ValueError(f"No text versions for {bill_id}")
+    return text_versions["text"]
+
+
+def profile_text(bill_id: str, text: str, chunk_sizes: Sequence[int]) -> dict:
+    """Token, section and chunk counts of one bill text (runs in the process pool)"""
+    # Imported in the worker; the encoder is created once per process on first import
+    from rag.util.parse.text_parse import _ENCODER
+    from rag.util.split._section_split import chunk_bill
+
+    row = {"bill_id": bill_id, "status": "ok", "characters": len(text), "tokens": len(_ENCODER.encode(text))}
+    for chunk_size in chunk_sizes:
+        title_chunks, text_chunks = chunk_bill(text, max_tokens=chunk_size)
+        row.setdefault("sections", len({chunk["meta"]["section"] for chunk in text_chunks}))
+        row[f"text_chunks_{chunk_size}"] = len(text_chunks)
+        row[f"title_chunks_{chunk_size}"] = len(title_chunks)
+        row[f"embedded_tokens_{chunk_size}"] = sum(len(_ENCODER.encode(chunk["text"])) for chunk in text_chunks)
+    return row
+
+
+def profile_bills(bill_ids: List[str], chunk_sizes: Sequence[int] = DEFAULT_CHUNK_SIZES,
+                  fetch_workers: int = 8, tokenize_workers: Optional[int] = None) -> List[dict]:
+    """Fetches all texts concurrently and profiles each one as soon as it arrives"""
+    rows = []
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=tokenize_workers) as tokenize_pool:
+        fetches = {fetch_pool.submit(fetch_bill_text, bill_id): bill_id for bill_id in bill_ids}
+        profiles = {}
+        for future in as_completed(fetches):
+            bill_id = fetches[future]
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"⚠️  {bill_id}: {e}")
+                rows.append({"bill_id": bill_id, "status": f"error: {e}"})
+                continue
+            profiles[tokenize_pool.submit(profile_text, bill_id, text, chunk_sizes)] = bill_id
+
+        for future in as_completed(profiles):
+            bill_id = profiles[future]
+            try:
+                rows.append(future.result())
+                print(f"✅ {bill_id}: {rows[-1]['tokens']} tokens")
+            except Exception as e:
+                print(f"⚠️  {bill_id}: {e}")
+                rows.append({"bill_id": bill_id, "status": f"error: {e}"})
+
+    order = {bill_id: i for i, bill_id in enumerate(bill_ids)}
+    rows.sort(key=lambda row: order[row["bill_id"]])
+    return rows
+
+
+def write_report(rows: List[dict], output_path: str) -> str:
+    """Writes the rows as Parquet (.parquet, needs pyarrow) or CSV; returns the path written"""
+    columns = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+
+    # Failed bills have no counts; every row gets every column
+    rows = [{column: row.get(column) for column in columns} for row in rows]
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        if pyarrow is not None:
+            pyarrow.parquet.write_table(pyarrow.Table.from_pylist(rows), path)
+            return str(path)
+        print("⚠️  pyarrow is not installed, writing the report as CSV")
+        path = path.with_suffix(".csv")
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_path", help="CSV with a bill id column (e.g. LobbyView data)")
+    parser.add_argument("--output", default=os.path.join("data", "bill_token_profile.csv"), help=".csv or .parquet")
+    parser.add_argument("--column", default="bill_id")
+    parser.add_argument("--limit", type=int, default=None, help="Only the first N distinct bills")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=list(DEFAULT_CHUNK_SIZES))
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Concurrent downloads")
+    parser.add_argument("--tokenize-workers", type=int, default=None, help="Tokenizer processes (default: CPU count)")
+    args = parser.parse_args()
+
+    bill_ids = read_bill_ids(args.csv_path, args.column, args.limit)
+    print(f"📋 Profiling {len(bill_ids)} bills with chunk sizes {args.chunk_sizes}")
+    start = time.perf_counter()
+    rows = profile_bills(bill_ids, args.chunk_sizes, args.fetch_workers, args.tokenize_workers)
+    path = write_report(rows, args.output)
+
+    profiled = [row for row in rows if row["status"] == "ok"]
+    total_tokens = sum(row["tokens"] for row in profiled)
+    print(f"📊 {len(profiled)}/{len(rows)} bills, {total_tokens} tokens in {time.perf_counter() - start:.1f}s -> {path}")
+    for chunk_size in args.chunk_sizes:
+        print(f"   chunk size {chunk_size}: {sum(row[f'text_chunks_{chunk_size}'] for row in profiled)} chunks, "
+              f"{sum(row[f'embedded_tokens_{chunk_size}'] for row in profiled)} embedded tokens")
+
+
+if __name__ == "__main__":
+    main()
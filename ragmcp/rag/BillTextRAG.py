@@ -1,4 +1,6 @@
 import os
+import tempfile
+import threading
 from operator import itemgetter
 from typing import Optional
 
@@ -9,14 +11,25 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 
 from rag.util.split.CongressBillTextSplitter import CongressBillTextSplitter
+from rag.util.split._section_split import chunk_bill
 from rag.util.parse.file_parse import load_prompts
 from rag.util.langchain.retrieval import build_full_section_context, _complete_docs
 from rag.util.langchain.lang import get_single_retrieval_chain
 from rag.util.api.authenticate import _get_key
+from util.tracing import get_tracer
 
 oai_key = _get_key("OPENAI_API_KEY")
 langsmith_key = _get_key("LANGCHAIN_API_KEY")
 
+_index_locks = {}
+_index_locks_guard = threading.Lock()
+
+
+def _get_index_lock(persist_directory: str) -> threading.Lock:
+    with _index_locks_guard:
+        return _index_locks.setdefault(persist_directory, threading.Lock())
+
+
 class BillTextRAG:
 
     def __init__(self, 
@@ -43,6 +56,8 @@ class BillTextRAG:
             base_dir, "vectorstores", "chroma_congress_bills", bill_name
         )
         os.makedirs(self.persist_directory, exist_ok=True)
+        # Full text of every section, written when the bill is chunked and read by retrieval
+        self.sections_path = os.path.join(self.persist_directory, "sections.json")
 
         self.vectorstore: Optional[Chroma] = None
         self.retriever = None
@@ -50,6 +65,10 @@ class BillTextRAG:
     def _load_or_build_vectorstore(self) -> Chroma:
         chroma_db_file = os.path.join(self.persist_directory, "chroma.sqlite3")
         if os.path.exists(chroma_db_file):
+            if not os.path.exists(self.sections_path):
+                # Index built before the sections were stored with it
+                with open(f"{self.path}/data/bill_texts/{self.bill_name}.txt", "r") as f:
+                    chunk_bill(f.read(), max_tokens=250, sections_path=self.sections_path)
             return Chroma(
                 persist_directory=self.persist_directory,
                 embedding_function=self.embeddings,
@@ -58,7 +77,7 @@ class BillTextRAG:
 
         loader = TextLoader(f"{self.path}/data/bill_texts/{self.bill_name}.txt")
         docs = loader.load()
-        text_splitter = CongressBillTextSplitter(chunk_size=250, chunk_overlap=200)
+        text_splitter = CongressBillTextSplitter(sections_path=self.sections_path, chunk_size=250, chunk_overlap=200)
         chunks = text_splitter.split_documents(docs)
 
         if not chunks:
@@ -78,15 +97,31 @@ class BillTextRAG:
 
     def get_retriever(self):
         if self.vectorstore is None:
-            self.vectorstore = self._load_or_build_vectorstore()
+            # One build per bill at a time (the dossier prefetch may be indexing it right now)
+            with _get_index_lock(self.persist_directory), \
+                    get_tracer().start_as_current_span("rag.vectorstore", attributes={"rag.bill": self.bill_name}) as span:
+                span.set_attribute("rag.vectorstore.cached", os.path.exists(os.path.join(self.persist_directory, "chroma.sqlite3")))
+                self.vectorstore = self._load_or_build_vectorstore()
         if self.retriever is None:
             self.retriever = self.vectorstore.as_retriever()
         return self.retriever
 
+    def build_index(self, bill_text: str):
+        """Stores the bill text and loads or builds its vectorstore, without any LLM calls"""
+        # Written to a temp file and renamed: a concurrent build of the same bill (the dossier
+        # prefetch) may be reading the text under the index lock right now
+        text_path = f"{self.path}/data/bill_texts/{self.bill_name}.txt"
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(text_path), suffix=".txt.tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(bill_text)
+            os.replace(tmp_path, text_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return self.get_retriever()
+
     def _setup_rag_chain(self, company_name: str, bill_text: str, bill_summary_text: str):
-        
-        with open(f"{self.path}/data/bill_texts/{self.bill_name}.txt", "w") as f:
-            f.write(bill_text)
 
         with open(f"{self.path}/data/bill_summaries/{self.bill_name}_summary.txt", "w") as f:
             f.write(bill_summary_text)
@@ -107,7 +142,7 @@ class BillTextRAG:
             | (lambda x: x.split("\n"))
         )
 
-        self.get_retriever()
+        self.build_index(bill_text)
 
         self.single_retrieval_chain = get_single_retrieval_chain(self.generate_queries, self.retriever)
 
@@ -116,29 +151,32 @@ class BillTextRAG:
 
     def run_relevant_sections(self, company_name: str, bill_text: str, bill_summary_text: str) -> str:
 
-        self._setup_rag_chain(company_name, bill_text, bill_summary_text)
+        with get_tracer().start_as_current_span("rag.setup", attributes={"rag.bill": self.bill_name}):
+            self._setup_rag_chain(company_name, bill_text, bill_summary_text)
 
         # Only retrieve the relevant sections from the index (no further processing)
         final_rag_chain = self.single_retrieval_chain
 
-        docs = final_rag_chain.invoke(
-            {
-                "company_name": company_name,
-                "summary": bill_summary_text,
-                "bill_name": self.bill_name
-            }
-        )
-        return _complete_docs(docs)
+        with get_tracer().start_as_current_span("rag.retrieve", attributes={"rag.bill": self.bill_name}):
+            docs = final_rag_chain.invoke(
+                {
+                    "company_name": company_name,
+                    "summary": bill_summary_text,
+                    "bill_name": self.bill_name
+                }
+            )
+        return _complete_docs(docs, self.sections_path)
         
 
     def run_report(self, company_name: str, bill_text: str, bill_summary_text: str) -> str:
 
-        self._setup_rag_chain(company_name, bill_text, bill_summary_text)
+        with get_tracer().start_as_current_span("rag.setup", attributes={"rag.bill": self.bill_name}):
+            self._setup_rag_chain(company_name, bill_text, bill_summary_text)
 
         final_rag_chain = (
             {
                 "context": lambda x: build_full_section_context(
-                    self.single_retrieval_chain, x
+                    self.single_retrieval_chain, x, self.sections_path
                 ),
                 "company_name": itemgetter("company_name"),
                 "summary": itemgetter("summary"),
@@ -149,10 +187,11 @@ class BillTextRAG:
             | StrOutputParser()
         )
 
-        return final_rag_chain.invoke(
-            {
-                "company_name": company_name,
-                "summary": bill_summary_text,
-                "bill_name": self.bill_name,
-            }
-        )
\ No newline at end of file
+        with get_tracer().start_as_current_span("rag.report", attributes={"rag.bill": self.bill_name}):
+            return final_rag_chain.invoke(
+                {
+                    "company_name": company_name,
+                    "summary": bill_summary_text,
+                    "bill_name": self.bill_name,
+                }
+            )
\ No newline at end of file
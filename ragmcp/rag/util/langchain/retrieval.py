@@ -7,9 +7,9 @@ from langchain.load import dumps
 from langchain_core.documents import Document
 
 
-def build_full_section_context(single_retrieval_chain: RunnableSerializable[dict, Any], input_payload: dict) -> str:
+def build_full_section_context(single_retrieval_chain: RunnableSerializable[dict, Any], input_payload: dict, sections_path: str) -> str:
     """
-    Run retrieval, extract unique section numbers, fetch full section texts, and format as a single context string.
+    Run retrieval, extract unique section numbers, fetch full section texts from `sections_path`, and format as a single context string.
     """
     retrieved_docs = run_retrieval_multiple_times(single_retrieval_chain, input_payload, num_runs=3, min_votes=2)
 
@@ -22,9 +22,9 @@ def build_full_section_context(single_retrieval_chain: RunnableSerializable[dict
 
 
     # Extract and de-duplicate section numbers while preserving order
-    return _complete_docs(retrieved_docs)
+    return _complete_docs(retrieved_docs, sections_path)
 
-def _complete_docs(docs: list[Document]) -> str:
+def _complete_docs(docs: list[Document], sections_path: str) -> str:
 
     section_numbers_in_order = []
 
@@ -36,7 +36,7 @@ def _complete_docs(docs: list[Document]) -> str:
     
     sections_text_blocks = []
     for num in unique_numbers:
-        full_text = get_section_text(num)
+        full_text = get_section_text(num, sections_path)
         if full_text:
             sections_text_blocks.append(f"SEC. {num}\n{full_text}")
     return "\n\n---\n\n".join(sections_text_blocks)
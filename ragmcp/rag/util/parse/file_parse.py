@@ -10,15 +10,13 @@ def load_prompts():
     return prompts
 
 # PREVIOUSLY: getSectionText
-def get_section_text(section_number: str) -> str:
+def get_section_text(section_number: str, sections_path: str) -> str:
     """
-    Given a section number as a string, return the section text from the JSON file.
-    The JSON file is expected to be a list of dicts with keys "section" and "text".
+    Given a section number as a string, return the section text from the bill's sections file
+    (written by chunk_bill). The JSON file is expected to be a list of dicts with keys "section" and "text".
     """
-    path = f"{local_path}/../../data/tmp_sections/sections_for_edit.json"
-
     try:
-        with open(path, "r", encoding="utf-8") as f:
+        with open(sections_path, "r", encoding="utf-8") as f:
             sections = json.load(f)
         for entry in sections:
             if entry.get("section") == section_number:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -6,12 +6,13 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from rag.util.split._section_split import chunk_bill
 
 class CongressBillTextSplitter(RecursiveCharacterTextSplitter):
-    def __init__(self, **kwargs):
+    def __init__(self, sections_path: Optional[str] = None, **kwargs):
         super().__init__(**kwargs)
+        self._sections_path = sections_path
 
     def _split_text(self, text: str, separators: List[str]) -> List[str]:
 
-        title_chunks, text_chunks = chunk_bill(text, max_tokens=self._chunk_size)
+        title_chunks, text_chunks = chunk_bill(text, max_tokens=self._chunk_size, sections_path=self._sections_path)
         chunks = [c["text"] for c in text_chunks]
         # Fallback to default splitter if section-based chunking yields nothing
         if not chunks:
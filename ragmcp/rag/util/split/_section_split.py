@@ -1,11 +1,14 @@
 import os
 import re
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 from rag.util.parse.text_parse import remove_deleted_text, _fixed_size_chunk, _token_count, _compress_numbers
 
-local_path = os.path.dirname(os.path.abspath(__file__))
-def chunk_bill(bill_text:str, max_tokens:int=1000) -> List[Dict]:
+def chunk_bill(bill_text:str, max_tokens:int=1000, sections_path: Optional[str] = None) -> List[Dict]:
+    """
+    Title and text chunks of a bill. With `sections_path`, the full text of every section is also
+    written there (read back by rag/util/parse/file_parse.get_section_text); one file per bill.
+    """
 
     cleaned_text = remove_deleted_text(bill_text)
     # This pattern allows the section header to span multiple lines and is resilient to the case where the next section starts immediately (no blank lines required).
@@ -58,6 +61,7 @@ def chunk_bill(bill_text:str, max_tokens:int=1000) -> List[Dict]:
 
     insertion_map = {} # maps a section number to a boolean indicating if it is an insertion
     section_number_re = re.compile(r"SEC\.\s*(\d+)")
+    all_sections_for_json = []
     for sec_text in section_texts:
         sec_header = sec_text.split('\n', 1)[0]
         sec_num_match = section_number_re.search(sec_header)
@@ -69,20 +73,12 @@ def chunk_bill(bill_text:str, max_tokens:int=1000) -> List[Dict]:
 
         sec_text = sec_text[len(sec_header):].strip()
 
-        # Save each section's text to a JSON file for later editing.
-        # We'll collect all sections in a list and write them out once at the end.
-        if 'all_sections_for_json' not in locals():
-            all_sections_for_json = []
+        # Each section's full text, written to sections_path once all sections are processed
         all_sections_for_json.append({
             "section": str(sec_num) if sec_num != -1 else sec_header,
             "text": sec_header + "\n" + sec_text,
         })
-        # At the end of the outermost loop (after all sections processed), write to file.
-        # (This should be moved outside the loop in the main function, but for inline use, check if last section)
-        if len(all_sections_for_json) == len(section_texts):
-            with open(f"{local_path}/../../data/tmp_sections/sections_for_edit.json", "w", encoding="utf-8") as f:
-                json.dump(all_sections_for_json, f, ensure_ascii=False, indent=2)
-                
+
         sub_chunks = _fixed_size_chunk(sec_text, max_tokens, overlap=max_tokens*0.05)
         for i, chunk_text in enumerate(sub_chunks):
             section_text_chunks.append({
@@ -90,6 +86,13 @@ def chunk_bill(bill_text:str, max_tokens:int=1000) -> List[Dict]:
                 "text": sec_header + "\n" + chunk_text,
                 "meta": {"kind": "text", "section": sec_header, "is_insertion": True if sec_num in insertion_map else False},
             })
+    if sections_path and all_sections_for_json:
+        # Written next to the file and then renamed, so readers never see a partial file
+        tmp_path = sections_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(all_sections_for_json, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, sections_path)
+
     tmp_text, tmp_token_total, tmp_sections = "", 0, []
     for title in section_titles:
         tokens = _token_count(title)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test that the compiled record specs return what findall + findtext returned, on the fixtures
+in data/fixtures/responses (see benchmark_response_parsing.py)
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmark_response_parsing import FIXTURES, FIXTURES_DIR, findtext_extract
+from util.parse import records, specs
+from util.parse.member import _parse_member_profile
+from util.parse.records import parse_page
+
+
+def _read(name: str, extension: str):
+    path = os.path.join(FIXTURES_DIR, f"{name}.{extension}")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _extract(data: bytes, spec, use_lxml: bool, stream: bool = False):
+    use_lxml_before, stream_min_bytes_before = records.USE_LXML, records.STREAM_MIN_BYTES
+    records.USE_LXML = use_lxml
+    records.STREAM_MIN_BYTES = 0
+    try:
+        if stream:
+            return parse_page(data, spec)[0]
+        return spec.extract(records.parse_xml(data))
+    finally:
+        records.USE_LXML, records.STREAM_MIN_BYTES = use_lxml_before, stream_min_bytes_before
+
+
+def test_fixtures_recorded():
+    missing = [name for name in FIXTURES if _read(name, "xml") is None]
+    assert not missing, f"No XML fixture for {missing} in {FIXTURES_DIR}"
+
+
+def test_specs_match_findtext():
+    parsers = [False] + ([True] if records.lxml_etree is not None else [])
+    for name, (_, spec_name) in FIXTURES.items():
+        data = _read(name, "xml")
+        spec = getattr(specs, spec_name)
+        expected = findtext_extract(spec, ET.fromstring(data))
+        assert expected, f"{name}: findtext found no records"
+
+        for use_lxml in parsers:
+            parser = "lxml" if use_lxml else "etree"
+            assert _extract(data, spec, use_lxml) == expected, f"{name}: {parser} records differ from findtext"
+            if not spec.first and spec._stream_tags is not None:
+                assert _extract(data, spec, use_lxml, stream=True) == expected, \
+                    f"{name}: streamed {parser} records differ from findtext"
+        print(f"✅ {name}: {len(expected) if isinstance(expected, list) else 1} records")
+
+
+def test_json_endpoints_match_xml():
+    # Only the endpoints switched to JSON (CONGRESS_JSON_ENDPOINTS) must agree with their XML
+    enabled = [name.strip() for name in os.getenv("CONGRESS_JSON_ENDPOINTS", "").split(",")]
+    for name, (_, spec_name) in FIXTURES.items():
+        json_data = _read(name, "json")
+        if json_data is None or (name not in enabled and enabled != ["all"]):
+            continue
+        spec = getattr(specs, spec_name)
+        expected = findtext_extract(spec, ET.fromstring(_read(name, "xml")))
+        assert spec.extract(records.loads_json(json_data)) == expected, f"{name}: JSON records differ from XML"
+        print(f"✅ {name}: JSON matches XML")
+
+
+def test_member_profile_current_party():
+    # Both member tools build their profile from specs.MEMBER; a party switcher's current party wins
+    data = b"""<api-root><member><bioguideId>S000000</bioguideId><currentMember>True</currentMember>
+        <partyHistory>
+          <item><partyName>Democratic</partyName><startYear>2007</startYear></item>
+          <item><partyName>Independent</partyName><startYear>2022</startYear></item>
+        </partyHistory>
+        <terms>
+          <item><congress>118</congress><chamber>Senate</chamber><stateCode>AZ</stateCode></item>
+          <item><congress>117</congress><chamber>Senate</chamber><stateCode>AZ</stateCode></item>
+        </terms></member></api-root>"""
+    profile = _parse_member_profile(ET.fromstring(data))
+    assert profile["party"] == "Independent", profile
+    assert profile["currentMember"] is True and profile["congressesServed"] == [117, 118], profile
+    print(f"✅ member profile: {profile}")
+
+
+if __name__ == "__main__":
+    test_fixtures_recorded()
+    test_specs_match_findtext()
+    test_json_endpoints_match_xml()
+    test_member_profile_current_party()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing (util/singleflight.py): shared results, shared errors, re-entrancy
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from util.singleflight import SingleFlight, singleflight, get_tool_flights
+
+
+def _run_concurrently(functions):
+    """Results (or exceptions) of functions started together in threads"""
+    results = [None] * len(functions)
+
+    def run(i, function):
+        try:
+            results[i] = function()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, function)) for i, function in enumerate(functions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_joiners_get_a_copy_of_the_leader_result():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    @singleflight(congress_index=lambda index: index["bill_number"])
+    def tool(congress_index: dict, limit: int = 10):
+        calls.append(congress_index)
+        started.set()
+        release.wait(5)
+        return {"actions": [{"text": "Introduced"}]}
+
+    def leader():
+        return tool({"bill_number": 1})
+
+    def joiner():
+        started.wait(5)
+        # Equal once normalized, and with the default spelled out
+        return tool(congress_index={"bill_number": 1, "congress": None}, limit=10)
+
+    joiners = [joiner] * 3
+    coalesced_before = get_tool_flights().stats["coalesced"]
+    threading.Timer(0.2, release.set).start()
+    results = _run_concurrently([leader] + joiners)
+
+    assert len(calls) == 1, f"expected one execution, got {len(calls)}"
+    assert get_tool_flights().stats["coalesced"] - coalesced_before == len(joiners)
+    assert all(result == results[0] for result in results), results
+    # Deep copies: no caller can change what another one got
+    assert len({id(result) for result in results}) == len(results)
+    assert len({id(result["actions"][0]) for result in results}) == len(results)
+    print(f"✅ {len(joiners)} joiners shared one call: {results[0]}")
+
+
+def test_leader_exception_reaches_every_joiner():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise ValueError("upstream failed")
+
+    def joiner():
+        started.wait(5)
+        return flights.do("key", lambda: "not called")
+
+    threading.Timer(0.2, release.set).start()
+    results = _run_concurrently([lambda: flights.do("key", failing), joiner, joiner])
+
+    assert all(isinstance(result, ValueError) for result in results), results
+    assert flights.stats["coalesced"] == 2, flights.stats
+    print(f"✅ every caller got {results[0]!r}")
+
+
+def test_key_removed_after_error():
+    flights = SingleFlight()
+
+    def failing():
+        raise RuntimeError("boom")
+
+    try:
+        flights.do("key", failing)
+        assert False, "the exception was swallowed"
+    except RuntimeError:
+        pass
+
+    assert "key" not in flights._calls, "the failed call is still in flight"
+    result, shared = flights.do("key", lambda: "retried")
+    assert (result, shared) == ("retried", False)
+    print("✅ a failed call is not shared with later callers")
+
+
+def test_reentrant_call_does_not_deadlock():
+    flights = SingleFlight()
+
+    def outer():
+        # Same key from the thread running it; waiting for itself would never return
+        inner, shared = flights.do("key", lambda: "inner")
+        return f"outer({inner}, shared={shared})"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(flights.do("key", outer)))
+    start = time.perf_counter()
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive(), "re-entrant call deadlocked"
+    assert results == [("outer(inner, shared=False)", False)], results
+    assert not flights._calls
+    print(f"✅ re-entrant call returned in {time.perf_counter() - start:.3f}s: {results[0]}")
+
+
+if __name__ == "__main__":
+    test_joiners_get_a_copy_of_the_leader_result()
+    test_leader_exception_reaches_every_joiner()
+    test_key_removed_after_error()
+    test_reentrant_call_does_not_deadlock()
@@ -1,5 +1,6 @@
 from util.parse.parse import _call_and_parse, _parse_congress_index_from_args
 from util.parse.text_parse import _extract_htm_pdf_from_xml
+from util.parse.specs import BILL_SUMMARIES
 
 def extractBillText(congress_index:dict) -> dict:
     debug = []
@@ -24,22 +25,6 @@ def getBillSummary(congress_index:dict) -> dict:
     endpoint = "bill/{congress}/{bill_type}/{bill_number}/summaries"
     root = _call_and_parse(parsed_index, endpoint)
 
-    summaries = []
-    for summary_elem in root.findall('.//summaries/summary'):
-        version_code = summary_elem.findtext('versionCode')
-        action_date = summary_elem.findtext('actionDate')
-        action_desc = summary_elem.findtext('actionDesc')
-        update_date = summary_elem.findtext('updateDate')
-        # The summary text is inside <cdata><text>
-        text_elem = summary_elem.find('.//cdata/text')
-        summary_text = text_elem.text if text_elem is not None else None
-
-        summaries.append({
-            "versionCode": version_code,
-            "actionDate": action_date,
-            "actionDesc": action_desc,
-            "updateDate": update_date,
-            "summary": summary_text
-        })
+    summaries = BILL_SUMMARIES.extract(root)
     debug.append(f"Extracted {len(summaries)} summaries for bill {parsed_index}")
     return {"summary": summaries, "debug": debug}
@@ -0,0 +1,228 @@
+"""
+Token budgets for tool responses. A response over its tool's budget is cut down server
+side (longest text fields first) and every cut field ends in a marker with a cursor;
+the `fetchMore` tool pages through the rest of that field.
+
+Budgets are in cl100k_base tokens of the serialized response. The default comes from
+TOOL_RESPONSE_TOKEN_BUDGET; tools pass their own to `@token_budget(...)`. In compact mode
+(see util.compact) responses are compacted before they are measured and sent as minified JSON.
+"""
+
+import copy
+import functools
+import os
+import threading
+import uuid
+from array import array
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+import pydantic_core
+
+from util.compact import compact_mode_enabled, compact_response, dumps_compact
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("TOOL_RESPONSE_TOKEN_BUDGET", "6000"))
+# Truncated fields keep at least this many tokens so they stay meaningful
+MIN_FIELD_TOKENS = 200
+# Unread remainders kept for fetchMore (oldest dropped first)
+MAX_CURSORS = 256
+
+# (bytes, tokens) of the response token_budget last sent in this context, so util.metrics
+# doesn't serialize and encode it again
+response_size: ContextVar[Optional[Tuple[int, int]]] = ContextVar("response_size", default=None)
+
+TRUNCATION_MARKER = "\n[... truncated: {remaining} more tokens. Call fetchMore with cursor '{cursor}' to continue.]"
+
+_encoder = None
+
+
+def _get_encoder():
+    global _encoder
+    if _encoder is None:
+        # Imported on first use so importing this module doesn't pull in tiktoken
+        from rag.util.token.token import get_token_encoder
+        _encoder = get_token_encoder()
+    return _encoder
+
+
+def encode(text: str) -> List[int]:
+    encoder = _get_encoder()
+    # encode_ordinary treats special-token text in bill documents as plain text
+    return getattr(encoder, "encode_ordinary", encoder.encode)(text)
+
+
+def decode(tokens) -> str:
+    return _get_encoder().decode(list(tokens))
+
+
+def count_tokens(text: str) -> int:
+    return len(encode(text))
+
+
+def serialize_response(result: Any) -> str:
+    """The text a tool result is sent as (FastMCP's content conversion, or minified in compact mode)"""
+    if isinstance(result, str):
+        return result
+    if compact_mode_enabled():
+        return dumps_compact(result)
+    return pydantic_core.to_json(result, fallback=str, indent=2).decode()
+
+
+class _CursorStore:
+    """LRU store of the unread token remainders of truncated fields"""
+
+    def __init__(self, max_entries: int = MAX_CURSORS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, tokens: List[int]) -> str:
+        key = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._entries[key] = array("I", tokens)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[array]:
+        with self._lock:
+            tokens = self._entries.get(key)
+            if tokens is not None:
+                self._entries.move_to_end(key)
+            return tokens
+
+
+# Global cursor store instance
+_cursor_store = _CursorStore()
+
+
+def _format_cursor(key: str, offset: int) -> str:
+    return f"{key}.{offset}"
+
+
+def _parse_cursor(cursor: str) -> Tuple[str, int]:
+    key, _, offset = (cursor or "").strip().strip("'\"").partition(".")
+    return key, int(offset or 0)
+
+
+def _truncate_tokens(tokens: List[int], keep: int) -> str:
+    """First `keep` tokens as text, ending in a marker with a cursor to the rest"""
+    key = _cursor_store.add(tokens[keep:])
+    marker = TRUNCATION_MARKER.format(remaining=len(tokens) - keep, cursor=_format_cursor(key, 0))
+    return decode(tokens[:keep]) + marker
+
+
+def _marker_tokens(total: int) -> int:
+    """Upper bound of the size of one truncation marker"""
+    return count_tokens(TRUNCATION_MARKER.format(remaining=total, cursor=_format_cursor("0" * 12, total)))
+
+
+def _string_fields(value: Any) -> List[Tuple[Any, Any]]:
+    """(container, key) of every string inside a dict/list result"""
+    fields = []
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, item in items:
+        if isinstance(item, str):
+            fields.append((value, key))
+        elif isinstance(item, (dict, list)):
+            fields.extend(_string_fields(item))
+    return fields
+
+
+def _shape(result: Any, budget: int) -> Tuple[Any, str, int]:
+    """(shaped result, its serialized text, its token count), see shape_response"""
+    text = serialize_response(result)
+    total = count_tokens(text)
+    if total <= budget:
+        return result, text, total
+
+    marker_tokens = _marker_tokens(total)
+    if isinstance(result, str):
+        truncated = _truncate_tokens(encode(result), max(budget - marker_tokens, 1))
+        return truncated, truncated, count_tokens(truncated)
+
+    if isinstance(result, (dict, list)):
+        shaped = copy.deepcopy(result)
+        fields = []
+        for container, key in _string_fields(shaped):
+            tokens = encode(container[key])
+            if len(tokens) > MIN_FIELD_TOKENS:
+                fields.append((len(tokens), container, key, tokens))
+        fields.sort(key=lambda field: field[0], reverse=True)
+
+        # Each cut field gains a marker; JSON escaping is not in the field counts, hence the margin
+        excess = total - budget + 50
+        for size, container, key, tokens in fields:
+            cut = min(excess + marker_tokens, size - MIN_FIELD_TOKENS)
+            if cut <= marker_tokens:
+                continue
+            container[key] = _truncate_tokens(tokens, size - cut)
+            excess -= cut - marker_tokens
+            if excess <= 0:
+                break
+
+        shaped_text = serialize_response(shaped)
+        shaped_tokens = count_tokens(shaped_text)
+        if shaped_tokens <= budget:
+            return shaped, shaped_text, shaped_tokens
+
+    truncated = _truncate_tokens(encode(text), max(budget - marker_tokens, 1))
+    return truncated, truncated, count_tokens(truncated)
+
+
+def shape_response(result: Any, budget: int) -> Any:
+    """
+    Returns `result` unchanged if it fits the token budget. Otherwise the longest text
+    fields are truncated (each ending in a fetchMore marker) until it fits; if that is not
+    enough (e.g. long lists of small records) the serialized response itself is paginated.
+    """
+    return _shape(result, budget)[0]
+
+
+def token_budget(budget: Optional[int] = None):
+    """Decorator shaping a tool's responses to `budget` tokens (default TOOL_RESPONSE_TOKEN_BUDGET)"""
+    limit = budget or DEFAULT_TOKEN_BUDGET
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            result = fn(*args, **kwargs)
+            if not compact_mode_enabled():
+                shaped, text, tokens = _shape(result, limit)
+            else:
+                shaped, text, tokens = _shape(compact_response(result), limit)
+                # A str result is passed through by FastMCP as is, so this is what goes on the wire
+                shaped = dumps_compact(shaped)
+                if shaped != text:
+                    text, tokens = shaped, count_tokens(shaped)
+            response_size.set((len(text.encode("utf-8")), tokens))
+            return shaped
+        return wrapper
+
+    return decorator
+
+
+def fetch_more(cursor: str, max_tokens: Optional[int] = None) -> dict:
+    """Next page of a truncated field (at most DEFAULT_TOKEN_BUDGET tokens, whatever max_tokens asks for)"""
+    limit = min(max_tokens or DEFAULT_TOKEN_BUDGET, DEFAULT_TOKEN_BUDGET)
+    try:
+        key, offset = _parse_cursor(cursor)
+    except ValueError:
+        key, offset = None, 0
+    tokens = _cursor_store.get(key) if key else None
+    if tokens is None:
+        return {
+            "content": None,
+            "cursor": None,
+            "debug": [f"Unknown or expired cursor '{cursor}'. Call the original tool again to get a fresh cursor."],
+        }
+
+    end = min(offset + limit, len(tokens))
+    remaining = len(tokens) - end
+    return {
+        "content": decode(tokens[offset:end]),
+        "cursor": _format_cursor(key, end) if remaining else None,
+        "remaining_tokens": remaining,
+        "debug": [f"Returned tokens {offset}-{end} of {len(tokens)}"],
+    }
@@ -1,11 +1,37 @@
+import threading
+
 from rag.util.api.authenticate import _get_key
 from util.clients.gov_client import GPOClient, CDGClient
+from util.clients.response_cache import get_response_cache
 
 def _get_cdg_client():
     congress_key = _get_key("CONGRESS_API_KEY")
-    cdg_client = CDGClient(api_key=congress_key, response_format="xml")
+    cdg_client = CDGClient(api_key=congress_key, response_format="xml", cache=get_response_cache())
     return cdg_client
 
 def _get_gpo_client():
     gpo_key = _get_key("GPO_API_KEY")
-    gpo_client = GPOClient(api_key=gpo_key)
\ No newline at end of file
+    gpo_client = GPOClient(api_key=gpo_key, cache=get_response_cache())
+    return gpo_client
+
+
+class LazyClient:
+    """
+    Stands in for the client `factory` returns, built (and its API key read) on first use
+    instead of when the module defining it is imported.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
@@ -8,6 +8,10 @@ from urllib.parse import urljoin
 
 import requests
 
+from util.metrics import record_upstream_call
+from util.clients.response_cache import request_key
+from util.parse.records import loads_json
+
 
 API_VERSION = "v3"
 ROOT_URL_CONGRESS = "https://api.congress.gov/"
@@ -23,16 +27,28 @@ class _MethodWrapper:
     def __init__(self, parent, http_method):
         self._parent = parent
         self._method = getattr(parent._session, http_method)
+        # Only idempotent reads are served from the response cache
+        self._cache = parent.cache if http_method == "get" else None
 
     def __call__(self, endpoint, *args, **kwargs):  # full signature passed here
-        response = self._method(
-            urljoin(self._parent.base_url, endpoint), *args, **kwargs
-        )
+        url = urljoin(self._parent.base_url, endpoint)
+        key = request_key(url, kwargs.get("params")) if self._cache is not None and not args else None
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        record_upstream_call(url)
+        response = self._method(url, *args, **kwargs)
         # unpack
         if response.headers.get("content-type", "").startswith("application/json"):
-            return response.json(), response.status_code
+            # orjson when installed, parsing straight from the bytes
+            result = loads_json(response.content), response.status_code
         else:
-            return response.content, response.status_code
+            result = response.content, response.status_code
+        if key is not None and response.status_code == 200:
+            self._cache.set(key, result)
+        return result
 
 
 class CDGClient:
@@ -44,8 +60,10 @@ class CDGClient:
         api_version=API_VERSION,
         response_format=RESPONSE_FORMAT,
         raise_on_error=True,
+        cache=None,
     ):
         self.base_url = urljoin(ROOT_URL_CONGRESS, api_version) + "/"
+        self.cache = cache
         self._session = requests.Session()
 
         # do not use url parameters, even if offered, use headers
@@ -65,9 +83,10 @@ class CDGClient:
     
 class GPOClient:
 
-    def __init__(self, api_key, api_version=API_VERSION, response_format=RESPONSE_FORMAT, raise_on_error=True):
+    def __init__(self, api_key, api_version=API_VERSION, response_format=RESPONSE_FORMAT, raise_on_error=True, cache=None):
         
         self.base_url = urljoin(ROOT_URL_GPO, api_version) + "/"
+        self.cache = cache
         self._session = requests.Session()
 
         self._session.params = {"offset": 0, "pageSize": 500, "api_key": api_key}
@@ -0,0 +1,77 @@
+"""
+In-memory TTL cache of upstream API responses shared by all tools, so repeated requests
+for the same bill (by different agents, or warmed by prefetchBillDossier) hit the
+Congress.gov/GovInfo APIs only once.
+
+CONGRESS_CACHE_TTL sets the lifetime in seconds (0 disables caching),
+CONGRESS_CACHE_MAX_ENTRIES the size (least recently used entries are dropped first).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache"""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Global cache instance
+_global_cache = None
+_global_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    global _global_cache
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = ResponseCache(
+                ttl=float(os.getenv("CONGRESS_CACHE_TTL", "3600")),
+                max_entries=int(os.getenv("CONGRESS_CACHE_MAX_ENTRIES", "4096")),
+            )
+    return _global_cache
+
+
+def request_key(url: str, params: Optional[dict] = None) -> tuple:
+    """Cache key of a GET request (params are snapshotted, callers mutate them between pages)"""
+    return (url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
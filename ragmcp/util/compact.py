@@ -0,0 +1,69 @@
+"""
+Compact tool responses, to cut the tokens the LLM reads per call.
+
+With TOOL_COMPACT_RESPONSES=1 responses are sent as minified JSON without null fields,
+and the `debug` list is dropped unless TOOL_RESPONSE_DEBUG=1 or the response has nothing
+else to say (then the debug messages are the only explanation for the agent).
+TOOL_COLUMNAR_LISTS=1 additionally sends long lists of records (members, cosponsors, ...)
+as {"columns": [...], "rows": [[...], ...]} instead of repeating every key per record.
+"""
+
+import os
+from typing import Any, Optional
+
+import orjson
+
+DEBUG_KEY = "debug"
+# Shorter lists of records are cheaper to read with their keys
+COLUMNAR_MIN_ROWS = 5
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").lower() in ("1", "true", "yes")
+
+
+def compact_mode_enabled() -> bool:
+    return _env_flag("TOOL_COMPACT_RESPONSES")
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == [] or value == {} or value == ""
+
+
+def _to_columns(records: list) -> dict:
+    columns = []
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+    return {"columns": columns, "rows": [[record.get(key) for key in columns] for record in records]}
+
+
+def _strip(value: Any, columnar: bool) -> Any:
+    if isinstance(value, dict):
+        return {key: _strip(item, columnar) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        items = [_strip(item, columnar) for item in value]
+        if columnar and len(items) >= COLUMNAR_MIN_ROWS and all(isinstance(item, dict) for item in items):
+            return _to_columns(items)
+        return items
+    return value
+
+
+def compact_response(result: Any, keep_debug: Optional[bool] = None, columnar: Optional[bool] = None) -> Any:
+    """Result without null fields and (unless needed or requested) without its debug list"""
+    keep_debug = _env_flag("TOOL_RESPONSE_DEBUG") if keep_debug is None else keep_debug
+    columnar = _env_flag("TOOL_COLUMNAR_LISTS") if columnar is None else columnar
+
+    if isinstance(result, dict) and DEBUG_KEY in result and not keep_debug:
+        content = {key: value for key, value in result.items() if key != DEBUG_KEY}
+        if any(not _is_empty(value) for value in content.values()):
+            result = content
+    return _strip(result, columnar)
+
+
+def dumps_compact(result: Any) -> str:
+    """Minified JSON text of a tool result"""
+    if isinstance(result, str):
+        return result
+    return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
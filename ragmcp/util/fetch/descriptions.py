@@ -1,13 +1,20 @@
 import os
 import json
+from functools import lru_cache
 
 local_path = os.path.dirname(os.path.abspath(__file__))
 
-def _get_description_for_function(function_name: str) -> str:
+# Read once: every tool decorator asks for its description at import
+@lru_cache(maxsize=None)
+def _get_all_descriptions() -> dict:
 
     path = f'{local_path}/../../data/descriptions/mcp_descriptions.json'
 
     with open(path, 'r') as f:
         descriptions = json.load(f)
 
-    return descriptions.get(function_name, "")
\ No newline at end of file
+    return descriptions
+
+def _get_description_for_function(function_name: str) -> str:
+
+    return _get_all_descriptions().get(function_name, "")
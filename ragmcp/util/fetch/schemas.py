@@ -0,0 +1,114 @@
+import inspect
+import re
+
+from util.fetch.descriptions import _get_all_descriptions
+
+# Every tool takes a loosely typed `congress_index: dict`, so the JSON schema generated from
+# the signature alone is just {"type": "object"}. The fields below are what the Congress API
+# path templates need; the example in each tool's description tells us which ones apply.
+
+BILL_TYPES = ["hr", "s", "hjres", "sjres", "hconres", "sconres", "hres", "sres"]
+AMENDMENT_TYPES = ["hamdt", "samdt", "suamdt"]
+
+CONGRESS_INDEX_FIELDS = {
+    "congress": {"type": "integer", "minimum": 1, "description": "Congress number, e.g. 117"},
+    "bill_type": {"type": "string", "enum": BILL_TYPES, "description": "Lowercase bill type"},
+    "bill_number": {"type": "integer", "minimum": 1, "description": "Bill number, e.g. 2307"},
+    "amendment_type": {"type": "string", "enum": AMENDMENT_TYPES, "description": "Lowercase amendment type"},
+    "amdt_number": {"type": "string", "pattern": r"^\d+$", "description": "Amendment number, e.g. '2137'"},
+    "number": {"type": "string", "pattern": r"^\d+$", "description": "Amendment number, e.g. '2137'"},
+    "submittedDate": {"type": "string", "description": "Submission date of the amendment, e.g. '2020-06-08T04:00:00Z'"},
+    "chamber": {"type": "string", "enum": ["house", "senate"]},
+    "eventid": {"type": "string", "description": "Committee meeting event id, e.g. '117-468'"},
+    "reportType": {"type": "string", "enum": ["hrpt", "srpt", "erpt"]},
+    "reportNumber": {"type": "integer", "minimum": 1},
+}
+
+PARAMETER_FIELDS = {
+    "lobby_view_bill_id": {"type": "string", "pattern": r"^(s|hr|sconres|hconres|hjres|sjres)\d{1,5}-\d{3}$", "description": "LobbyView bill id, e.g. 's3688-116'"},
+    "company_name": {"type": "string", "description": "Name of the company under investigation, e.g. 'Exxon Mobil'"},
+    "committee_name": {"type": "string", "description": "Formal committee name, e.g. 'House Committee on Energy and Commerce'"},
+    "bioguideId": {"type": "string", "pattern": r"^[A-Z]\d{6}$", "description": "Bioguide id, e.g. 'L000174'"},
+    "bioguideIds": {"type": "array", "items": {"type": "string", "pattern": r"^[A-Z]\d{6}$"}, "description": "Bioguide ids, e.g. ['L000174', 'S000033']"},
+    "names_only": {"type": "boolean", "description": "Only names are needed (answered from the committee rosters without API calls where possible)"},
+    "stateCode": {"type": "string", "pattern": r"^[A-Z]{2}$", "description": "Two-letter U.S. state code, e.g. 'TX'"},
+    "current_only": {"type": "boolean", "description": "Only members currently serving"},
+    "cursor": {"type": "string", "description": "Cursor from a truncation marker or a previous fetchMore, e.g. 'ab12cd34ef56.0'"},
+    "max_tokens": {"type": "integer", "minimum": 0, "description": "Page size in tokens (0 for the default budget)"},
+    "sql": {"type": "string", "description": "One read-only SQLite SELECT, with ? placeholders for values"},
+    "parameters": {"type": "array", "items": {"type": ["string", "integer", "number", "null"]}, "description": "Values for the ? placeholders, in order"},
+    "max_rows": {"type": "integer", "minimum": 0, "description": "Row limit (0 for the default of 200)"},
+}
+
+ANNOTATION_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", dict: "object", list: "array"}
+
+
+def _example_keys(description: str) -> list[str]:
+    """
+    Keys of the first {...} example in a tool description that has any (handles non-JSON
+    examples like {'congress': int} and skips path templates like {congress}).
+    """
+    depth, start = 0, None
+    for i, c in enumerate(description):
+        if c == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif c == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                keys = re.findall(r"['\"](\w+)['\"]\s*:", description[start:i + 1])
+                if keys:
+                    return keys
+    return []
+
+
+def _congress_index_schema(description: str) -> dict:
+    keys = [k for k in _example_keys(description) if k in CONGRESS_INDEX_FIELDS]
+    if not keys:
+        return {"type": "object", "description": "Congress API index"}
+    return {
+        "type": "object",
+        "properties": {k: CONGRESS_INDEX_FIELDS[k] for k in keys},
+        "required": keys,
+        "additionalProperties": False,
+        "description": "Congress API index",
+    }
+
+
+def build_input_schema(fn, description: str) -> dict:
+    """JSON schema for a tool function built from its signature and its description example"""
+    properties = {}
+    required = []
+    for name, param in inspect.signature(fn).parameters.items():
+        if name == "self":
+            continue
+        if name == "congress_index":
+            prop = _congress_index_schema(description)
+        elif name in PARAMETER_FIELDS:
+            prop = dict(PARAMETER_FIELDS[name])
+        else:
+            prop = {"type": ANNOTATION_TYPES.get(param.annotation, "string")}
+        properties[name] = prop
+        if param.default is inspect.Parameter.empty:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def build_tool_schemas(tool_functions: dict) -> dict:
+    """Builds {tool name: input schema} once for a {tool name: function} mapping"""
+    descriptions = _get_all_descriptions()
+    return {name: build_input_schema(fn, descriptions.get(name, "")) for name, fn in tool_functions.items()}
+
+
+def call_tool_with_arguments(fn, arguments: dict):
+    """
+    Calls a tool function with MCP call arguments. Arguments matching the signature are
+    passed as keywords; anything else falls back to passing the whole dict as the first
+    argument (the tools unwrap nested congress_index payloads themselves).
+    """
+    arguments = arguments or {}
+    params = [p for p in inspect.signature(fn).parameters if p != "self"]
+    if arguments and set(arguments) <= set(params):
+        return fn(**arguments)
+    return fn(arguments)
@@ -0,0 +1,141 @@
+"""
+Cache of Congress member profiles (bioguide id -> name, party, state, district, chamber,
+congresses served) for getCongressMembersBatch.
+
+Names and committee seats of every member in the committee YAML rosters are known up front
+(loaded on first use); full profiles are fetched from Congress.gov on demand, concurrently
+for a batch, and kept for MEMBER_CACHE_TTL seconds.
+"""
+
+import contextvars
+import glob
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from util.parse.committee import _load_committee_roster
+
+local_path = os.path.dirname(os.path.abspath(__file__))
+
+MEMBER_FETCH_WORKERS = int(os.getenv("MEMBER_FETCH_WORKERS", "8"))
+MEMBER_CACHE_TTL = float(os.getenv("MEMBER_CACHE_TTL", "86400"))
+# Largest batch getCongressMembersBatch accepts
+MAX_BATCH_SIZE = 250
+
+BIOGUIDE_PATTERN = re.compile(r"^[A-Z]\d{6}$")
+_CHAMBERS = {"h": "House of Representatives", "s": "Senate", "j": "Joint"}
+
+
+class MemberCache:
+    """Thread-safe bioguide id -> profile cache with roster names as a fallback"""
+
+    def __init__(self, fetch_profile: Callable[[str], dict], ttl: float = MEMBER_CACHE_TTL,
+                 max_workers: int = MEMBER_FETCH_WORKERS):
+        self.fetch_profile = fetch_profile
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._profiles: Dict[str, tuple] = {}
+        self._roster: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def roster(self) -> Dict[str, dict]:
+        """{bioguide id: {"fullName", "committees": [{committee_id, congress, chamber, rank, title}]}}"""
+        with self._lock:
+            if self._roster is None:
+                self._roster = self._load_rosters()
+            return self._roster
+
+    @staticmethod
+    def _load_rosters() -> Dict[str, dict]:
+        roster: Dict[str, dict] = {}
+        paths = glob.glob(os.path.join(local_path, "../data/committees/committees_[0-9]*.yaml"))
+        for congress in sorted(int(re.search(r"_(\d+)\.yaml$", path).group(1)) for path in paths):
+            for committee_id, members in _load_committee_roster(congress).items():
+                for seat in members or []:
+                    bioguide_id = seat.get("bioguide")
+                    if not bioguide_id:
+                        continue
+                    entry = roster.setdefault(bioguide_id, {"fullName": seat.get("name"), "committees": []})
+                    entry["fullName"] = seat.get("name") or entry["fullName"]  # latest congress wins
+                    entry["committees"].append({
+                        "committee_id": committee_id,
+                        "congress": congress,
+                        "chamber": _CHAMBERS.get(committee_id[:1]),
+                        "rank": seat.get("rank"),
+                        "title": seat.get("title"),
+                    })
+        return roster
+
+    def warm(self) -> None:
+        """Loads the rosters in a background thread so the first batch doesn't wait for them"""
+        threading.Thread(target=self.roster, name="member-roster", daemon=True).start()
+
+    def _cached(self, bioguide_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._profiles.get(bioguide_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def _store(self, bioguide_id: str, profile: dict) -> None:
+        with self._lock:
+            self._profiles[bioguide_id] = (time.monotonic() + self.ttl, profile)
+
+    def get_many(self, bioguide_ids: Iterable[str], names_only: bool = False) -> Dict[str, dict]:
+        """
+        Profiles of all ids (in request order). Misses are fetched concurrently; a failed
+        fetch falls back to the roster name with "partial": True. With names_only, roster
+        names are enough and nothing is fetched for members found in a roster.
+        """
+        ids = list(dict.fromkeys(bioguide_ids))
+        roster = self.roster()
+        results: Dict[str, dict] = {}
+        misses: List[str] = []
+        for bioguide_id in ids:
+            cached = self._cached(bioguide_id)
+            if cached is not None:
+                results[bioguide_id] = cached
+            elif names_only and bioguide_id in roster:
+                results[bioguide_id] = {"bioguideId": bioguide_id, "fullName": roster[bioguide_id]["fullName"]}
+            else:
+                misses.append(bioguide_id)
+
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(misses))) as executor:
+                # Each fetch runs in a copy of the caller's context (metrics and trace attribution)
+                futures = {bioguide_id: executor.submit(contextvars.copy_context().run, self._fetch, bioguide_id)
+                           for bioguide_id in misses}
+                for bioguide_id, future in futures.items():
+                    results[bioguide_id] = future.result()
+        return {bioguide_id: results[bioguide_id] for bioguide_id in ids}
+
+    def _fetch(self, bioguide_id: str) -> dict:
+        try:
+            profile = self.fetch_profile(bioguide_id)
+        except Exception as e:
+            roster_entry = self.roster().get(bioguide_id)
+            if roster_entry is None:
+                return {"bioguideId": bioguide_id, "error": str(e)}
+            return {"bioguideId": bioguide_id, "fullName": roster_entry["fullName"], "partial": True, "error": str(e)}
+        self._store(bioguide_id, profile)
+        return profile
+
+    def committees(self, bioguide_id: str, congress: Optional[int] = None) -> List[dict]:
+        seats = self.roster().get(bioguide_id, {}).get("committees", [])
+        return [seat for seat in seats if congress is None or seat["congress"] == congress]
+
+
+# Global cache instance
+_global_member_cache = None
+_global_member_cache_lock = threading.Lock()
+
+
+def get_member_cache(fetch_profile: Callable[[str], dict]) -> MemberCache:
+    global _global_member_cache
+    with _global_member_cache_lock:
+        if _global_member_cache is None:
+            _global_member_cache = MemberCache(fetch_profile)
+    return _global_member_cache
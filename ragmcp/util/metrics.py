@@ -0,0 +1,178 @@
+"""
+Per-tool metrics for the MCP server: call count, latency, errors, upstream API calls and
+response size (bytes and LLM tokens), rendered in the Prometheus text format on /metrics.
+
+Tools opt in with the `@tool_metrics` decorator (below `@mcp.tool(...)`); HTTP clients
+report each request with `record_upstream_call(url)`, which is attributed to the tool
+currently running.
+"""
+
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from util.budget import count_tokens, response_size, serialize_response
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+TOKENS_BUCKETS = (100, 500, 1000, 2000, 5000, 10000, 50000, 100000)
+
+# Name of the tool whose call is running in this context (tool functions run in worker
+# threads that copy the caller's context, so a ContextVar follows them into the HTTP clients)
+_current_tool: ContextVar[Optional[str]] = ContextVar("current_tool", default=None)
+
+
+class _Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class _ToolStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.upstream: Dict[str, int] = {}
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.response_bytes = _Histogram(BYTES_BUCKETS)
+        self.response_tokens = _Histogram(TOKENS_BUCKETS)
+
+
+class ToolMetricsRegistry:
+    """Thread-safe store of per-tool statistics"""
+
+    def __init__(self):
+        self._tools: Dict[str, _ToolStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, tool: str) -> _ToolStats:
+        stats = self._tools.get(tool)
+        if stats is None:
+            stats = self._tools[tool] = _ToolStats()
+        return stats
+
+    def observe_call(self, tool: str, seconds: float, error: bool,
+                     response_bytes: Optional[int] = None, response_tokens: Optional[int] = None) -> None:
+        with self._lock:
+            stats = self._stats(tool)
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.latency.observe(seconds)
+            if response_bytes is not None:
+                stats.response_bytes.observe(response_bytes)
+            if response_tokens is not None:
+                stats.response_tokens.observe(response_tokens)
+
+    def observe_upstream(self, tool: str, upstream: str) -> None:
+        with self._lock:
+            upstream_counts = self._stats(tool).upstream
+            upstream_counts[upstream] = upstream_counts.get(upstream, 0) + 1
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            tools = sorted(self._tools.items())
+            sections = [
+                ("mcp_tool_calls_total", "counter", "Tool calls",
+                 lambda tool, s: [f'mcp_tool_calls_total{{tool="{tool}"}} {s.calls}']),
+                ("mcp_tool_errors_total", "counter", "Tool calls that raised",
+                 lambda tool, s: [f'mcp_tool_errors_total{{tool="{tool}"}} {s.errors}']),
+                ("mcp_tool_upstream_calls_total", "counter", "HTTP requests to upstream APIs made by tool calls",
+                 lambda tool, s: [f'mcp_tool_upstream_calls_total{{tool="{tool}",upstream="{host}"}} {count}'
+                                  for host, count in sorted(s.upstream.items())]),
+                ("mcp_tool_latency_seconds", "histogram", "Tool call latency",
+                 lambda tool, s: s.latency.render("mcp_tool_latency_seconds", f'tool="{tool}"')),
+                ("mcp_tool_response_bytes", "histogram", "Serialized tool response size",
+                 lambda tool, s: s.response_bytes.render("mcp_tool_response_bytes", f'tool="{tool}"')),
+                ("mcp_tool_response_tokens", "histogram", "Tool response size in LLM tokens (cl100k_base)",
+                 lambda tool, s: s.response_tokens.render("mcp_tool_response_tokens", f'tool="{tool}"')),
+            ]
+            lines = []
+            for name, kind, help_text, render in sections:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for tool, stats in tools:
+                    lines.extend(render(tool, stats))
+        return "\n".join(lines) + "\n"
+
+
+# Global registry instance
+_global_registry = ToolMetricsRegistry()
+
+
+def get_metrics_registry() -> ToolMetricsRegistry:
+    return _global_registry
+
+
+def record_upstream_call(url: str) -> None:
+    """Attributes one upstream HTTP request to the running tool (no-op outside tool calls)"""
+    tool = _current_tool.get()
+    if tool is not None:
+        _global_registry.observe_upstream(tool, urlparse(url).netloc or url)
+
+
+def tool_metrics(fn):
+    """Decorator recording metrics for every call of a tool function"""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current_tool.set(fn.__name__)
+        size_token = response_size.set(None)
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            # Measured by @token_budget when the tool has one
+            measured = response_size.get()
+        except Exception:
+            _global_registry.observe_call(fn.__name__, time.perf_counter() - start, error=True)
+            raise
+        finally:
+            response_size.reset(size_token)
+            _current_tool.reset(token)
+
+        elapsed = time.perf_counter() - start
+        if measured is not None:
+            response_bytes, response_tokens = measured
+        else:
+            text = serialize_response(result)
+            response_bytes = len(text.encode("utf-8"))
+            try:
+                response_tokens = count_tokens(text)
+            except Exception:
+                response_tokens = None
+        _global_registry.observe_call(fn.__name__, elapsed, error=False,
+                                      response_bytes=response_bytes, response_tokens=response_tokens)
+        return result
+
+    return wrapper
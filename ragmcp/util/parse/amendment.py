@@ -1,9 +1,9 @@
 import re
 from typing import Dict, Optional
 
-from util.clients.client import _get_gpo_client 
+from util.clients.client import LazyClient, _get_gpo_client
 
-gpo_client = _get_gpo_client()
+gpo_client = LazyClient(_get_gpo_client)
 
 # Given an amendment index, we can use this functions to try to find the full text of the amendment
 # in a Congressional Record
@@ -1,7 +1,23 @@
 import yaml, re, os
+from functools import lru_cache
 
 local_path = os.path.dirname(os.path.abspath(__file__))
 
+# The C loader parses the roster files several times faster when libyaml is available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _committee_roster_path(congress: int) -> str:
+    return os.path.join(local_path, f"../../data/committees/committees_{congress}.yaml")
+
+
+@lru_cache(maxsize=None)
+def _load_committee_roster(congress: int) -> dict:
+    """{committee_id: [member, ...]} of a congress, parsed once per process (treat as read-only)"""
+    with open(_committee_roster_path(congress), "r") as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+
 def _get_committee_code(name: str) -> dict:
     debug_messages = []
     path = os.path.join(local_path, "../../data/committees/committees_standing.yaml")
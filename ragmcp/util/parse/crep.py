@@ -1,17 +1,17 @@
 from util.parse.text_parse import __extract_text_from_html_url
 
 # Extracts all the unique raw text URLs (.htm) that correspond to the endpoint where we can find the
-# text of a committee report
-def _parse_committee_report_text_links(text_items):
+# text of a committee report, from its specs.COMMITTEE_REPORT_TEXT_FORMATS records
+def _parse_committee_report_text_links(text_formats):
 
     seen_htm = set()
     parsed = []
 
-    for item in text_items:
+    for item in text_formats:
 
-        url = (item.findtext('url') or '').strip()
-        type = (item.findtext('type') or '').strip()
-        is_errata = (item.findtext('isErrata') or '').strip().lower() in ('y', 'true')
+        url = item['url']
+        type = item['type']
+        is_errata = item['isErrata']
 
         if url.endswith('.pdf'):
             continue
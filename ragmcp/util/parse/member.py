@@ -0,0 +1,33 @@
+from typing import Optional
+
+from util.parse import specs
+
+
+def member_profile(member: Optional[dict]) -> dict:
+    """Profile of a specs.MEMBER record: current party, latest term and the congresses served"""
+    member = member or {}
+    first, last = member.get("firstName"), member.get("lastName")
+    full_name = member.get("directOrderName") or (f"{first} {last}" if first and last else None)
+
+    terms = member.get("terms") or []
+    latest = max(terms, key=lambda t: t["congress"] or 0) if terms else {}
+    # The party of the latest partyHistory entry (the history is oldest first when years are missing)
+    parties = member.get("parties") or []
+    current = max(enumerate(parties), key=lambda p: (p[1]["startYear"] or 0, p[0]))[1] if parties else {}
+
+    return {
+        "bioguideId": member.get("bioguideId"),
+        "fullName": full_name,
+        "party": current.get("partyName"),
+        "state": member.get("state"),
+        "stateCode": latest.get("stateCode"),
+        "district": latest.get("district"),
+        "chamber": latest.get("chamber"),
+        "currentMember": bool(member.get("currentMember")),
+        "congressesServed": sorted({t["congress"] for t in terms if t["congress"]}),
+    }
+
+
+# Parses a Congress.gov member/{bioguideId} response into a profile
+def _parse_member_profile(root) -> dict:
+    return member_profile(specs.MEMBER.extract(root))
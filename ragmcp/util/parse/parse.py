@@ -1,11 +1,68 @@
-from util.clients.client import _get_cdg_client
+from util.clients.client import LazyClient, _get_cdg_client
+from util.tracing import get_tracer
+from util.parse.records import parse_xml
+from util.clients.response_cache import request_key
+from util.singleflight import SingleFlight
 
-import xml.etree.ElementTree as ET
 from typing import Any
 import ast
+import os
 
-parse_xml = lambda x: ET.fromstring(x)
-cdg_client = _get_cdg_client()
+# Built on the first request, so importing the tools doesn't need the API key
+cdg_client = LazyClient(_get_cdg_client)
+
+# Endpoints whose responses are only read through record specs (util/parse/specs.py), so they
+# can be fetched as JSON instead of XML with the same tool output
+JSON_CAPABLE_ENDPOINTS = {
+    "bill_sponsors": "bill/{congress}/{bill_type}/{bill_number}",
+    "bill_actions": "bill/{congress}/{bill_type}/{bill_number}/actions",
+    "bill_amendments": "bill/{congress}/{bill_type}/{bill_number}/amendments",
+    "bill_committees": "bill/{congress}/{bill_type}/{bill_number}/committees",
+    "bill_cosponsors": "bill/{congress}/{bill_type}/{bill_number}/cosponsors",
+    "bill_summaries": "bill/{congress}/{bill_type}/{bill_number}/summaries",
+    "amendment_actions": "amendment/{congress}/{amendment_type}/{amdt_number}/actions",
+    "amendment_cosponsors": "amendment/{congress}/{amendment_type}/{number}/cosponsors",
+}
+
+
+def _json_path_templates(setting: str) -> frozenset:
+    """Path templates of CONGRESS_JSON_ENDPOINTS ('all' or comma-separated JSON_CAPABLE_ENDPOINTS names)"""
+    names = [name.strip() for name in setting.split(",") if name.strip()]
+    if names == ["all"]:
+        names = list(JSON_CAPABLE_ENDPOINTS)
+    unknown = [name for name in names if name not in JSON_CAPABLE_ENDPOINTS]
+    if unknown:
+        raise ValueError(f"CONGRESS_JSON_ENDPOINTS: unknown endpoints {unknown}, choose from {list(JSON_CAPABLE_ENDPOINTS)}")
+    return frozenset(JSON_CAPABLE_ENDPOINTS[name] for name in names)
+
+
+# Every endpoint stays on XML by default; an endpoint is only listed here (and in the default) once its
+# recorded JSON response gives the same records as its XML (tests/test_record_specs.py)
+JSON_PATH_TEMPLATES = _json_path_templates(os.getenv("CONGRESS_JSON_ENDPOINTS", ""))
+
+
+# Concurrent requests for the same page share one upstream call (responses are only read)
+_upstream_flights = SingleFlight()
+
+
+# Raw response of a Congress.gov path, for callers that stream it (util.parse.records.parse_page):
+# XML bytes, or the parsed response of a JSON endpoint
+def _call_api(congress_index: dict, path_template: str, params: dict = None):
+    path = path_template.format(**congress_index)
+    params = dict(params or {})
+    if path_template in JSON_PATH_TEMPLATES:
+        params["format"] = "json"
+
+    def _get():
+        with get_tracer().start_as_current_span(
+            "congress_api.get",
+            attributes={"http.path_template": path_template, "http.path": path, "page.offset": params.get("offset", 0)},
+        ):
+            data, _ = cdg_client.get(endpoint=path, params=params)
+        return data
+
+    data, _ = _upstream_flights.do(request_key(path, params), _get)
+    return data
 
 
 # Takes a congress index and a path template that is 
@@ -21,9 +78,8 @@ def _call_and_parse(congress_index: dict, path_template: str, params={}, multipl
 
         params["offset"] = offset
         try:
-            path = path_template.format(**congress_index)
-            data, _ = cdg_client.get(endpoint=path, params=params)
-            root = parse_xml(data)
+            data = _call_api(congress_index, path_template, params)
+            root = data if isinstance(data, dict) else parse_xml(data)
 
             if not multiple_pages:
                 return root
@@ -72,4 +128,12 @@ def _parse_congress_index_from_args(args: Any) -> dict | None:
             # Recursively call with the value of the wrapper key
             return _parse_congress_index_from_args(args[key])
 
-    return None
\ No newline at end of file
+    return None
+
+
+def _normalize_congress_index(args: Any) -> Any:
+    """Canonical congress_index for request keys: parsed, with string values ('118' == 118, 'HR' == 'hr')"""
+    congress_index = _parse_congress_index_from_args(args)
+    if congress_index is None:
+        return args
+    return {str(k): str(v).strip().lower() for k, v in congress_index.items()}
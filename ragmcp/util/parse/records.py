@@ -0,0 +1,321 @@
+"""
+Declarative record extraction from Congress.gov (and clerk/senate vote) XML and JSON.
+
+A RecordSpec names the item elements of a response and, for every output key, where its
+value is below an item:
+
+    SPONSORS = RecordSpec(".//sponsors/item", {
+        "bioguide_id": "bioguideId",
+        "is_by_request": Field("isByRequest", equals("Y")),
+        "member_id": "legislator/@name-id",
+    })
+    SPONSORS.extract(root)  ->  [{"bioguide_id": ..., "is_by_request": ..., "member_id": ...}]
+
+Paths are compiled once. Plain child paths ("bioguideId", "sourceSystem/code") become one
+findtext each (ElementTree answers those in C, faster than any Python-level walk over the
+children); other paths go through ElementPath, or compiled XPath when the tree is an lxml
+one, and are evaluated once per field rather than once per use. lxml is optional: when it is
+installed `parse_xml` returns lxml trees (XML_PARSER=etree keeps the standard library
+parser), which support the same find/findall/findtext API.
+
+`parse_page` streams pages of at least STREAM_MIN_BYTES with iterparse, extracting and
+dropping each item as soon as it is complete, so a large paginated page never exists as a
+full tree. Smaller pages are parsed whole, which is faster.
+
+The same specs read Congress.gov JSON responses (pass the parsed object instead of a tree).
+"item" steps are array elements there, an item path "container/element" ("amendments/
+amendment") is the "container" array, and scalars become the text the XML response has for
+them (true -> "True", 117 -> "117"), so records are identical in both formats. Where a JSON
+key differs from the XML path, the spec names it with json=. `loads_json` uses orjson, which
+parses straight from the response bytes, when it is installed.
+"""
+
+import io
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+USE_LXML = lxml_etree is not None and os.getenv("XML_PARSER", "lxml").lower() != "etree"
+
+# Responses are data, never documents with external entities
+_LXML_PARSER = lxml_etree.XMLParser(resolve_entities=False, no_network=True) if lxml_etree is not None else None
+
+_CHILD_PATH = re.compile(r"^[A-Za-z_][\w.-]*(/[A-Za-z_][\w.-]*)*$")
+
+# Below this size a whole tree is cheaper than iterparse events
+STREAM_MIN_BYTES = int(os.getenv("XML_STREAM_MIN_BYTES", str(1024 * 1024)))
+
+
+def parse_xml(data: bytes):
+    return lxml_etree.fromstring(data, parser=_LXML_PARSER) if USE_LXML else ET.fromstring(data)
+
+
+def loads_json(data: Union[bytes, str]):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _json_path(path: str, items: bool = False) -> Tuple[bool, Tuple[str, ...]]:
+    """(search all descendants for the first key, keys) of a spec path in a JSON response"""
+    steps = [step for step in path.lstrip("./").split("/") if step and step != "item"]
+    # <amendments><amendment>, <summaries><summary>: the element is the container array's element
+    if items and len(steps) >= 2 and steps[-2] in (steps[-1] + "s", steps[-1][:-1] + "ies"):
+        steps.pop()
+    return path.startswith(".//"), tuple(steps)
+
+
+def _json_find(node, key: str):
+    """Value of the first `key` below `node`, in document order"""
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+    for child in children:
+        found = _json_find(child, key)
+        if found is not None:
+            return found
+    return None
+
+
+def _json_get(node, path: Tuple[bool, Tuple[str, ...]]):
+    descendant, keys = path
+    for i, key in enumerate(keys):
+        if isinstance(node, list):
+            node = node[0] if node else None
+        if descendant and i == 0:
+            node = _json_find(node, key)
+        elif isinstance(node, dict):
+            node = node.get(key)
+        else:
+            return None
+        if node is None:
+            return None
+    return node
+
+
+def _json_text(value) -> Optional[str]:
+    """The XML text of a JSON value"""
+    if isinstance(value, list):
+        return _json_text(value[0]) if value else ""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, dict):
+        return ""
+    return str(value)
+
+
+def _iterparse(data: bytes):
+    if USE_LXML:
+        return lxml_etree.iterparse(io.BytesIO(data), events=("start", "end"), resolve_entities=False, no_network=True)
+    return ET.iterparse(io.BytesIO(data), events=("start", "end"))
+
+
+def _is_lxml(element) -> bool:
+    return lxml_etree is not None and isinstance(element, lxml_etree._Element)
+
+
+# Converters receive the text (None when the element is missing)
+
+def stripped(text: Optional[str]) -> Optional[str]:
+    return text.strip() if text else None
+
+
+def optional_int(text: Optional[str]) -> Optional[int]:
+    return int(text) if text and text.strip() else None
+
+
+def equals(value: str) -> Callable[[Optional[str]], bool]:
+    return lambda text: text == value
+
+
+def default(value: str) -> Callable[[Optional[str]], str]:
+    return lambda text: value if text is None else text
+
+
+class Field:
+    """
+    The text at `path` below an item ('path/@name' for an attribute), passed through
+    `convert`. An optional field is left out of the record when its element is missing.
+    `json` is the key path in a JSON response when it isn't the XML path without items.
+    """
+
+    __slots__ = ("path", "convert", "optional", "plain", "_attribute", "_element_path", "_xpath", "_json")
+
+    def __init__(self, path: str, convert: Optional[Callable[[Optional[str]], Any]] = None, optional: bool = False,
+                 json: Optional[str] = None):
+        self.path = path
+        self.convert = convert
+        self.optional = optional
+        # Attributes don't exist in JSON responses
+        self._json = _json_path(json or path) if json or "@" not in path else None
+
+        element_path, _, attribute = path.rpartition("@") if "@" in path else (path, "", "")
+        element_path = element_path.rstrip("/")
+        self._attribute = attribute or None
+        self._element_path = element_path or "."
+        # A plain child path of an element's text: one findtext
+        self.plain = attribute == "" and bool(_CHILD_PATH.match(element_path))
+        self._xpath = None
+        if lxml_etree is not None and not _CHILD_PATH.match(element_path) and element_path:
+            self._xpath = lxml_etree.XPath(element_path)
+
+    def _element(self, item):
+        if self._element_path == ".":
+            return item
+        if self._xpath is not None and _is_lxml(item):
+            nodes = self._xpath(item)
+            return nodes[0] if nodes else None
+        return item.find(self._element_path)
+
+    def text(self, item) -> Optional[str]:
+        """Like findtext: None when the element is missing, '' when it has no text"""
+        if self.plain:
+            return item.findtext(self._element_path)
+        node = self._element(item)
+        if node is None:
+            return None
+        if self._attribute:
+            return node.get(self._attribute)
+        return node.text or ""
+
+    def json_text(self, item: dict) -> Optional[str]:
+        return _json_text(_json_get(item, self._json)) if self._json is not None else None
+
+
+FieldSpec = Union[str, Field, "RecordSpec"]
+
+
+class RecordSpec:
+    """
+    Records of the `items` elements below an element: a list of dicts with one key per field,
+    or only the first one with first=True. A RecordSpec can be a field of another (nested
+    records, searched below the outer item); an optional one is left out when it finds nothing.
+    `json` is the key path of the items in a JSON response, when the default mapping misses it.
+    """
+
+    def __init__(self, items: str, fields: Dict[str, FieldSpec], first: bool = False, optional: bool = False,
+                 json: Optional[str] = None):
+        self.items = items
+        self.first = first
+        self.optional = optional
+        self.fields = {key: Field(spec) if isinstance(spec, str) else spec for key, spec in fields.items()}
+        # Only plain unconverted fields: records are a findtext per key
+        self._plain = None
+        if all(isinstance(spec, Field) and spec.plain and spec.convert is None and not spec.optional
+               for spec in self.fields.values()):
+            self._plain = tuple((key, spec._element_path) for key, spec in self.fields.items())
+        self._compiled = tuple((key, spec, spec._element_path if isinstance(spec, Field) and spec.plain else None)
+                               for key, spec in self.fields.items())
+        self._xpath = lxml_etree.XPath(items) if lxml_etree is not None else None
+        self._json = _json_path(json) if json else _json_path(items, items=True)
+        # Tags of the item path, matched against the element stack by parse_page
+        self._stream_tags = tuple(items.lstrip("./").split("/")) if _CHILD_PATH.match(items.lstrip("./")) else None
+
+    def _find(self, element) -> list:
+        if self._xpath is not None and _is_lxml(element):
+            return self._xpath(element)
+        return element.findall(self.items)
+
+    def record(self, item) -> dict:
+        if self._plain is not None:
+            return {key: item.findtext(path) for key, path in self._plain}
+        record = {}
+        for key, spec, plain_path in self._compiled:
+            if isinstance(spec, RecordSpec):
+                value = spec.extract(item)
+                if spec.optional and not value:
+                    continue
+            else:
+                text = item.findtext(plain_path) if plain_path is not None else spec.text(item)
+                if spec.optional and text is None:
+                    continue
+                value = spec.convert(text) if spec.convert is not None else text
+            record[key] = value
+        return record
+
+    def record_json(self, item: dict) -> dict:
+        record = {}
+        for key, spec, _ in self._compiled:
+            if isinstance(spec, RecordSpec):
+                value = spec.extract(item)
+                if spec.optional and not value:
+                    continue
+            else:
+                text = spec.json_text(item)
+                if spec.optional and text is None:
+                    continue
+                value = spec.convert(text) if spec.convert is not None else text
+            record[key] = value
+        return record
+
+    def _extract_json(self, document) -> Union[List[dict], Optional[dict]]:
+        items = _json_get(document, self._json)
+        if isinstance(items, dict):
+            items = [items]
+        items = [item for item in items or [] if isinstance(item, dict)]
+        if self.first:
+            return self.record_json(items[0]) if items else None
+        return [self.record_json(item) for item in items]
+
+    def extract(self, element) -> Union[List[dict], Optional[dict]]:
+        """Records below an XML element or in a parsed JSON response"""
+        if element is None:
+            return None if self.first else []
+        if isinstance(element, (dict, list)):
+            return self._extract_json(element)
+        if self.first:
+            items = self._find(element)
+            return self.record(items[0]) if items else None
+        return [self.record(item) for item in self._find(element)]
+
+
+def parse_page(data: Union[bytes, dict], spec: RecordSpec) -> Tuple[List[dict], Optional[int]]:
+    """
+    Records of one response page (XML, JSON or an already parsed JSON response) and its
+    pagination count (None when absent). Large XML pages are streamed: items are dropped from
+    the tree once extracted.
+    """
+    if isinstance(data, dict) or data[:1] == b"{":
+        document = data if isinstance(data, dict) else loads_json(data)
+        count = (document.get("pagination") or {}).get("count")
+        return spec.extract(document), int(count) if count is not None else None
+
+    if spec._stream_tags is None or len(data) < STREAM_MIN_BYTES:
+        root = parse_xml(data)
+        count = root.findtext(".//pagination/count")
+        return spec.extract(root), int(count) if count else None
+
+    depth = len(spec._stream_tags)
+    records, count, stack, tags = [], None, [], []
+    for event, element in _iterparse(data):
+        if event == "start":
+            stack.append(element)
+            tags.append(element.tag)
+            continue
+        if tuple(tags[-depth:]) == spec._stream_tags and (spec.items.startswith(".//") or len(tags) == depth + 1):
+            records.append(spec.record(element))
+            element.clear()
+            if len(stack) > 1:
+                stack[-2].remove(element)
+        elif tags[-2:] == ["pagination", "count"]:
+            count = int(element.text) if element.text and element.text.strip() else None
+        stack.pop()
+        tags.pop()
+    return records, count
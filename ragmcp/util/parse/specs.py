@@ -0,0 +1,209 @@
+from util.parse.records import Field, RecordSpec, default, equals, optional_int, stripped
+
+# Record specs of the tools in main.py, one per response shape (see util/parse/records.py).
+# The json= names are Congress.gov JSON keys that differ from the XML paths.
+
+BILL_SPONSORS = RecordSpec(".//sponsors/item", {
+    "bioguide_id": "bioguideId",
+    "full_name": "fullName",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "party": "party",
+    "state": "state",
+    "url": "url",
+    "middle_name": "middleName",
+    "district": "district",
+    "is_by_request": Field("isByRequest", equals("Y")),
+})
+
+BILL_COSPONSORS = RecordSpec(".//cosponsors/item", {
+    "bioguide_id": "bioguideId",
+    "full_name": "fullName",
+    "first_name": "firstName",
+    "last_name": "lastName",
+    "party": "party",
+    "state": "state",
+    "url": "url",
+    "district": "district",
+    "sponsorship_date": "sponsorshipDate",
+    "is_original_cosponsor": Field("isOriginalCosponsor", equals("True")),
+})
+
+BILL_SUMMARIES = RecordSpec(".//summaries/summary", {
+    "versionCode": "versionCode",
+    "actionDate": "actionDate",
+    "actionDesc": "actionDesc",
+    "updateDate": "updateDate",
+    # The summary text is inside <cdata><text>
+    "summary": Field(".//cdata/text", lambda text: text or None, json="text"),
+})
+
+BILL_ACTIONS = RecordSpec(".//actions/item", {
+    "date": "actionDate",
+    "text": "text",
+    "type": "type",
+})
+
+_COMMITTEE_ACTIVITIES = RecordSpec("./activities/item", {
+    "name": "name",
+    "date": "date",
+})
+
+BILL_COMMITTEES = RecordSpec(".//committees/item", {
+    "system_code": "systemCode",
+    "name": "name",
+    "chamber": "chamber",
+    "type": "type",
+    "subcommittees": RecordSpec("./subcommittees/item", {
+        "system_code": "systemCode",
+        "name": "name",
+    }),
+})
+
+BILL_COMMITTEE_ACTIONS = RecordSpec(".//committees/item", {
+    "system_code": "systemCode",
+    "name": "name",
+    "chamber": "chamber",
+    "type": "type",
+    "actions": _COMMITTEE_ACTIVITIES,
+    "subcommittees": RecordSpec("./subcommittees/item", {
+        "system_code": "systemCode",
+        "name": "name",
+        "actions": _COMMITTEE_ACTIVITIES,
+    }),
+})
+
+BILL_AMENDMENTS = RecordSpec(".//amendment", json=".//amendments", fields={
+    "number": Field("number", stripped),
+    "congress": Field("congress", optional_int),
+    "type": "type",
+    "updateDate": "updateDate",
+    "detailUrl": "url",
+})
+
+# Shaped into a profile by util/parse/member.py (getCongressMember, getCongressMembersBatch)
+MEMBER = RecordSpec(".//member", {
+    "bioguideId": "bioguideId",
+    "firstName": "firstName",
+    "lastName": "lastName",
+    "directOrderName": "directOrderName",
+    "state": "state",
+    "currentMember": Field("currentMember", lambda text: (text or "").lower() == "true"),
+    "parties": RecordSpec("./partyHistory/item", {
+        "partyName": "partyName",
+        "startYear": Field("startYear", optional_int),
+    }),
+    "terms": RecordSpec("./terms/item", {
+        "congress": Field("congress", optional_int),
+        "chamber": "chamber",
+        "stateCode": "stateCode",
+        "district": "district",
+        "startYear": "startYear",
+        "endYear": "endYear",
+    }),
+}, first=True)
+
+COMMITTEE_MEETING = RecordSpec(".//committeeMeeting", {
+    "title": "title",
+    "committee": "committees/item/name",
+    "documents": RecordSpec("./meetingDocuments/item", {
+        "name": "name",
+        "documentType": "documentType",
+        "format": "format",
+        "url": "url",
+    }),
+    "witnessDocuments": RecordSpec("./witnessDocuments/item", {
+        "documentType": "documentType",
+        "format": "format",
+        "url": "url",
+    }),
+    "witnesses": RecordSpec("./witnesses/item", {
+        "name": "name",
+        "position": "position",
+        "organization": "organization",
+    }),
+}, first=True)
+
+COMMITTEE_REPORT = RecordSpec(".//committeeReport", {
+    "citation": "citation",
+    "title": "title",
+    "congress": Field("congress", optional_int),
+    "chamber": "chamber",
+    "sessionNumber": "sessionNumber",
+    "reportType": "reportType",
+    "isConferenceReport": Field("isConferenceReport", equals("True")),
+    "part": "part",
+    "updateDate": "updateDate",
+    "issueDate": "issueDate",
+    "associatedBills": RecordSpec(".//associatedBill/item", {
+        "congress": Field("congress", optional_int),
+        "type": "type",
+        "number": "number",
+        "url": "url",
+    }),
+}, first=True, json=".//committeeReports")
+
+# Every format of every text version of a committee report (committee-report/.../text)
+COMMITTEE_REPORT_TEXT_FORMATS = RecordSpec(".//text/item/formats/item", {
+    "url": Field("url", lambda text: (text or "").strip()),
+    "type": Field("type", lambda text: (text or "").strip()),
+    "isErrata": Field("isErrata", lambda text: (text or "").strip().lower() in ("y", "true")),
+})
+
+AMENDMENT_SPONSORS = RecordSpec(".//sponsors/item", {
+    "bioguideId": Field("bioguideId", stripped),
+    "firstName": Field("firstName", stripped),
+    "lastName": Field("lastName", stripped),
+    "fullName": Field("fullName", stripped),
+    "party": Field("party", stripped),
+    "state": Field("state", stripped),
+    "url": Field("url", stripped),
+})
+
+AMENDMENT_ACTIONS = RecordSpec(".//actions/item", {
+    "actionDate": "actionDate",
+    "text": "text",
+    "type": "type",
+    "actionCode": Field("actionCode", optional=True),
+    "sourceSystem": RecordSpec("./sourceSystem", {"code": "code", "name": "name"}, first=True, optional=True),
+    "recordedVotes": RecordSpec(".//recordedVote", {
+        "rollNumber": "rollNumber",
+        "chamber": "chamber",
+        "congress": "congress",
+        "date": "date",
+        "sessionNumber": "sessionNumber",
+        "url": "url",
+    }, optional=True, json="recordedVotes"),
+})
+
+AMENDMENT_COSPONSORS = RecordSpec(".//cosponsors/item", {
+    "bioguideId": "bioguideId",
+    "fullName": "fullName",
+    "firstName": "firstName",
+    "lastName": "lastName",
+    "party": "party",
+    "state": "state",
+    "url": "url",
+    "sponsorshipDate": "sponsorshipDate",
+    "isOriginalCosponsor": Field("isOriginalCosponsor", equals("True")),
+    "middleName": Field("middleName", optional=True),
+})
+
+AMENDMENT_COSPONSOR_PAGINATION = RecordSpec(".//pagination", {
+    "count": Field("count", lambda text: int(text or 0)),
+    "countIncludingWithdrawnCosponsors": Field("countIncludingWithdrawnCosponsors", lambda text: int(text or 0)),
+}, first=True)
+
+SENATE_VOTES = RecordSpec(".//member", {
+    "lis_member_id": Field("lis_member_id", default("")),
+    "name": Field("member_full", default("")),
+    "party": Field("party", default("")),
+    "vote": Field("vote_cast", default("")),
+})
+
+HOUSE_VOTES = RecordSpec(".//recorded-vote", {
+    "name": Field("legislator", lambda text: (text or "").strip(), optional=True),
+    "name_id": Field("legislator/@name-id", lambda text: (text or "").strip()),
+    "party": Field("legislator/@party", lambda text: (text or "").strip()),
+    "vote": Field("vote", lambda text: (text or "").strip()),
+})
@@ -1,8 +1,10 @@
 import re
 import requests
-from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
 
+from util.metrics import record_upstream_call
+from util.clients.response_cache import get_response_cache
+
 
 BILL_VERSION_MAP = {
     "ih": "Introduced in House (First draft introduced)",
@@ -49,9 +51,18 @@ def _extract_htm_pdf_from_xml(root: ET.Element, is_amendment=False, is_hearing=F
 
 def __extract_text_from_html_url(url: str) -> str:
 
+    # Bill texts are immutable once published; cache the extracted text, not the HTML
+    cache = get_response_cache()
+    cached = cache.get(("html_text", url))
+    if cached is not None:
+        return cached
+
+    record_upstream_call(url)
     response = requests.get(url)
     response.raise_for_status() # raises an exception on HTTP errors
 
+    # Imported on first use, only bill texts published as HTML need it
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(response.text, "html.parser")
 
     # Remove script/style elements
@@ -61,7 +72,9 @@ def __extract_text_from_html_url(url: str) -> str:
     # Get text and collapse whitespace
     text = soup.get_text(separator="\n")
     lines = [line.strip() for line in text.splitlines() if line.strip()]
-    return "\n".join(lines)
+    text = "\n".join(lines)
+    cache.set(("html_text", url), text)
+    return text
 
 def __parse_text_version(text_url: str):
 
@@ -0,0 +1,79 @@
+"""
+Background prefetch of everything an investigation will ask about one bill. The fetches
+run concurrently in a thread pool and only warm the shared response cache and the RAG
+vectorstore; the prefetchBillDossier tool returns as soon as they are started.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "8"))
+
+
+class BillPrefetcher:
+    """Runs named prefetch tasks per bill, at most one prefetch per bill at a time"""
+
+    def __init__(self, max_workers: int = PREFETCH_WORKERS):
+        self.max_workers = max_workers
+        self._running: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def start(self, bill: str, tasks: Dict[str, Callable[[], object]],
+              after: Optional[Dict[str, Callable[[], object]]] = None) -> dict:
+        """
+        Starts `tasks` concurrently, then `after` (tasks that need the first ones, e.g.
+        indexing the fetched text). Returns immediately with the prefetch status.
+        """
+        with self._lock:
+            if bill in self._running:
+                return {"bill": bill, "status": "running"}
+            # Runs in a copy of the caller's context so tracing and metrics attribute it to the tool call
+            thread = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(self._run, bill, tasks, after or {}),
+                name=f"prefetch-{bill}",
+                daemon=True,
+            )
+            self._running[bill] = thread
+        thread.start()
+        return {"bill": bill, "status": "started", "tasks": list(tasks) + list(after or {})}
+
+    def _run_stage(self, executor: ThreadPoolExecutor, tasks: Dict[str, Callable[[], object]], results: dict) -> None:
+        futures = {name: executor.submit(contextvars.copy_context().run, task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            try:
+                future.result()
+                results[name] = "ok"
+            except Exception as e:
+                results[name] = f"error: {e}"
+                print(f"⚠️  Prefetch {name} failed: {e}")
+
+    def _run(self, bill: str, tasks: dict, after: dict) -> None:
+        start = time.perf_counter()
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"prefetch-{bill}") as executor:
+                self._run_stage(executor, tasks, results)
+                self._run_stage(executor, after, results)
+        finally:
+            elapsed = round(time.perf_counter() - start, 2)
+            with self._lock:
+                self._running.pop(bill, None)
+            print(f"🔥 Prefetched {bill} in {elapsed}s: {results}")
+
+
+# Global prefetcher instance
+_global_prefetcher = None
+_global_prefetcher_lock = threading.Lock()
+
+
+def get_bill_prefetcher() -> BillPrefetcher:
+    global _global_prefetcher
+    with _global_prefetcher_lock:
+        if _global_prefetcher is None:
+            _global_prefetcher = BillPrefetcher()
+    return _global_prefetcher
@@ -0,0 +1,154 @@
+"""
+Request coalescing ("singleflight"): concurrent calls with the same key share one execution.
+The first caller runs the call, callers arriving while it is in flight wait for and get its
+result (or exception). Nothing is kept once the call returns; that is the response cache's job.
+
+Tools opt in with `@singleflight(...)` (below `@token_budget`), keyed by the tool and its
+normalized arguments; `_call_api` coalesces upstream requests the same way. Tool calls only
+overlap when they run in worker threads, which `install_tool_threads` sets up for FastMCP
+(TOOL_WORKER_THREADS threads, 0 keeps the tools on the event loop).
+"""
+
+import copy
+import functools
+import inspect
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+import anyio
+
+TOOL_WORKER_THREADS = int(os.getenv("TOOL_WORKER_THREADS", "8"))
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.thread = threading.get_ident()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe group of in-flight calls by key"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple:
+        """(result of fn or of the in-flight call with the same key, whether it was shared)"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            elif call.thread == threading.get_ident():
+                # A call re-entering its own key would wait for itself
+                call = None
+            else:
+                leader = False
+                self.stats["coalesced"] += 1
+
+        if call is None:
+            return fn(), False
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+
+def _argument_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+# Global group of tool calls
+_tool_flights = SingleFlight()
+
+
+def get_tool_flights() -> SingleFlight:
+    return _tool_flights
+
+
+def singleflight(**normalizers: Callable[[Any], Any]):
+    """
+    Decorator coalescing concurrent calls of a tool with equal arguments. `normalizers` map
+    parameter names to functions giving a canonical value (e.g. the parsed congress_index).
+    Callers that joined a call get a deep copy of its result, so none can change another's.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                bound = signature.bind(*args, **kwargs)
+            except TypeError:
+                return fn(*args, **kwargs)
+            bound.apply_defaults()
+            key = (fn.__name__, _argument_key({
+                name: normalizers[name](value) if name in normalizers else value
+                for name, value in bound.arguments.items()
+            }))
+            result, shared = _tool_flights.do(key, lambda: fn(*args, **kwargs))
+            return copy.deepcopy(result) if shared else result
+
+        return wrapper
+
+    return decorator
+
+
+# Shared by every tool call; created on first use, inside the event loop
+_tool_limiter = None
+
+
+async def run_in_tool_thread(fn: Callable[..., Any], **kwargs) -> Any:
+    """fn(**kwargs) in a worker thread (at most TOOL_WORKER_THREADS at a time), with the caller's context variables"""
+    global _tool_limiter
+    if TOOL_WORKER_THREADS <= 0:
+        return fn(**kwargs)
+    if _tool_limiter is None:
+        _tool_limiter = anyio.CapacityLimiter(TOOL_WORKER_THREADS)
+    return await anyio.to_thread.run_sync(functools.partial(fn, **kwargs), limiter=_tool_limiter)
+
+
+def install_tool_threads(tool_manager) -> None:
+    """
+    Runs a FastMCP ToolManager's synchronous tools in worker threads instead of on the event
+    loop, so calls from different sessions overlap. Context variables (current tool, trace
+    span) follow each call into its thread.
+    """
+    if TOOL_WORKER_THREADS <= 0:
+        return
+
+
+    for tool in tool_manager.list_tools():
+        if tool.is_async:
+            continue
+
+        def threaded(fn):
+            @functools.wraps(fn)
+            async def run(**kwargs):
+                return await run_in_tool_thread(fn, **kwargs)
+            return run
+
+        tool.fn = threaded(tool.fn)
+        tool.is_async = True
@@ -0,0 +1,200 @@
+"""
+Per-state index of Congress members for getCongressMembersByState.
+
+A state's members are fetched from every page of Congress.gov's member/{stateCode} list
+(the pages after the first concurrently), persisted to data/state_members/{stateCode}.json
+and served from memory afterwards. Indexes older than STATE_MEMBERS_MAX_AGE_HOURS are
+fetched again on use; `start_refresher` also refreshes the stored ones in the background.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+
+local_path = os.path.dirname(os.path.abspath(__file__))
+
+STATE_CODES = frozenset([
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA', 'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ', 'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY', 'DC',
+])
+
+STATE_MEMBERS_DIR = os.getenv("STATE_MEMBERS_DIR", os.path.join(local_path, "..", "data", "state_members"))
+STATE_MEMBERS_MAX_AGE_HOURS = float(os.getenv("STATE_MEMBERS_MAX_AGE_HOURS", "168"))
+PAGE_LIMIT = 250
+PAGE_WORKERS = 4
+
+# (xml bytes) = get_page(stateCode, offset, limit)
+PageFetcher = Callable[[str, int, int], bytes]
+
+
+def congress_of_year(year: int) -> int:
+    """Congress in session during (most of) `year`; the 1st Congress began in 1789"""
+    return (year - 1789) // 2 + 1
+
+
+def current_congress() -> int:
+    today = date.today()
+    # A new congress starts on January 3rd of odd years
+    return congress_of_year(today.year - 1 if today.year % 2 and today.timetuple().tm_yday < 3 else today.year)
+
+
+def _congress_range(member: ET.Element) -> Tuple[Optional[int], Optional[int], bool]:
+    """(first congress, last congress, still serving) from the member's terms"""
+    first, last, serving = None, None, False
+    for term in member.findall(".//terms/item/item"):
+        start, end = term.findtext("startYear"), term.findtext("endYear")
+        if not start:
+            continue
+        term_first = congress_of_year(int(start))
+        if end:
+            # A term ending in January of `end` belongs to the congress before, unless it also
+            # started that year (e.g. 2021-2021)
+            term_last = max(term_first, congress_of_year(int(end) - 1))
+        else:
+            term_last, serving = current_congress(), True
+        first = term_first if first is None else min(first, term_first)
+        last = term_last if last is None else max(last, term_last)
+    return first, last, serving
+
+
+def _parse_members(root: ET.Element) -> List[dict]:
+    members = []
+    for m in root.findall(".//members/member"):
+        first, last, serving = _congress_range(m)
+        members.append({
+            "bioguideId": m.findtext("bioguideId"),
+            "name": m.findtext("name"),
+            "state": m.findtext("state"),
+            "party": m.findtext("partyName"),
+            "district": m.findtext("district"),
+            "chambers": sorted({term.findtext("chamber") for term in m.findall(".//terms/item/item")} - {None}),
+            "congresses": [first, last] if first else None,
+            "currentMember": serving,
+            "url": m.findtext("url"),
+            "imageUrl": m.findtext(".//depiction/imageUrl"),
+        })
+    return members
+
+
+class StateMemberIndex:
+    """Thread-safe per-state member lists, in memory and on disk"""
+
+    def __init__(self, get_page: PageFetcher, directory: str = STATE_MEMBERS_DIR,
+                 max_age_hours: float = STATE_MEMBERS_MAX_AGE_HOURS):
+        self.get_page = get_page
+        self.directory = directory
+        self.max_age = max_age_hours * 3600
+        self._states: Dict[str, dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, state_code: str) -> str:
+        return os.path.join(self.directory, f"{state_code}.json")
+
+    def _lock(self, state_code: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(state_code, threading.Lock())
+
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        return entry is not None and time.time() - entry["fetched_at"] < self.max_age
+
+    def _fetch(self, state_code: str) -> dict:
+        first_page = ET.fromstring(self.get_page(state_code, 0, PAGE_LIMIT))
+        members = _parse_members(first_page)
+        total = int(first_page.findtext(".//pagination/count", default="0") or 0)
+        offsets = range(PAGE_LIMIT, total, PAGE_LIMIT)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+                pages = [executor.submit(contextvars.copy_context().run, self.get_page, state_code, offset, PAGE_LIMIT)
+                         for offset in offsets]
+                for page in pages:
+                    members.extend(_parse_members(ET.fromstring(page.result())))
+        # Pages can overlap when the list changes while paging
+        members = list({m["bioguideId"]: m for m in members}.values())
+        return {"state_code": state_code, "fetched_at": time.time(), "count": total, "members": members}
+
+    def _load(self, state_code: str) -> Optional[dict]:
+        try:
+            with open(self._path(state_code), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry: dict) -> None:
+        path = self._path(entry["state_code"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def get(self, state_code: str, refresh: bool = False) -> dict:
+        """The state's index, fetched when missing or stale (one fetch per state at a time)"""
+        entry = self._states.get(state_code)
+        if self._fresh(entry) and not refresh:
+            return entry
+        with self._lock(state_code):
+            entry = self._states.get(state_code) or self._load(state_code)
+            if not self._fresh(entry) or refresh:
+                try:
+                    entry = self._fetch(state_code)
+                    self._save(entry)
+                except Exception:
+                    # A stale index beats none
+                    if entry is None:
+                        raise
+                    print(f"⚠️  Refreshing members of {state_code} failed, serving the index from {time.ctime(entry['fetched_at'])}")
+            self._states[state_code] = entry
+            return entry
+
+    def members(self, state_code: str, congress: Optional[int] = None, current_only: bool = False) -> List[dict]:
+        members = self.get(state_code)["members"]
+        if current_only:
+            members = [m for m in members if m["currentMember"]]
+        if congress:
+            members = [m for m in members if m["congresses"] and m["congresses"][0] <= congress <= m["congresses"][1]]
+        return members
+
+    def refresh_stale(self) -> int:
+        """Refreshes every stored state index that is older than the maximum age"""
+        refreshed = 0
+        for state_code in sorted(STATE_CODES):
+            entry = self._states.get(state_code) or self._load(state_code)
+            if entry is not None and not self._fresh(entry):
+                try:
+                    self.get(state_code, refresh=True)
+                    refreshed += 1
+                except Exception as e:
+                    print(f"⚠️  Refreshing members of {state_code} failed: {e}")
+        return refreshed
+
+    def start_refresher(self, interval_hours: Optional[float] = None) -> None:
+        """Background thread calling refresh_stale every `interval_hours` (default: the maximum age)"""
+        interval = (interval_hours or self.max_age / 3600) * 3600
+
+        def _loop():
+            while True:
+                self.refresh_stale()
+                time.sleep(interval)
+
+        threading.Thread(target=_loop, name="state-members-refresher", daemon=True).start()
+
+
+# Global index instance
+_global_index = None
+_global_index_lock = threading.Lock()
+
+
+def get_state_member_index(get_page: PageFetcher) -> StateMemberIndex:
+    global _global_index
+    with _global_index_lock:
+        if _global_index is None:
+            _global_index = StateMemberIndex(get_page)
+    return _global_index
@@ -0,0 +1,119 @@
+"""
+Tracing for the MCP server. Tool calls from agentServer carry the investigation's W3C
+traceparent in the reserved `_trace` argument; it is removed before the tool runs and the
+tool's span (and every Congress.gov fetch and RAG stage below it) joins that trace.
+
+Enable with TRACING_ENABLED=1. Finished spans are appended as JSON lines to TRACE_FILE
+(default traces/ragmcp_spans.jsonl), in the format agentServer's `python -m util.tracing`
+report merges.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Sequence
+
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+TRACE_ARGUMENT = "_trace"
+DEFAULT_TRACE_FILE = os.path.join("traces", "ragmcp_spans.jsonl")
+
+_tracer_provider: Optional[TracerProvider] = None
+
+
+def tracing_enabled() -> bool:
+    return os.getenv("TRACING_ENABLED", "0").lower() in ("1", "true", "yes")
+
+
+class JsonlFileSpanExporter(SpanExporter):
+    """Appends finished spans to a local JSONL file"""
+
+    def __init__(self, path: str, service: str):
+        self.path = path
+        self.service = service
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _to_record(self, span: ReadableSpan) -> Dict[str, Any]:
+        context = span.get_span_context()
+        return {
+            "trace_id": format(context.trace_id, "032x"),
+            "span_id": format(context.span_id, "016x"),
+            "parent_id": format(span.parent.span_id, "016x") if span.parent else None,
+            "name": span.name,
+            "service": self.service,
+            "start": span.start_time / 1e9,
+            "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+            "status": span.status.status_code.name,
+            "attributes": dict(span.attributes or {}),
+        }
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(self._to_record(span), default=str) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def setup_tracing(service: str = "ragmcp") -> bool:
+    """Install the process-wide tracer provider (once). Returns False if tracing is disabled."""
+    global _tracer_provider
+    if _tracer_provider is not None:
+        return True
+    if not tracing_enabled():
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service}))
+    exporter = JsonlFileSpanExporter(os.getenv("TRACE_FILE", DEFAULT_TRACE_FILE), service)
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer_provider = provider
+    # stdout is the MCP channel in stdio mode
+    print(f"🔭 Tracing enabled, spans exported to {exporter.path}", file=sys.stderr)
+    return True
+
+
+def get_tracer():
+    return trace.get_tracer("ragmcp")
+
+
+@contextmanager
+def tool_span(name: str, arguments: Optional[Dict[str, Any]]):
+    """
+    Span around one tool call, continuing the caller's trace. Always removes the
+    `_trace` argument from `arguments` (in place) so tools never see it.
+    """
+    traceparent = arguments.pop(TRACE_ARGUMENT, None) if isinstance(arguments, dict) else None
+    parent = propagate.extract({"traceparent": traceparent}) if traceparent else None
+    with get_tracer().start_as_current_span(
+        f"mcp.tool {name}",
+        context=parent,
+        kind=trace.SpanKind.SERVER,
+        attributes={"tool.name": name},
+    ) as span:
+        yield span
+
+
+def install_tool_tracing(tool_manager) -> None:
+    """Wraps a FastMCP ToolManager's call_tool so every tool call runs in a tool_span"""
+    call_tool = tool_manager.call_tool
+
+    @functools.wraps(call_tool)
+    async def traced_call_tool(name: str, arguments: Dict[str, Any], *args, **kwargs):
+        arguments = dict(arguments or {})
+        with tool_span(name, arguments):
+            return await call_tool(name, arguments, *args, **kwargs)
+
+    tool_manager.call_tool = traced_call_tool
@@ -0,0 +1,455 @@
+"""
+Local SQLite warehouse of Congress.gov bill metadata (bills, actions, sponsors, cosponsors,
+committees, amendments and members), filled by `ingest_warehouse.py`.
+
+Rows are stored with the fields the MCP tools return, so with WAREHOUSE_FIRST=1 the tools
+decorated with `@warehouse_first(...)` answer from the warehouse when it has the bill (or
+member) and only call Congress.gov for the rest. The queryWarehouse tool runs read-only SQL
+over the tables and the QUERY_VIEWS (member/committee/amendment sponsor to bill), answering
+cross-bill questions in one call. WAREHOUSE_PATH sets the database file.
+"""
+
+import functools
+import inspect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+local_path = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_WAREHOUSE_PATH = os.path.join(local_path, "..", "data", "warehouse", "congress.sqlite3")
+
+# Fields of the per-bill lists, in the order and naming of the tool responses
+BILL_LIST_FIELDS = {
+    "bill_actions": ["date", "text", "type"],
+    "bill_sponsors": ["bioguide_id", "full_name", "first_name", "last_name", "party", "state", "url",
+                      "middle_name", "district", "is_by_request"],
+    "bill_cosponsors": ["bioguide_id", "full_name", "first_name", "last_name", "party", "state", "url",
+                        "district", "sponsorship_date", "is_original_cosponsor"],
+    "bill_amendments": ["number", "congress", "type", "updateDate", "detailUrl"],
+}
+
+# Tools whose responses make up a stored bill
+BILL_DETAIL_TOOLS = ["getBillSponsors", "getBillCosponsors", "extractBillActions", "getBillAmendments",
+                     "get_committee_actions"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bills (
+    bill_key TEXT PRIMARY KEY,
+    congress INTEGER NOT NULL,
+    bill_type TEXT NOT NULL,
+    bill_number INTEGER NOT NULL,
+    title TEXT,
+    origin_chamber TEXT,
+    latest_action_date TEXT,
+    latest_action_text TEXT,
+    update_date TEXT,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS bill_actions (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    date TEXT,
+    text TEXT,
+    type TEXT
+);
+CREATE TABLE IF NOT EXISTS bill_sponsors (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    bioguide_id TEXT,
+    full_name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    party TEXT,
+    state TEXT,
+    url TEXT,
+    middle_name TEXT,
+    district TEXT,
+    is_by_request INTEGER
+);
+CREATE TABLE IF NOT EXISTS bill_cosponsors (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    bioguide_id TEXT,
+    full_name TEXT,
+    first_name TEXT,
+    last_name TEXT,
+    party TEXT,
+    state TEXT,
+    url TEXT,
+    district TEXT,
+    sponsorship_date TEXT,
+    is_original_cosponsor INTEGER
+);
+CREATE TABLE IF NOT EXISTS bill_committees (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    system_code TEXT,
+    name TEXT,
+    chamber TEXT,
+    type TEXT,
+    parent_system_code TEXT
+);
+CREATE TABLE IF NOT EXISTS committee_activities (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    system_code TEXT,
+    name TEXT,
+    date TEXT
+);
+CREATE TABLE IF NOT EXISTS bill_amendments (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    number TEXT,
+    congress INTEGER,
+    type TEXT,
+    update_date TEXT,
+    detail_url TEXT
+);
+CREATE TABLE IF NOT EXISTS amendment_sponsors (
+    bill_key TEXT NOT NULL REFERENCES bills(bill_key),
+    position INTEGER NOT NULL,
+    congress INTEGER,
+    amendment_type TEXT,
+    amendment_number TEXT,
+    bioguide_id TEXT,
+    full_name TEXT,
+    party TEXT,
+    state TEXT
+);
+CREATE TABLE IF NOT EXISTS members (
+    bioguide_id TEXT PRIMARY KEY,
+    full_name TEXT,
+    state TEXT,
+    state_code TEXT,
+    party TEXT,
+    congresses_served TEXT,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS ingest_state (
+    source TEXT PRIMARY KEY,
+    watermark TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bill_actions_bill ON bill_actions(bill_key);
+CREATE INDEX IF NOT EXISTS idx_bill_sponsors_bill ON bill_sponsors(bill_key);
+CREATE INDEX IF NOT EXISTS idx_bill_sponsors_member ON bill_sponsors(bioguide_id);
+CREATE INDEX IF NOT EXISTS idx_bill_cosponsors_bill ON bill_cosponsors(bill_key);
+CREATE INDEX IF NOT EXISTS idx_bill_cosponsors_member ON bill_cosponsors(bioguide_id);
+CREATE INDEX IF NOT EXISTS idx_bill_committees_bill ON bill_committees(bill_key);
+CREATE INDEX IF NOT EXISTS idx_bill_committees_code ON bill_committees(system_code);
+CREATE INDEX IF NOT EXISTS idx_committee_activities_bill ON committee_activities(bill_key, system_code);
+CREATE INDEX IF NOT EXISTS idx_bill_amendments_bill ON bill_amendments(bill_key);
+CREATE INDEX IF NOT EXISTS idx_amendment_sponsors_bill ON amendment_sponsors(bill_key);
+CREATE INDEX IF NOT EXISTS idx_amendment_sponsors_member ON amendment_sponsors(bioguide_id);
+CREATE INDEX IF NOT EXISTS idx_bills_congress ON bills(congress, bill_type);
+
+-- Views for cross-bill questions (queryWarehouse); their join and filter columns are indexed above
+CREATE VIEW IF NOT EXISTS member_bills AS
+    SELECT s.bioguide_id, s.full_name, s.party, s.state, 'sponsor' AS role, NULL AS sponsorship_date,
+           b.bill_key, b.congress, b.bill_type, b.bill_number, b.title, b.latest_action_date, b.latest_action_text
+    FROM bill_sponsors s JOIN bills b ON b.bill_key = s.bill_key
+    UNION ALL
+    SELECT c.bioguide_id, c.full_name, c.party, c.state,
+           CASE WHEN c.is_original_cosponsor THEN 'original_cosponsor' ELSE 'cosponsor' END, c.sponsorship_date,
+           b.bill_key, b.congress, b.bill_type, b.bill_number, b.title, b.latest_action_date, b.latest_action_text
+    FROM bill_cosponsors c JOIN bills b ON b.bill_key = c.bill_key;
+CREATE VIEW IF NOT EXISTS committee_bills AS
+    SELECT bc.system_code, bc.name AS committee_name, bc.chamber, bc.parent_system_code,
+           b.bill_key, b.congress, b.bill_type, b.bill_number, b.title,
+           (SELECT MIN(a.date) FROM committee_activities a
+            WHERE a.bill_key = bc.bill_key AND a.system_code = bc.system_code) AS first_activity_date,
+           (SELECT COUNT(*) FROM bill_amendments am WHERE am.bill_key = bc.bill_key) AS amendment_count
+    FROM bill_committees bc JOIN bills b ON b.bill_key = bc.bill_key;
+CREATE VIEW IF NOT EXISTS amendment_sponsor_bills AS
+    SELECT s.bioguide_id, s.full_name, s.party, s.state, s.amendment_type, s.amendment_number,
+           am.update_date AS amendment_update_date, b.bill_key, b.congress, b.bill_type, b.bill_number, b.title
+    FROM amendment_sponsors s JOIN bills b ON b.bill_key = s.bill_key
+    LEFT JOIN bill_amendments am
+        ON am.bill_key = s.bill_key AND lower(am.type) = s.amendment_type AND am.number = s.amendment_number;
+"""
+
+QUERY_VIEWS = ["member_bills", "committee_bills", "amendment_sponsor_bills"]
+# Rows returned by queryWarehouse unless the caller asks for fewer
+MAX_QUERY_ROWS = 200
+# Queries running longer are aborted
+QUERY_TIMEOUT_SECONDS = 5.0
+
+# Statements a read-only query may contain (everything else is denied by the authorizer)
+_READ_ONLY_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def warehouse_first_enabled() -> bool:
+    return os.getenv("WAREHOUSE_FIRST", "0").lower() in ("1", "true", "yes")
+
+
+def _column(field: str) -> str:
+    """Column name of a response field (updateDate -> update_date)"""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", field).lower()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def bill_key(congress_index: Any) -> Optional[str]:
+    """'hr1234-117' for a congress_index (also accepts the wrapped/stringified forms agents send)"""
+    from util.parse.parse import _parse_congress_index_from_args
+
+    parsed = _parse_congress_index_from_args(congress_index)
+    if not parsed or "bill_type" not in parsed or "bill_number" not in parsed:
+        return None
+    try:
+        return f"{str(parsed['bill_type']).lower()}{int(parsed['bill_number'])}-{int(parsed['congress'])}"
+    except (TypeError, ValueError):
+        return None
+
+
+class CongressWarehouse:
+    """SQLite store of bill metadata; one connection per thread, writes serialized"""
+
+    def __init__(self, path: str = DEFAULT_WAREHOUSE_PATH):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._write_lock, self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # Readers (tool calls) are not blocked by a running ingest
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # -------------------- Ingest --------------------
+
+    def store_bill(self, bill: dict, details: Dict[str, dict]) -> None:
+        """
+        Replaces everything stored for one bill. `bill` holds the bills columns, `details`
+        the responses of all BILL_DETAIL_TOOLS for it (a partially fetched bill must not be
+        stored, the warehouse would then answer with empty lists).
+        """
+        key = bill["bill_key"]
+        lists = {
+            "bill_actions": details["extractBillActions"]["actions"],
+            "bill_sponsors": details["getBillSponsors"]["sponsors"],
+            "bill_cosponsors": details["getBillCosponsors"]["cosponsors"],
+            "bill_amendments": details["getBillAmendments"]["amendments"],
+        }
+        # Optional: {amendment type, number: getAmendmentSponsors response} for the query views
+        amendment_sponsors = [
+            (bill["congress"], amendment_type, number, sponsor.get("bioguideId"), sponsor.get("fullName"),
+             sponsor.get("party"), sponsor.get("state"))
+            for (amendment_type, number), response in details.get("amendment_sponsors", {}).items()
+            for sponsor in response["sponsors"]
+        ]
+        committees, activities = [], []
+        for committee in details["get_committee_actions"]["committees"]:
+            committees.append((committee.get("system_code"), committee.get("name"), committee.get("chamber"),
+                               committee.get("type"), None))
+            activities.extend((committee.get("system_code"), a.get("name"), a.get("date")) for a in committee.get("actions", []))
+            for sub in committee.get("subcommittees", []):
+                committees.append((sub.get("system_code"), sub.get("name"), committee.get("chamber"),
+                                   committee.get("type"), committee.get("system_code")))
+                activities.extend((sub.get("system_code"), a.get("name"), a.get("date")) for a in sub.get("actions", []))
+
+        with self._write_lock, self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO bills VALUES (:bill_key, :congress, :bill_type, :bill_number, :title, "
+                ":origin_chamber, :latest_action_date, :latest_action_text, :update_date, :ingested_at)",
+                {**bill, "ingested_at": _now()},
+            )
+            for table in list(BILL_LIST_FIELDS) + ["bill_committees", "committee_activities", "amendment_sponsors"]:
+                conn.execute(f"DELETE FROM {table} WHERE bill_key = ?", (key,))
+            for table, fields in BILL_LIST_FIELDS.items():
+                columns = ", ".join(["bill_key", "position"] + [_column(f) for f in fields])
+                placeholders = ", ".join("?" * (len(fields) + 2))
+                conn.executemany(
+                    f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                    [(key, i, *(row.get(f) for f in fields)) for i, row in enumerate(lists[table])],
+                )
+            conn.executemany("INSERT INTO bill_committees VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             [(key, i, *row) for i, row in enumerate(committees)])
+            conn.executemany("INSERT INTO committee_activities VALUES (?, ?, ?, ?, ?)",
+                             [(key, i, *row) for i, row in enumerate(activities)])
+            conn.executemany("INSERT INTO amendment_sponsors VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             [(key, i, *row) for i, row in enumerate(amendment_sponsors)])
+
+    def store_member(self, bioguide_id: str, member: dict) -> None:
+        """Stores a getCongressMember response"""
+        with self._write_lock, self.connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (bioguide_id, member.get("fullName"), member.get("state"), member.get("stateCode"),
+                 member.get("party"), json.dumps(member.get("congressesServed") or []), _now()),
+            )
+
+    def bill_update_dates(self, keys: List[str]) -> Dict[str, str]:
+        conn = self.connection()
+        placeholders = ", ".join("?" * len(keys))
+        rows = conn.execute(f"SELECT bill_key, update_date FROM bills WHERE bill_key IN ({placeholders})", keys)
+        return {row["bill_key"]: row["update_date"] for row in rows}
+
+    def missing_members(self) -> List[str]:
+        """Sponsors and cosponsors of stored bills that are not in the members table"""
+        rows = self.connection().execute(
+            "SELECT DISTINCT bioguide_id FROM (SELECT bioguide_id FROM bill_sponsors "
+            "UNION SELECT bioguide_id FROM bill_cosponsors) "
+            "WHERE bioguide_id IS NOT NULL AND bioguide_id NOT IN (SELECT bioguide_id FROM members)"
+        )
+        return [row["bioguide_id"] for row in rows]
+
+    def get_watermark(self, source: str) -> Optional[str]:
+        row = self.connection().execute("SELECT watermark FROM ingest_state WHERE source = ?", (source,)).fetchone()
+        return row["watermark"] if row else None
+
+    def set_watermark(self, source: str, watermark: str) -> None:
+        with self._write_lock, self.connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO ingest_state VALUES (?, ?, ?)", (source, watermark, _now()))
+
+    # -------------------- Read-only queries --------------------
+
+    def _query_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "query_conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30)
+            conn.set_authorizer(lambda action, *args: sqlite3.SQLITE_OK if action in _READ_ONLY_ACTIONS else sqlite3.SQLITE_DENY)
+            self._local.query_conn = conn
+        return conn
+
+    def query(self, sql: str, parameters: Optional[list] = None, max_rows: int = MAX_QUERY_ROWS) -> dict:
+        """Runs one read-only SELECT with `?` parameters; at most `max_rows` rows are returned"""
+        if max_rows < 1:
+            raise ValueError(f"max_rows must be at least 1, got {max_rows}")
+        conn = self._query_connection()
+        deadline = time.monotonic() + QUERY_TIMEOUT_SECONDS
+        # A non-zero return aborts the query
+        conn.set_progress_handler(lambda: int(time.monotonic() > deadline), 10000)
+        try:
+            cursor = conn.execute(sql, list(parameters or []))
+            rows = cursor.fetchmany(max_rows + 1)
+        finally:
+            conn.set_progress_handler(None, 0)
+        columns = [column[0] for column in cursor.description or []]
+        return {
+            "columns": columns,
+            "rows": [list(row) for row in rows[:max_rows]],
+            "truncated": len(rows) > max_rows,
+        }
+
+    # -------------------- Tool responses --------------------
+
+    def _bill_row(self, key: Optional[str]) -> Optional[sqlite3.Row]:
+        if key is None:
+            return None
+        return self.connection().execute("SELECT * FROM bills WHERE bill_key = ?", (key,)).fetchone()
+
+    def _list(self, table: str, key: str) -> List[dict]:
+        fields = BILL_LIST_FIELDS[table]
+        columns = ", ".join(_column(f) for f in fields)
+        rows = self.connection().execute(f"SELECT {columns} FROM {table} WHERE bill_key = ? ORDER BY position", (key,))
+        # Flags are stored as integers
+        return [{f: bool(row[i]) if f.startswith("is_") and row[i] is not None else row[i] for i, f in enumerate(fields)}
+                for row in rows]
+
+    def _committees(self, key: str, with_actions: bool) -> List[dict]:
+        conn = self.connection()
+        activities: Dict[str, List[dict]] = {}
+        if with_actions:
+            for row in conn.execute("SELECT system_code, name, date FROM committee_activities "
+                                    "WHERE bill_key = ? ORDER BY position", (key,)):
+                activities.setdefault(row["system_code"], []).append({"name": row["name"], "date": row["date"]})
+
+        committees, by_code = [], {}
+        for row in conn.execute("SELECT * FROM bill_committees WHERE bill_key = ? ORDER BY position", (key,)):
+            entry = {"system_code": row["system_code"], "name": row["name"]}
+            if row["parent_system_code"] is None:
+                entry.update({"chamber": row["chamber"], "type": row["type"]})
+                if with_actions:
+                    entry["actions"] = activities.get(row["system_code"], [])
+                entry["subcommittees"] = []
+                committees.append(entry)
+                by_code[row["system_code"]] = entry
+            elif row["parent_system_code"] in by_code:
+                if with_actions:
+                    entry["actions"] = activities.get(row["system_code"], [])
+                by_code[row["parent_system_code"]]["subcommittees"].append(entry)
+        return committees
+
+    def lookup(self, section: str, argument: Any) -> Optional[dict]:
+        """A tool's response from the warehouse, or None if the bill/member is not stored"""
+        if section == "member":
+            row = self.connection().execute("SELECT * FROM members WHERE bioguide_id = ?", (argument,)).fetchone()
+            if row is None:
+                return None
+            return {
+                "fullName": row["full_name"],
+                "state": row["state"],
+                "stateCode": row["state_code"],
+                "party": row["party"],
+                "congressesServed": json.loads(row["congresses_served"] or "[]"),
+                "debug": [f"Served from the local warehouse (ingested {row['ingested_at']})"],
+            }
+
+        bill = self._bill_row(bill_key(argument))
+        if bill is None:
+            return None
+        key = bill["bill_key"]
+        if section == "committees":
+            result = {"committees": self._committees(key, with_actions=False)}
+        elif section == "committee_actions":
+            result = {"committees": self._committees(key, with_actions=True)}
+        else:
+            result = {section: self._list(f"bill_{section}", key)}
+        result["debug"] = [f"Served {key} from the local warehouse (Congress.gov update {bill['update_date']})"]
+        return result
+
+
+# Global warehouse instance
+_global_warehouse = None
+_global_warehouse_lock = threading.Lock()
+
+
+def get_warehouse() -> CongressWarehouse:
+    global _global_warehouse
+    with _global_warehouse_lock:
+        if _global_warehouse is None:
+            _global_warehouse = CongressWarehouse(os.getenv("WAREHOUSE_PATH", DEFAULT_WAREHOUSE_PATH))
+    return _global_warehouse
+
+
+def warehouse_first(section: str) -> Callable:
+    """
+    Decorator serving a tool from the warehouse when WAREHOUSE_FIRST=1 and the warehouse has
+    the requested bill (section: actions/sponsors/cosponsors/amendments/committees/
+    committee_actions) or member (section: member). Everything else goes to Congress.gov.
+    """
+
+    def decorator(fn):
+        first_parameter = next(iter(inspect.signature(fn).parameters))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if warehouse_first_enabled():
+                argument = args[0] if args else kwargs.get(first_parameter)
+                try:
+                    result = get_warehouse().lookup(section, argument)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Warehouse lookup failed, calling Congress.gov: {e}")
+                    result = None
+                if result is not None:
+                    return result
+            return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator